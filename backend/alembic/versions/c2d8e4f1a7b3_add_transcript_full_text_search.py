@@ -0,0 +1,67 @@
+"""Add full-text search index on transcript text
+
+Revision ID: c2d8e4f1a7b3
+Revises: af5734431338
+Create Date: 2026-10-17 10:12:04.118342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2d8e4f1a7b3'
+down_revision: Union[str, None] = 'af5734431338'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Kept in sync with app.database.models.TRANSCRIPT_FTS_DDL
+FTS_TABLE = 'transcript_segments_fts'
+SQLITE_FTS_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "text, content='transcript_segments', content_rowid='id', tokenize='porter unicode61')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON transcript_segments BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON transcript_segments BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) VALUES ('delete', old.id, old.text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF text ON transcript_segments BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) VALUES ('delete', old.id, old.text); "
+    f"INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text); END",
+)
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        # Built concurrently so live transcript inserts are not blocked
+        with op.get_context().autocommit_block():
+            op.create_index(
+                'ix_transcript_segments_text_search',
+                'transcript_segments',
+                [sa.text("to_tsvector('english', text)")],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_concurrently=True,
+            )
+    elif dialect == 'sqlite':
+        for statement in SQLITE_FTS_DDL:
+            op.execute(statement)
+        # Index the rows that already exist
+        op.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index(
+                'ix_transcript_segments_text_search',
+                table_name='transcript_segments',
+                postgresql_concurrently=True,
+            )
+    elif dialect == 'sqlite':
+        for trigger in ('ai', 'ad', 'au'):
+            op.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{trigger}")
+        op.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
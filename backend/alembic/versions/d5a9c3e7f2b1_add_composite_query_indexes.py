@@ -0,0 +1,44 @@
+"""Add composite indexes for per-meeting queries
+
+Revision ID: d5a9c3e7f2b1
+Revises: c2d8e4f1a7b3
+Create Date: 2026-10-17 11:03:51.402917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a9c3e7f2b1'
+down_revision: Union[str, None] = 'c2d8e4f1a7b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns); each matches a filter + ORDER BY in the app
+INDEXES = (
+    ('ix_meetings_start_time_id', 'meetings', ['start_time', 'id']),
+    ('ix_transcript_segments_meeting_id_timestamp', 'transcript_segments', ['meeting_id', 'timestamp']),
+    ('ix_transcript_segments_meeting_id_id', 'transcript_segments', ['meeting_id', 'id']),
+    ('ix_action_items_meeting_id_created_at', 'action_items', ['meeting_id', 'created_at']),
+    ('ix_summaries_meeting_id_type_created_at', 'summaries', ['meeting_id', 'summary_type', 'created_at']),
+    ('ix_follow_up_questions_meeting_id_created_at', 'follow_up_questions', ['meeting_id', 'created_at']),
+    ('ix_topics_meeting_id_created_at', 'topics', ['meeting_id', 'created_at']),
+)
+
+
+def upgrade() -> None:
+    # Built concurrently on Postgres so live transcript inserts are not blocked
+    concurrently = op.get_bind().dialect.name == 'postgresql'
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=concurrently)
+
+
+def downgrade() -> None:
+    concurrently = op.get_bind().dialect.name == 'postgresql'
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=concurrently)
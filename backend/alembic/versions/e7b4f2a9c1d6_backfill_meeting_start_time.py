@@ -0,0 +1,41 @@
+"""Backfill meetings.start_time and make it NOT NULL
+
+Revision ID: e7b4f2a9c1d6
+Revises: d5a9c3e7f2b1
+Create Date: 2026-10-17 16:42:08.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b4f2a9c1d6'
+down_revision: Union[str, None] = 'd5a9c3e7f2b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The meeting listing pages on (start_time, id); a NULL start time would
+    # fall outside every page. Use the first transcript, else the end time.
+    op.execute("""
+        UPDATE meetings SET start_time = COALESCE(
+            (SELECT MIN(transcript_segments.timestamp) FROM transcript_segments
+             WHERE transcript_segments.meeting_id = meetings.id),
+            meetings.end_time,
+            CURRENT_TIMESTAMP
+        )
+        WHERE start_time IS NULL
+    """)
+    op.alter_column('meetings', 'start_time',
+                    existing_type=sa.DateTime(),
+                    nullable=False)
+
+
+def downgrade() -> None:
+    op.alter_column('meetings', 'start_time',
+                    existing_type=sa.DateTime(),
+                    nullable=True)
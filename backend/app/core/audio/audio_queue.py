@@ -0,0 +1,188 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, List, Optional, Tuple
+from .chunk import AudioChunk
+
+logger = logging.getLogger(__name__)
+
+DROP_POLICIES = ("non_speech_first", "oldest", "newest")
+
+class BoundedAudioQueue:
+    """Recognition queue capped by the duration of audio it holds.
+
+    When a new chunk would push the queue past `max_ms`, the drop policy
+    makes room:
+      non_speech_first - drop the oldest non-speech chunks (VAD padding),
+                         then the oldest speech
+      oldest           - drop the oldest chunks
+      newest           - reject the incoming chunk
+    so a stalled recognizer costs a bounded amount of memory and catches up
+    on recent audio instead of replaying minutes-old speech.
+
+    Crossing `high_water` of capacity raises backpressure and falling below
+    `low_water` releases it; each transition is reported to `on_pressure` on
+    the event loop. Consumers may be coroutines (get) or a thread (get_blocking).
+    """
+
+    def __init__(self, max_ms: int = 3000, policy: str = "non_speech_first",
+                 loop: Optional[asyncio.AbstractEventLoop] = None,
+                 on_pressure: Optional[Callable[[bool], None]] = None,
+                 high_water: float = 0.5, low_water: float = 0.25):
+        if policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown drop policy: {policy}")
+        self.max_ms = max_ms
+        self.policy = policy
+        self.loop = loop
+        self.on_pressure = on_pressure
+        self.high_water_ms = max_ms * high_water
+        self.low_water_ms = max_ms * low_water
+
+        self._items: Deque[Tuple[str, AudioChunk, bool]] = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._ready = asyncio.Event()
+        self.under_pressure = False
+
+        self.queued_ms = 0.0
+        self.peak_queued_ms = 0.0
+        self.enqueued_ms = 0.0
+        self.dropped_ms = 0.0
+        self.dropped_chunks = 0
+        self.dropped_speech_ms = 0.0
+
+    def put(self, audio_type: str, chunk: AudioChunk, speech: bool = True) -> bool:
+        """Queue a chunk without blocking; returns False if it was rejected"""
+        duration_ms = chunk.duration * 1000
+        with self._lock:
+            if self.queued_ms + duration_ms > self.max_ms:
+                if self.policy == "newest" or duration_ms > self.max_ms:
+                    self._count_drop(duration_ms, speech)
+                    return False
+                self._make_room(duration_ms)
+            self._items.append((audio_type, chunk, speech))
+            self.queued_ms += duration_ms
+            self.enqueued_ms += duration_ms
+            self.peak_queued_ms = max(self.peak_queued_ms, self.queued_ms)
+            self._not_empty.notify()
+            changed = self._update_pressure()
+        self._wake()
+        if changed:
+            self._report_pressure()
+        return True
+
+    def _make_room(self, needed_ms: float):
+        """Drop queued chunks until `needed_ms` fits (lock held)"""
+        if self.policy == "non_speech_first":
+            kept: List[Tuple[str, AudioChunk, bool]] = []
+            for item in self._items:
+                if self.queued_ms + needed_ms > self.max_ms and not item[2]:
+                    self._drop(item)
+                else:
+                    kept.append(item)
+            if len(kept) != len(self._items):
+                self._items = deque(kept)
+        while self._items and self.queued_ms + needed_ms > self.max_ms:
+            self._drop(self._items.popleft())
+
+    def _drop(self, item: Tuple[str, AudioChunk, bool]):
+        duration_ms = item[1].duration * 1000
+        self.queued_ms -= duration_ms
+        self._count_drop(duration_ms, item[2])
+
+    def _count_drop(self, duration_ms: float, speech: bool):
+        self.dropped_ms += duration_ms
+        self.dropped_chunks += 1
+        if speech:
+            self.dropped_speech_ms += duration_ms
+        if self.dropped_chunks == 1 or self.dropped_chunks % 50 == 0:
+            logger.warning(f"Recognition queue full, dropped {self.dropped_ms:.0f} ms of audio so far")
+
+    def _take(self) -> Tuple[str, AudioChunk]:
+        """Pop the oldest chunk (lock held)"""
+        audio_type, chunk, _ = self._items.popleft()
+        self.queued_ms = max(self.queued_ms - chunk.duration * 1000, 0.0) if self._items else 0.0
+        return audio_type, chunk
+
+    def _update_pressure(self) -> bool:
+        """Apply the watermarks (lock held); returns True on a transition"""
+        if not self.under_pressure and self.queued_ms >= self.high_water_ms:
+            self.under_pressure = True
+            return True
+        if self.under_pressure and self.queued_ms <= self.low_water_ms:
+            self.under_pressure = False
+            return True
+        return False
+
+    def _report_pressure(self):
+        if self.on_pressure is None:
+            return
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.on_pressure, self.under_pressure)
+        else:
+            self.on_pressure(self.under_pressure)
+
+    def _wake(self):
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._ready.set)
+        else:
+            self._ready.set()
+
+    async def get(self) -> Tuple[str, AudioChunk]:
+        """Wait for the next chunk on the event loop"""
+        while True:
+            with self._lock:
+                if self._items:
+                    item = self._take()
+                    changed = self._update_pressure()
+                    break
+                self._ready.clear()
+            await self._ready.wait()
+        if changed:
+            self._report_pressure()
+        return item
+
+    def get_blocking(self, timeout: Optional[float] = None) -> Tuple[str, AudioChunk]:
+        """Wait for the next chunk on a worker thread; raises queue.Empty on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._not_empty:
+            while not self._items:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise queue.Empty
+                self._not_empty.wait(remaining)
+            item = self._take()
+            changed = self._update_pressure()
+        if changed:
+            self._report_pressure()
+        return item
+
+    async def wait_nonempty(self):
+        while self.empty():
+            self._ready.clear()
+            if not self.empty():
+                return
+            await self._ready.wait()
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def get_status(self) -> dict:
+        return {
+            "depth": len(self._items),
+            "queued_ms": round(self.queued_ms),
+            "peak_queued_ms": round(self.peak_queued_ms),
+            "max_ms": self.max_ms,
+            "policy": self.policy,
+            "enqueued_ms": round(self.enqueued_ms),
+            "dropped_ms": round(self.dropped_ms),
+            "dropped_speech_ms": round(self.dropped_speech_ms),
+            "dropped_chunks": self.dropped_chunks,
+            "backpressure": self.under_pressure,
+        }
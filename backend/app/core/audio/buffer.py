@@ -1,65 +1,179 @@
 import numpy as np
 from typing import Dict, Optional
 import logging
-from datetime import datetime, timedelta
+import time
+from datetime import datetime
+from .chunk import INT16_SCALE
 
 logger = logging.getLogger(__name__)
 
+class RingBuffer:
+    """Fixed-capacity circular sample buffer with independent read/write cursors.
+
+    Cursors are absolute sample counts; the storage index is the cursor modulo
+    capacity. When a write would overtake unread data the oldest samples are
+    dropped and counted as an overrun.
+    """
+
+    def __init__(self, capacity: int, channels: int = 1, dtype=np.float32):
+        self.capacity = capacity
+        self.channels = channels
+        self._data = np.zeros((capacity, channels), dtype=dtype)
+        self.read_pos = 0
+        self.write_pos = 0
+        self.overruns = 0
+        self.dropped_samples = 0
+
+    @property
+    def available(self) -> int:
+        """Number of unread samples"""
+        return self.write_pos - self.read_pos
+
+    @property
+    def fill_level(self) -> float:
+        return self.available / self.capacity
+
+    def write(self, samples: np.ndarray):
+        """Copy samples into the buffer, dropping the oldest unread data on overrun"""
+        samples = samples.reshape(-1, self.channels)
+        n = samples.shape[0]
+        if n == 0:
+            return
+
+        overflow = self.available + n - self.capacity
+        if overflow > 0:
+            self.overruns += 1
+            self.dropped_samples += overflow
+            if n > self.capacity:
+                # Only the newest `capacity` samples can ever be read back
+                samples = samples[n - self.capacity:]
+                self.write_pos += n - self.capacity
+                n = self.capacity
+            self.read_pos = self.write_pos + n - self.capacity
+
+        start = self.write_pos % self.capacity
+        first = min(n, self.capacity - start)
+        self._data[start:start + first] = samples[:first]
+        if first < n:
+            self._data[:n - first] = samples[first:]
+        self.write_pos += n
+
+    def peek(self, n: int) -> np.ndarray:
+        """Return the next n unread samples without consuming them.
+
+        The result is a view into the buffer unless the range wraps around the
+        end of storage, in which case a single copy is made. Views are only
+        valid until the next write.
+        """
+        n = min(n, self.available)
+        start = self.read_pos % self.capacity
+        end = start + n
+        if end <= self.capacity:
+            return self._data[start:end]
+        return np.concatenate((self._data[start:], self._data[:end - self.capacity]))
+
+    def consume(self, n: int):
+        """Advance the read cursor by n samples"""
+        self.read_pos += min(n, self.available)
+
+    def read(self, n: int) -> np.ndarray:
+        samples = self.peek(n)
+        self.consume(samples.shape[0])
+        return samples
+
+    def clear(self):
+        self.read_pos = self.write_pos
+
 class AudioBuffer:
-    def __init__(self, buffer_size: int = 4096, channels: int = 1, sample_rate: int = 16000):
+    """Per-stream ring buffers plus a sample-clock mixer.
+
+    The mixer advances on a monotonic clock started by the first chunk of
+    audio and always trails it by a jitter window, so every call to
+    get_combined_audio yields the samples that elapsed since the previous
+    call regardless of how bursty the input is. Each stream keeps a position
+    on the mixed timeline; a stream with no data when its turn comes is
+    padded with silence instead of being dropped.
+
+    Samples are stored as int16, the pipeline's canonical format, and only
+    converted to float32 when mixed.
+    """
+
+    def __init__(self, buffer_size: int = 4096, channels: int = 1, sample_rate: int = 16000,
+                 max_buffer_seconds: float = 10.0, jitter_ms: float = 150.0):
         self.buffer_size = buffer_size
         self.channels = channels
         self.sample_rate = sample_rate
-        self.buffer: Dict[str, np.ndarray] = {}
+        self.capacity = int(max_buffer_seconds * sample_rate)
+        self.jitter_samples = int(jitter_ms * sample_rate / 1000)
+        self.buffer: Dict[str, RingBuffer] = {}
         self.timestamps: Dict[str, datetime] = {}
-        self.max_delay = timedelta(milliseconds=150)  # Maximum allowed delay between streams
+        self.positions: Dict[str, int] = {}  # Mixed-timeline position of each stream's next sample
+        self.silence_padded: Dict[str, int] = {}
+        self.clock_start: Optional[float] = None
+        self.mix_position = 0
 
     def add_stream(self, stream_id: str):
         """Initialize a new audio stream buffer"""
-        self.buffer[stream_id] = np.zeros((0, self.channels), dtype=np.float32)
+        self.buffer[stream_id] = RingBuffer(self.capacity, self.channels, dtype=np.int16)
         self.timestamps[stream_id] = datetime.now()
+        self.positions[stream_id] = self.mix_position
+        self.silence_padded[stream_id] = 0
         logger.info(f"Added new audio stream: {stream_id}")
 
     def add_audio(self, stream_id: str, audio_data: np.ndarray):
         """Add audio data to a specific stream buffer"""
         if stream_id not in self.buffer:
             self.add_stream(stream_id)
+        if self.clock_start is None:
+            self.clock_start = time.monotonic()
 
-        self.buffer[stream_id] = np.vstack([self.buffer[stream_id], audio_data])
+        ring = self.buffer[stream_id]
+        overruns = ring.overruns
+        ring.write(audio_data)
+        if ring.overruns != overruns and (ring.overruns == 1 or ring.overruns % 50 == 0):
+            logger.warning(f"Buffer overrun on stream {stream_id}, dropped {ring.dropped_samples} samples so far")
+        self.positions[stream_id] += audio_data.shape[0]
         self.timestamps[stream_id] = datetime.now()
 
-    def get_combined_audio(self) -> Optional[np.ndarray]:
-        """Combine audio from all active streams"""
-        if not self.buffer:
+    def get_combined_audio(self, now: Optional[float] = None) -> Optional[np.ndarray]:
+        """Mix all streams up to the clock position minus the jitter window"""
+        if not self.buffer or self.clock_start is None:
             return None
 
-        # Remove stale streams
-        current_time = datetime.now()
-        stale_streams = [
-            stream_id for stream_id, timestamp in self.timestamps.items()
-            if current_time - timestamp > self.max_delay
-        ]
-        for stream_id in stale_streams:
-            del self.buffer[stream_id]
-            del self.timestamps[stream_id]
-            logger.warning(f"Removed stale stream: {stream_id}")
-
-        if not self.buffer:
+        now = time.monotonic() if now is None else now
+        target = round((now - self.clock_start) * self.sample_rate) - self.jitter_samples
+        n = target - self.mix_position
+        if n <= 0:
             return None
+        if n > self.capacity:
+            # The mixer fell further behind than any stream can buffer
+            skip = n - self.capacity
+            logger.warning(f"Mixer skipped {skip} samples")
+            for stream_id, ring in self.buffer.items():
+                dropped = min(ring.available, skip)
+                ring.consume(dropped)
+                self.positions[stream_id] += skip - dropped
+            self.mix_position += skip
+            n = self.capacity
 
-        # Find minimum length across all buffers
-        min_length = min(buf.shape[0] for buf in self.buffer.values())
-        
-        # Combine streams
-        combined = np.zeros((min_length, self.channels), dtype=np.float32)
-        for stream_id, buf in self.buffer.items():
-            combined += buf[:min_length]
-            # Keep remaining audio
-            self.buffer[stream_id] = buf[min_length:]
+        combined = np.zeros((n, self.channels), dtype=np.float32)
+        for stream_id, ring in self.buffer.items():
+            take = min(ring.available, n)
+            if take:
+                combined[:take] += ring.read(take)
+            if take < n:
+                # Late or missing data: fill the gap with silence and slip the
+                # stream's clock so its next samples follow the gap
+                gap = n - take
+                self.positions[stream_id] += gap
+                self.silence_padded[stream_id] += gap
+        self.mix_position += n
+        combined *= 1.0 / INT16_SCALE
 
         # Normalize
-        if np.max(np.abs(combined)) > 1.0:
-            combined = combined / np.max(np.abs(combined))
+        peak = np.max(np.abs(combined))
+        if peak > 1.0:
+            combined /= peak
 
         return combined
 
@@ -67,22 +181,35 @@ class AudioBuffer:
         """Clear all buffers"""
         self.buffer.clear()
         self.timestamps.clear()
+        self.positions.clear()
+        self.silence_padded.clear()
+        # The clock restarts with the next audio instead of counting the pause
+        self.clock_start = None
+        self.mix_position = 0
 
     def remove_stream(self, stream_id: str):
         """Remove a specific stream"""
         if stream_id in self.buffer:
             del self.buffer[stream_id]
             del self.timestamps[stream_id]
+            del self.positions[stream_id]
+            del self.silence_padded[stream_id]
             logger.info(f"Removed audio stream: {stream_id}")
 
     def get_buffer_status(self) -> Dict[str, dict]:
         """Get status of all buffers"""
         return {
             stream_id: {
-                "samples": buf.shape[0],
-                "duration": buf.shape[0] / self.sample_rate,
-                "last_updated": timestamp.isoformat()
+                "samples": ring.available,
+                "duration": ring.available / self.sample_rate,
+                "capacity": ring.capacity,
+                "fill_level": ring.fill_level,
+                "overruns": ring.overruns,
+                "dropped_samples": ring.dropped_samples,
+                "position": self.positions[stream_id],
+                "lead_samples": self.positions[stream_id] - self.mix_position,
+                "silence_padded": self.silence_padded[stream_id],
+                "last_updated": self.timestamps[stream_id].isoformat()
             }
-            for stream_id, (buf, timestamp) in 
-            zip(self.buffer.keys(), zip(self.buffer.values(), self.timestamps.values()))
-        }
\ No newline at end of file
+            for stream_id, ring in self.buffer.items()
+        }
@@ -0,0 +1,74 @@
+import numpy as np
+from typing import Optional, Sequence, Union
+import time
+
+INT16_SCALE = 32768.0
+
+class AudioChunk:
+    """A block of mono audio shared by every stage of the pipeline.
+
+    PCM is decoded once into a compact int16 array. Stages that need floating
+    point samples call as_float(), which converts lazily and caches the result,
+    and the original bytes are kept so the recognizer can send them without
+    re-encoding.
+    """
+
+    __slots__ = ("samples", "sample_rate", "audio_type", "received_at", "_raw", "_float", "_peak")
+
+    def __init__(self, samples: np.ndarray, sample_rate: int = 16000, audio_type: str = "microphone",
+                 received_at: Optional[float] = None, raw: Optional[bytes] = None):
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self.audio_type = audio_type
+        self.received_at = time.time() if received_at is None else received_at
+        self._raw = raw
+        self._float: Optional[np.ndarray] = None
+        self._peak: Optional[float] = None
+
+    @classmethod
+    def from_bytes(cls, data: Union[bytes, memoryview], sample_rate: int = 16000,
+                   audio_type: str = "microphone") -> "AudioChunk":
+        """Wrap little-endian int16 PCM (bytes or a view into a larger frame) without copying it"""
+        usable = len(data) - (len(data) % 2)
+        if usable != len(data):
+            data = data[:usable]
+        samples = np.frombuffer(data, dtype="<i2")
+        return cls(samples, sample_rate, audio_type, raw=data if isinstance(data, bytes) else None)
+
+    @classmethod
+    def from_float(cls, samples: Union[np.ndarray, Sequence[float]], sample_rate: int = 16000,
+                   audio_type: str = "microphone") -> "AudioChunk":
+        """Quantize float samples in [-1, 1] to int16"""
+        data = np.asarray(samples, dtype=np.float32)
+        pcm = np.clip(data * INT16_SCALE, -INT16_SCALE, INT16_SCALE - 1).astype(np.int16)
+        return cls(pcm, sample_rate, audio_type)
+
+    def __len__(self) -> int:
+        return self.samples.shape[0]
+
+    @property
+    def duration(self) -> float:
+        return len(self) / self.sample_rate
+
+    @property
+    def peak(self) -> float:
+        """Peak absolute level normalized to 0-1"""
+        if self._peak is None:
+            if len(self):
+                self._peak = max(int(self.samples.max()), -int(self.samples.min())) / INT16_SCALE
+            else:
+                self._peak = 0.0
+        return self._peak
+
+    def as_float(self) -> np.ndarray:
+        """float32 view of the samples in [-1, 1), converted on first use"""
+        if self._float is None:
+            self._float = self.samples.astype(np.float32)
+            self._float *= 1.0 / INT16_SCALE
+        return self._float
+
+    def to_bytes(self) -> bytes:
+        """int16 PCM bytes for the recognizer"""
+        if self._raw is None:
+            self._raw = self.samples.astype("<i2", copy=False).tobytes()
+        return self._raw
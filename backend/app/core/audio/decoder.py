@@ -0,0 +1,225 @@
+import logging
+import struct
+from typing import List, Optional, Tuple
+import numpy as np
+from .chunk import AudioChunk
+
+try:
+    import av
+except ImportError:  # Compressed ingest is unavailable without PyAV
+    av = None
+
+logger = logging.getLogger(__name__)
+
+# Codec names accepted in audio_meta
+PCM_CODECS = ("pcm", "pcm_s16le")
+WEBM_OPUS_CODECS = ("webm_opus", "webm/opus", "audio/webm;codecs=opus", "audio/webm")
+
+# EBML element ids (marker bits included)
+EBML_HEADER = 0x1A45DFA3
+SEGMENT = 0x18538067
+CLUSTER = 0x1F43B675
+TRACKS = 0x1654AE6B
+TRACK_ENTRY = 0xAE
+TRACK_NUMBER = 0xD7
+CODEC_ID = 0x86
+CODEC_PRIVATE = 0x63A2
+AUDIO = 0xE1
+SAMPLING_FREQUENCY = 0xB5
+CHANNELS = 0x9F
+BLOCK_GROUP = 0xA0
+BLOCK = 0xA1
+SIMPLE_BLOCK = 0xA3
+
+# Masters we descend into instead of skipping; their children arrive as
+# ordinary elements, so unknown-size (live) segments and clusters just work
+MASTER_ELEMENTS = {SEGMENT, CLUSTER, TRACKS, TRACK_ENTRY, AUDIO, BLOCK_GROUP}
+LEAF_ELEMENTS = {TRACK_NUMBER, CODEC_ID, CODEC_PRIVATE, SAMPLING_FREQUENCY, CHANNELS, BLOCK, SIMPLE_BLOCK}
+
+def _read_vint(data: bytearray, pos: int, keep_marker: bool) -> Optional[Tuple[int, int, bool]]:
+    """Decode an EBML variable-length integer; returns (value, length, all_ones) or None if incomplete"""
+    if pos >= len(data):
+        return None
+    first = data[pos]
+    length = 1
+    mask = 0x80
+    while length <= 8 and not first & mask:
+        mask >>= 1
+        length += 1
+    if length > 8:
+        raise ValueError("Invalid EBML variable-length integer")
+    if pos + length > len(data):
+        return None
+    value = first if keep_marker else first & (mask - 1)
+    for byte in data[pos + 1:pos + length]:
+        value = (value << 8) | byte
+    all_ones = value == (1 << (7 * length)) - 1 and not keep_marker
+    return value, length, all_ones
+
+class WebMDemuxer:
+    """Incremental WebM (Matroska) demuxer for a single-audio-track live stream.
+
+    Bytes can be fed in arbitrary pieces, e.g. MediaRecorder blobs: the parser
+    keeps its position in the element tree and any partial element across
+    calls. Track metadata is collected from the header, and the payload of
+    every SimpleBlock/Block for the audio track is returned as a codec packet.
+    A new EBML header restarts the stream (MediaRecorder restarted).
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._skip = 0  # Bytes of an uninteresting element still to discard
+        self.reset_tracks()
+
+    def reset_tracks(self):
+        self.track_number: Optional[int] = None
+        self.codec_id: Optional[str] = None
+        self.codec_private: Optional[bytes] = None
+        self.sample_rate: Optional[int] = None
+        self.channels: Optional[int] = None
+        self._entry: dict = {}
+        self.restarted = True
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Consume bytes and return the audio packets completed by them"""
+        self._buffer += data
+        packets: List[bytes] = []
+        pos = 0
+        buffer = self._buffer
+        while True:
+            if self._skip:
+                step = min(self._skip, len(buffer) - pos)
+                pos += step
+                self._skip -= step
+                if self._skip:
+                    break
+
+            element_id = _read_vint(buffer, pos, keep_marker=True)
+            if element_id is None:
+                break
+            size = _read_vint(buffer, pos + element_id[1], keep_marker=False)
+            if size is None:
+                break
+            header = element_id[1] + size[1]
+            element, length, unknown = element_id[0], size[0], size[2]
+
+            if element in MASTER_ELEMENTS:
+                if element == TRACK_ENTRY:
+                    self._entry = {}
+                pos += header
+                continue
+            if unknown:
+                raise ValueError(f"Unknown size on non-master EBML element 0x{element:X}")
+            if element == EBML_HEADER:
+                self.reset_tracks()
+            if element not in LEAF_ELEMENTS:
+                pos += header
+                self._skip = length
+                continue
+            if pos + header + length > len(buffer):
+                break
+
+            payload = bytes(buffer[pos + header:pos + header + length])
+            pos += header + length
+            packet = self._handle_leaf(element, payload)
+            if packet is not None:
+                packets.append(packet)
+
+        del self._buffer[:pos]
+        return packets
+
+    def _handle_leaf(self, element: int, payload: bytes) -> Optional[bytes]:
+        if element in (SIMPLE_BLOCK, BLOCK):
+            return self._block_payload(payload)
+        if element == TRACK_NUMBER:
+            self._entry["number"] = int.from_bytes(payload, "big")
+        elif element == CODEC_ID:
+            self._entry["codec"] = payload.rstrip(b"\0").decode("ascii", "replace")
+        elif element == CODEC_PRIVATE:
+            self._entry["private"] = payload
+        elif element == SAMPLING_FREQUENCY:
+            self._entry["rate"] = int(struct.unpack(">f" if len(payload) == 4 else ">d", payload)[0])
+        elif element == CHANNELS:
+            self._entry["channels"] = int.from_bytes(payload, "big")
+
+        # Adopt the first audio track once its number and codec are known
+        entry = self._entry
+        if self.track_number is None and "number" in entry and entry.get("codec", "").startswith("A_"):
+            self.track_number = entry["number"]
+        if self.track_number is not None and entry.get("number") == self.track_number:
+            self.codec_id = entry.get("codec", self.codec_id)
+            self.codec_private = entry.get("private", self.codec_private)
+            self.sample_rate = entry.get("rate", self.sample_rate)
+            self.channels = entry.get("channels", self.channels)
+        return None
+
+    def _block_payload(self, block: bytes) -> Optional[bytes]:
+        track = _read_vint(bytearray(block[:8]), 0, keep_marker=False)
+        if track is None or track[0] != self.track_number:
+            return None
+        offset = track[1] + 3  # Track number, int16 relative timecode, flags
+        if block[offset - 1] & 0x06:
+            # MediaRecorder never laces audio; laced blocks are not supported
+            logger.warning("Skipping laced WebM block")
+            return None
+        return block[offset:]
+
+class WebMOpusDecoder:
+    """Streaming WebM/Opus to int16 PCM decoder for one audio source.
+
+    Demuxing is incremental (WebMDemuxer) and Opus packets are decoded with a
+    persistent PyAV codec context, so chunks can split the container anywhere.
+    Output keeps the stream's own rate (48 kHz for Opus); the processor's
+    resampler brings it to the recognizer rate like any other source.
+    """
+
+    def __init__(self, audio_type: str = "microphone"):
+        if av is None:
+            raise RuntimeError("WebM/Opus ingest requires PyAV (pip install av)")
+        self.audio_type = audio_type
+        self.demuxer = WebMDemuxer()
+        self._codec = None
+        self._converter = None
+        self.sample_rate = 48000
+        self.packets = 0
+        self.errors = 0
+
+    def _open_codec(self):
+        if self.demuxer.codec_id != "A_OPUS":
+            raise ValueError(f"Unsupported WebM audio codec: {self.demuxer.codec_id}")
+        self._codec = av.CodecContext.create("libopus", "r")
+        if self.demuxer.codec_private:
+            self._codec.extradata = self.demuxer.codec_private
+        self._codec.sample_rate = self.demuxer.sample_rate or 48000
+        self._codec.layout = "stereo" if (self.demuxer.channels or 1) > 1 else "mono"
+        self.sample_rate = self._codec.sample_rate
+        self._converter = av.AudioResampler(format="s16", layout="mono", rate=self.sample_rate)
+        self.demuxer.restarted = False
+
+    def decode(self, data: bytes) -> AudioChunk:
+        """Feed a piece of the container; returns the PCM it completed (possibly empty)"""
+        decoded: List[np.ndarray] = []
+        for packet in self.demuxer.feed(data):
+            if self._codec is None or self.demuxer.restarted:
+                self._open_codec()
+            try:
+                for frame in self._codec.decode(av.Packet(packet)):
+                    for converted in self._converter.resample(frame):
+                        decoded.append(converted.to_ndarray().reshape(-1))
+                self.packets += 1
+            except av.FFmpegError as e:
+                # A corrupt packet costs 20 ms of audio, not the stream
+                self.errors += 1
+                logger.warning(f"Dropping undecodable Opus packet: {e}")
+
+        samples = np.concatenate(decoded) if decoded else np.zeros(0, dtype=np.int16)
+        return AudioChunk(samples.astype(np.int16, copy=False), self.sample_rate, self.audio_type)
+
+def normalize_codec(codec: Optional[str]) -> str:
+    """Map an audio_meta codec field to "pcm" or "webm_opus" (raises ValueError otherwise)"""
+    name = (codec or "pcm").strip().lower().replace(" ", "")
+    if name in PCM_CODECS:
+        return "pcm"
+    if name in WEBM_OPUS_CODECS:
+        return "webm_opus"
+    raise ValueError(f"Unsupported audio codec: {codec}")
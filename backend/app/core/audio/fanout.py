@@ -0,0 +1,128 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class TranscriptFanout:
+    """Per-session outbound path for transcript messages.
+
+    Recognition calls publish(), which only enqueues and never waits. A sender
+    task delivers messages to the client in order; while the client lags,
+    interim results for the same source are coalesced so only the newest one
+    is sent, and an interim still pending when its final arrives is dropped.
+    Finals are also handed to a separate persistence task, so a slow socket
+    and a slow database commit stall neither each other nor recognition.
+    """
+
+    def __init__(self, send: Callable[[dict], Awaitable[None]],
+                 persist: Optional[Callable[[dict], Awaitable[None]]] = None):
+        self.send = send
+        self.persist = persist
+        # Each entry is a one-item slot; a pending interim's slot is shared with
+        # _interims so newer interims replace it in place
+        self._outbound: Deque[List[Optional[dict]]] = deque()
+        self._interims: Dict[str, List[Optional[dict]]] = {}  # audio_type -> slot of the pending interim
+        self._ready = asyncio.Event()
+        self._persist_queue: asyncio.Queue = asyncio.Queue()
+        self._sender: Optional[asyncio.Task] = None
+        self._persister: Optional[asyncio.Task] = None
+
+        self.sent = 0
+        self.interims_coalesced = 0
+        self.persisted = 0
+        self.persist_errors = 0
+
+    def start(self):
+        self._sender = asyncio.create_task(self._send_loop())
+        if self.persist is not None:
+            self._persister = asyncio.create_task(self._persist_loop())
+
+    def publish(self, message: dict):
+        """Queue a transcript message without waiting (call on the event loop)"""
+        audio_type = message.get("audioType", "unknown")
+        if message.get("is_final"):
+            slot = self._interims.pop(audio_type, None)
+            if slot is not None:
+                slot[0] = None  # The final supersedes the unsent interim
+                self.interims_coalesced += 1
+            self._outbound.append([message])
+            if self.persist is not None:
+                self._persist_queue.put_nowait(message)
+        else:
+            slot = self._interims.get(audio_type)
+            if slot is not None:
+                slot[0] = message
+                self.interims_coalesced += 1
+            else:
+                slot = self._interims[audio_type] = [message]
+                self._outbound.append(slot)
+        self._ready.set()
+
+    def publish_control(self, message: dict):
+        """Queue a non-transcript message (e.g. backpressure) in order, never coalesced"""
+        self._outbound.append([message])
+        self._ready.set()
+
+    def _next(self) -> Optional[dict]:
+        while self._outbound:
+            slot = self._outbound.popleft()
+            message = slot[0]
+            if message is None:
+                continue
+            audio_type = message.get("audioType", "unknown")
+            if self._interims.get(audio_type) is slot:
+                del self._interims[audio_type]
+            return message
+        return None
+
+    async def _send_loop(self):
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            message = self._next()
+            while message is not None:
+                try:
+                    await self.send(message)
+                    self.sent += 1
+                except Exception as e:
+                    logger.error(f"Error sending transcript: {e}")
+                message = self._next()
+
+    async def _persist_loop(self):
+        while True:
+            message = await self._persist_queue.get()
+            try:
+                await self.persist(message)
+                self.persisted += 1
+            except Exception as e:
+                self.persist_errors += 1
+                logger.error(f"Error persisting transcript: {e}", exc_info=True)
+            finally:
+                self._persist_queue.task_done()
+
+    async def stop(self, timeout: float = 5.0):
+        """Let pending finals reach persistence, then stop both tasks"""
+        if self._persister is not None:
+            try:
+                await asyncio.wait_for(self._persist_queue.join(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Dropping {self._persist_queue.qsize()} unpersisted transcripts on shutdown")
+        for task in (self._sender, self._persister):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+    def get_status(self) -> dict:
+        return {
+            "pending": len(self._outbound),
+            "sent": self.sent,
+            "interims_coalesced": self.interims_coalesced,
+            "persist_pending": self._persist_queue.qsize(),
+            "persisted": self.persisted,
+            "persist_errors": self.persist_errors,
+        }
@@ -0,0 +1,146 @@
+import numpy as np
+import logging
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import get_window, lfilter
+from .chunk import AudioChunk, INT16_SCALE
+
+logger = logging.getLogger(__name__)
+
+# Lowest noise power per bin; digital silence would otherwise leave zeros to divide by
+NOISE_POWER_FLOOR = 1e-12
+
+class SpectralNoiseSuppressor:
+    """Streaming STFT noise suppressor with a persistent per-stream noise spectrum.
+
+    Audio is analysed in 50%-overlapping square-root-Hann frames, so analysis
+    and synthesis windows together reconstruct the input exactly when the gain
+    is 1. The noise power spectrum is carried across chunks with
+    minimum tracking: it follows drops immediately and rises slowly, so speech
+    does not leak into it. Frame powers are smoothed over time before the
+    minimum is taken, so single quiet frames do not drag the estimate down.
+    Each bin is attenuated by a Wiener gain driven by a decision-directed
+    a priori SNR, with a gain floor instead of a hard gate, which keeps
+    speech undistorted and avoids musical noise.
+
+    Output trails input by `hop_size` samples. Window, staging and overlap
+    buffers are allocated once and reused for every chunk.
+    """
+
+    def __init__(self, sample_rate: int = 16000, frame_size: int = 512, gain_floor: float = 0.1,
+                 smoothing: float = 0.7, noise_bias: float = 1.5, noise_rise: float = 0.005,
+                 snr_smoothing: float = 0.9, max_chunk_samples: int = 16000):
+        self.sample_rate = sample_rate
+        self.frame_size = frame_size
+        self.hop_size = frame_size // 2
+        self.gain_floor = gain_floor
+        self.snr_smoothing = snr_smoothing
+        self.smoothing = smoothing
+        self.noise_bias = noise_bias  # Compensates for the minimum sitting below the mean
+        self.noise_rise = noise_rise  # Per-frame rate at which the noise estimate may rise
+
+        self.window = np.sqrt(get_window("hann", frame_size, fftbins=True)).astype(np.float32)
+        self.noise_psd = None
+        self._smoothed = None
+
+        # Staging holds the previous hop of input followed by the new samples
+        self._stage = np.zeros(self.hop_size + max_chunk_samples, dtype=np.float32)
+        self._staged = self.hop_size
+        self._frames = np.empty((max_chunk_samples // self.hop_size + 1, frame_size), dtype=np.float32)
+        self._gains = np.empty((self._frames.shape[0], frame_size // 2 + 1), dtype=np.float64)
+        self._prev_clean = np.zeros(frame_size // 2 + 1, dtype=np.float64)  # Clean power estimate of the last frame
+        self._carry = np.zeros(self.hop_size, dtype=np.float32)  # Second half of the last synthesized frame
+
+    def _reserve(self, extra: int):
+        """Grow the staging buffers if a chunk larger than planned arrives"""
+        needed = self._staged + extra
+        if needed <= self._stage.shape[0]:
+            return
+        logger.debug(f"Growing noise suppressor staging buffer to {needed} samples")
+        stage = np.zeros(needed, dtype=np.float32)
+        stage[:self._staged] = self._stage[:self._staged]
+        self._stage = stage
+        self._frames = np.empty((needed // self.hop_size + 1, self.frame_size), dtype=np.float32)
+        self._gains = np.empty((self._frames.shape[0], self.frame_size // 2 + 1), dtype=np.float64)
+
+    def _update_noise(self, power: np.ndarray):
+        """Smooth the frame powers over time, then minimum-track them per bin"""
+        if self.noise_psd is None:
+            self._smoothed = power[0].copy()
+        smoothed, _ = lfilter(
+            [1.0 - self.smoothing], [1.0, -self.smoothing], power, axis=0,
+            zi=(self.smoothing * self._smoothed)[None, :]
+        )
+        self._smoothed = smoothed[-1]
+
+        quietest = np.maximum(smoothed.min(axis=0), NOISE_POWER_FLOOR)
+        if self.noise_psd is None:
+            self.noise_psd = quietest
+            return
+        rise = 1.0 - (1.0 - self.noise_rise) ** power.shape[0]
+        self.noise_psd = np.where(
+            quietest > self.noise_psd,
+            (1.0 - rise) * self.noise_psd + rise * quietest,
+            quietest
+        )
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """Denoise a block of float32 samples; returns every completed hop"""
+        self._reserve(samples.shape[0])
+        self._stage[self._staged:self._staged + samples.shape[0]] = samples
+        self._staged += samples.shape[0]
+
+        n_frames = (self._staged - self.hop_size) // self.hop_size
+        if n_frames == 0:
+            return np.zeros(0, dtype=np.float32)
+
+        frames = self._frames[:n_frames]
+        windows = sliding_window_view(self._stage[:self._staged], self.frame_size)[::self.hop_size][:n_frames]
+        np.multiply(windows, self.window, out=frames)
+
+        spectrum = np.fft.rfft(frames, axis=1)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        self._update_noise(power)
+
+        gain = self._gains[:n_frames]
+        noise = self.noise_psd * self.noise_bias
+        for k in range(n_frames):
+            # Decision-directed a priori SNR (Ephraim-Malah) with a Wiener gain
+            posterior = power[k] / noise
+            prior = self.snr_smoothing * self._prev_clean / noise \
+                + (1.0 - self.snr_smoothing) * np.maximum(posterior - 1.0, 0.0)
+            np.divide(prior, 1.0 + prior, out=gain[k])
+            np.maximum(gain[k], self.gain_floor, out=gain[k])
+            self._prev_clean = gain[k] * gain[k] * power[k]
+        spectrum *= gain
+
+        synthesized = np.fft.irfft(spectrum, n=self.frame_size, axis=1).astype(np.float32, copy=False)
+        synthesized *= self.window
+
+        # Overlap-add: each output hop is this frame's first half plus the
+        # previous frame's second half
+        halves = synthesized.reshape(n_frames, 2, self.hop_size)
+        out = halves[:, 0, :].copy()
+        out[0] += self._carry
+        out[1:] += halves[:-1, 1, :]
+        self._carry[:] = halves[-1, 1, :]
+
+        # Keep the unconsumed tail (one hop of history plus any partial hop)
+        consumed = n_frames * self.hop_size
+        remaining = self._staged - consumed
+        self._stage[:remaining] = self._stage[consumed:self._staged]
+        self._staged = remaining
+
+        return out.reshape(-1)
+
+    def process_chunk(self, chunk: AudioChunk) -> AudioChunk:
+        denoised = self.process(chunk.as_float())
+        pcm = np.clip(np.rint(denoised * INT16_SCALE), -INT16_SCALE, INT16_SCALE - 1).astype(np.int16)
+        return AudioChunk(pcm, chunk.sample_rate, chunk.audio_type, received_at=chunk.received_at)
+
+    def reset(self):
+        self.noise_psd = None
+        self._smoothed = None
+        self._stage[:self.hop_size] = 0
+        self._staged = self.hop_size
+        self._prev_clean[:] = 0
+        self._carry[:] = 0
@@ -0,0 +1,79 @@
+import numpy as np
+import logging
+from typing import List, Optional
+from .chunk import AudioChunk
+
+logger = logging.getLogger(__name__)
+
+class Packetizer:
+    """Re-frames a stream of variable-size chunks into fixed-duration packets.
+
+    Small chunks are coalesced and large ones split, so the recognizer sees one
+    request every `frame_ms` regardless of how the client sliced its audio.
+    Samples that do not yet fill a packet wait in a preallocated buffer until
+    more audio arrives or flush() is called (e.g. at the end of speech).
+    """
+
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = 100):
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.frame_samples = max(1, sample_rate * frame_ms // 1000)
+        self._pending = np.zeros(self.frame_samples, dtype=np.int16)
+        self._filled = 0
+        self._audio_type = "microphone"
+        self._received_at: Optional[float] = None  # Arrival time of the oldest pending sample
+        self.packets = 0
+        self.flushes = 0
+
+    def push(self, chunk: AudioChunk) -> List[AudioChunk]:
+        """Add a chunk and return every packet that is now complete"""
+        if chunk.sample_rate != self.sample_rate:
+            raise ValueError(f"Packetizer expects {self.sample_rate} Hz audio, got {chunk.sample_rate} Hz")
+        self._audio_type = chunk.audio_type
+        samples = chunk.samples
+        packets = []
+        offset = 0
+
+        # Top up the partial packet first
+        if self._filled:
+            take = min(self.frame_samples - self._filled, samples.shape[0])
+            self._pending[self._filled:self._filled + take] = samples[:take]
+            self._filled += take
+            offset = take
+            if self._filled == self.frame_samples:
+                packets.append(self._emit(self._pending.copy(), self._received_at))
+                self._filled = 0
+
+        # Whole packets straight out of the chunk; slices share its memory
+        while samples.shape[0] - offset >= self.frame_samples:
+            packets.append(self._emit(samples[offset:offset + self.frame_samples], chunk.received_at))
+            offset += self.frame_samples
+
+        rest = samples.shape[0] - offset
+        if rest:
+            if not self._filled:
+                self._received_at = chunk.received_at
+            self._pending[self._filled:self._filled + rest] = samples[offset:]
+            self._filled += rest
+        return packets
+
+    def flush(self) -> Optional[AudioChunk]:
+        """Emit whatever is pending as a short packet"""
+        if not self._filled:
+            return None
+        packet = self._emit(self._pending[:self._filled].copy(), self._received_at)
+        self._filled = 0
+        self.flushes += 1
+        return packet
+
+    def _emit(self, samples: np.ndarray, received_at: Optional[float]) -> AudioChunk:
+        self.packets += 1
+        return AudioChunk(samples, self.sample_rate, self._audio_type, received_at=received_at)
+
+    @property
+    def pending_samples(self) -> int:
+        return self._filled
+
+    def reset(self):
+        self._filled = 0
+        self._received_at = None
@@ -1,36 +1,73 @@
 import asyncio
 import logging
 import json
-from typing import Dict, Optional, Callable, Any
-from google.cloud import speech
-import queue
-import threading
-import numpy as np
+import os
+from typing import Dict, Optional, Callable, Any, Union
 import time
+import numpy as np
 from datetime import datetime
+from functools import partial
 from .stream_manager import StreamManager
+from .chunk import AudioChunk
+from .decoder import WebMOpusDecoder, normalize_codec
+from .protocol import SequenceTracker, is_audio_frame, parse_frame
+from .resampler import StreamingResampler
+from .fanout import TranscriptFanout
+from .packetizer import Packetizer
+from .recognizer import RECOGNIZER_SAMPLE_RATE, StreamingRecognizer
+from .recorder import AUDIO_RECORDING_DIR, MixRecorder
 
 logger = logging.getLogger(__name__)
 
+AUDIO_SOURCES = ("microphone", "system")
+DEFAULT_PACKET_MS = 100  # Recognizer request cadence; larger trades latency for fewer requests
+DEFAULT_MAX_QUEUE_MS = 3000  # Audio held per source while recognition is stalled
+
 class EnhancedAudioProcessor:
     def __init__(self, websocket: Any, client_id: str, on_transcript: Callable[[dict], None],
-                 loop: Optional[asyncio.AbstractEventLoop] = None):
+                 loop: Optional[asyncio.AbstractEventLoop] = None, recognition_mode: str = "async",
+                 packet_ms: int = DEFAULT_PACKET_MS, max_queue_ms: int = DEFAULT_MAX_QUEUE_MS,
+                 drop_policy: str = "non_speech_first", recording_dir: Optional[str] = AUDIO_RECORDING_DIR):
         self.websocket = websocket
         self.client_id = client_id
         self.on_transcript = on_transcript
         self.loop = loop or asyncio.get_event_loop()
         self.current_audio_type = None  # Initialize as None
         self.current_sample_rate = 16000
-        self.stream_manager = StreamManager()
-        self.audio_queue = queue.Queue()
+        self.stream_manager = StreamManager(buffer_audio=recording_dir is not None)
         self.is_running = True
         self.last_audio_timestamp = time.time()
-        self.silence_threshold = 0.01
         self.TIMEOUT_SECONDS = 60
         self.current_chunk_audio_type = None  # Track audio type per chunk
+        self.sequences = SequenceTracker()  # Gap/reorder detection for framed audio
+        self.current_chunk_codec = "pcm"  # Codec of the upcoming binary chunk, from audio_meta
+        self.decoders: Dict[str, WebMOpusDecoder] = {}  # audio_type -> compressed stream decoder
+        self.resamplers: Dict[str, StreamingResampler] = {}  # audio_type -> resampler
+        self.noise_suppression = True
         
-        # Initialize Google Speech client with more resilient settings
-        self.speech_client = speech.SpeechClient()
+        # One recognition pipeline per source, so the voices never share a
+        # recognition context and every result knows where it came from.
+        # Recognition runs as a coroutine on the shared async client by default;
+        # recognition_mode="thread" falls back to a blocking client on its own thread
+        self.recognizers: Dict[str, StreamingRecognizer] = {
+            audio_type: StreamingRecognizer(
+                f"{client_id}_{audio_type}", partial(self._handle_result, audio_type), self.loop,
+                mode=recognition_mode, timeout_seconds=self.TIMEOUT_SECONDS,
+                max_queue_ms=max_queue_ms, drop_policy=drop_policy,
+                on_pressure=partial(self._on_backpressure, audio_type)
+            )
+            for audio_type in AUDIO_SOURCES
+        }
+        self.fanout = TranscriptFanout(self.send_websocket_message, self.on_transcript)
+        # Speech is re-framed into fixed-duration packets before it is queued
+        self.packetizers: Dict[str, Packetizer] = {
+            audio_type: Packetizer(RECOGNIZER_SAMPLE_RATE, packet_ms) for audio_type in AUDIO_SOURCES
+        }
+        # Both sources mixed on the sample clock and written to disk, when enabled
+        self.recorder: Optional[MixRecorder] = None
+        if recording_dir is not None:
+            path = os.path.join(recording_dir, f"{client_id}_{datetime.now():%Y%m%d_%H%M%S}.wav")
+            self.recorder = MixRecorder(self.stream_manager, path)
         
     async def handle_message(self, message):
         """Handle incoming WebSocket messages with strict audio type tracking"""
@@ -42,187 +79,176 @@ class EnhancedAudioProcessor:
                     # Strictly validate audio type
                     audio_type = data.get('audioType')
                     
-                    if audio_type not in ["microphone", "system"]:
+                    if audio_type not in AUDIO_SOURCES:
                         logger.error(f"Invalid audio type received: {audio_type}")
                         return
                     
                     # Store the audio type for the upcoming chunk
                     self.current_chunk_audio_type = audio_type
                     self.current_audio_type = audio_type  # Update main audio type
-                    self.current_sample_rate = data.get('sampleRate', 16000)
+                    self.current_sample_rate = int(data.get('sampleRate', 16000))
+                    try:
+                        self.current_chunk_codec = normalize_codec(data.get('codec'))
+                    except ValueError as e:
+                        logger.error(str(e))
+                        self.current_chunk_audio_type = None
+                        return
                     
-                    logger.debug(f"Audio meta received - type: {audio_type}, rate: {self.current_sample_rate}")
+                    logger.debug(f"Audio meta received - type: {audio_type}, rate: {self.current_sample_rate}, "
+                                 f"codec: {self.current_chunk_codec}")
                     return
             
             # If we get here, message should be binary audio data
             if isinstance(message, bytes):
+                if is_audio_frame(message):
+                    await self.handle_frame(message)
+                    return
+
+                # Legacy: a bare chunk described by the preceding audio_meta
                 if self.current_chunk_audio_type is None:
-                    logger.error("Received audio chunk without preceding metadata")
+                    # Oldest clients send no metadata at all: int16 microphone PCM
+                    await self.process_chunk(message, "microphone", "pcm")
                     return
                     
                 # Use the audio type that was set by the most recent metadata message
-                await self.process_chunk(message, self.current_chunk_audio_type)
+                await self.process_chunk(message, self.current_chunk_audio_type, self.current_chunk_codec)
                 
         except json.JSONDecodeError:
             logger.error("Failed to parse message as JSON")
         except Exception as e:
             logger.error(f"Error handling message: {e}", exc_info=True)
             
-    async def process_chunk(self, audio_data: bytes, audio_type: str = "microphone"):
+    async def handle_frame(self, message: bytes):
+        """Handle a self-describing binary audio frame"""
+        try:
+            frame = parse_frame(message)
+        except ValueError as e:
+            logger.error(f"Invalid audio frame: {e}")
+            return False
+        if not self.sequences.accept(frame):
+            return False
+        self.current_audio_type = frame.audio_type
+        return await self.process_chunk(frame.payload, frame.audio_type, frame.codec, frame.sample_rate)
+
+    async def process_chunk(self, audio_data: Union[bytes, memoryview, AudioChunk], audio_type: str = "microphone",
+                            codec: str = "pcm", sample_rate: Optional[int] = None):
         """Process a new chunk of audio data with strict type checking"""
         try:
             if not self.is_running:
                 return False
 
-            if audio_type not in ["microphone", "system"]:
+            if audio_type not in AUDIO_SOURCES:
                 logger.error(f"Invalid audio type in process_chunk: {audio_type}")
                 return False
             
-            # Convert bytes to numpy array for audio level check
-            data = np.frombuffer(audio_data, dtype=np.int16)
+            # Decode the PCM once; every later stage shares this chunk
+            if isinstance(audio_data, AudioChunk):
+                chunk = audio_data
+                chunk.audio_type = audio_type
+            elif codec == "webm_opus":
+                # Compressed ingest: the decoder keeps container state between blobs
+                chunk = self._decoder(audio_type).decode(audio_data)
+                if not len(chunk):
+                    return True
+            elif codec == "pcm_f32le":
+                chunk = AudioChunk.from_float(np.frombuffer(audio_data, dtype="<f4"),
+                                              sample_rate or self.current_sample_rate, audio_type)
+            else:
+                chunk = AudioChunk.from_bytes(audio_data, sample_rate or self.current_sample_rate, audio_type)
             
-            # Check audio level
-            max_level = np.max(np.abs(data)) / 32768.0  # Normalize to 0-1
+            # Bring every source to the recognizer rate before it is queued
+            chunk = self._resample(chunk)
             
-            # Only process if audio level is above threshold
-            if max_level > self.silence_threshold:
+            stream_id = f"{self.client_id}_{audio_type}"
+            quality = self.stream_manager.quality_controller
+            cleaned = quality.suppress_noise(stream_id, chunk) if self.noise_suppression else chunk
+            
+            # Frame-level VAD: only speech frames plus pre-roll/hangover padding
+            # are queued for recognition
+            speech, speech_ended = quality.filter_speech(stream_id, cleaned)
+            recognizer = self.recognizers[audio_type]
+            packetizer = self.packetizers[audio_type]
+            if speech is not None:
                 self.last_audio_timestamp = time.time()
-                self.audio_queue.put((audio_type, audio_data))
-                
-                # Ensure we maintain the audio type through the entire processing chain
-                await self.stream_manager.process_audio_chunk(
-                    client_id=self.client_id,
-                    audio_data=audio_data,
-                    audio_type=audio_type  # Pass the specific audio type
-                )
+                for packet in packetizer.push(speech):
+                    recognizer.put(audio_type, packet, quality.is_speech(stream_id, packet))
+            if speech_ended:
+                # Don't hold the end of an utterance back waiting for a full packet
+                tail = packetizer.flush()
+                if tail is not None:
+                    recognizer.put(audio_type, tail, quality.is_speech(stream_id, tail))
+                logger.debug(f"Speech ended on {audio_type} stream")
                 
-                logger.debug(f"Processed chunk - type: {audio_type}, level: {max_level}")
+            # Ensure we maintain the audio type through the entire processing chain
+            await self.stream_manager.process_audio_chunk(
+                client_id=self.client_id,
+                chunk=chunk
+            )
+            
+            logger.debug(f"Processed chunk - type: {audio_type}, level: {chunk.peak}, "
+                         f"speech samples: {len(speech) if speech is not None else 0}")
             return True
             
         except Exception as e:
             logger.error(f"Error processing audio chunk: {e}", exc_info=True)
             return False
 
-    def _process_audio(self):
-        """Main audio processing loop with improved error handling"""
-        try:
-            logger.info("Starting audio processing loop")
-            
-            def request_generator():
-                while self.is_running:
-                    try:
-                        # Check for timeout
-                        if time.time() - self.last_audio_timestamp > self.TIMEOUT_SECONDS:
-                            logger.warning("Audio timeout detected, restarting stream")
-                            break
-
-                        try:
-                            audio_type, chunk = self.audio_queue.get(timeout=0.1)
-                            logger.debug(f"Processing audio chunk of type: {audio_type}")
-                        except queue.Empty:
-                            continue
-
-                        # Create the streaming request
-                        request = speech.StreamingRecognizeRequest(audio_content=chunk)
-                        yield request
-
-                    except Exception as e:
-                        logger.error(f"Error in request generator: {e}", exc_info=True)
-                        if not self.is_running:
-                            break
-                        time.sleep(0.1)  # Prevent tight loop on error
+    def _decoder(self, audio_type: str) -> WebMOpusDecoder:
+        decoder = self.decoders.get(audio_type)
+        if decoder is None:
+            logger.info(f"Starting WebM/Opus decoding for {audio_type} audio on client {self.client_id}")
+            decoder = self.decoders[audio_type] = WebMOpusDecoder(audio_type)
+        return decoder
 
-            streaming_config = speech.StreamingRecognitionConfig(
-                config=speech.RecognitionConfig(
-                    encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-                    sample_rate_hertz=16000,
-                    language_code="en-US",
-                    enable_automatic_punctuation=True,
-                    model="video",
-                    use_enhanced=True,
-                    enable_word_time_offsets=True,
-                    max_alternatives=1,
-                    enable_word_confidence=True,
-                    metadata=speech.RecognitionMetadata(
-                        interaction_type=speech.RecognitionMetadata.InteractionType.DISCUSSION,
-                        microphone_distance=speech.RecognitionMetadata.MicrophoneDistance.NEARFIELD,
-                        original_media_type=speech.RecognitionMetadata.OriginalMediaType.AUDIO
-                    ),
-                ),
-                interim_results=True,
-                single_utterance=False
-            )
-
-            while self.is_running:
-                try:
-                    logger.info(f"Starting streaming recognition for client: {self.client_id}")
-   
-                    responses = self.speech_client.streaming_recognize(
-                        streaming_config, 
-                        request_generator()
-                    )
-                    
-                    for response in responses:
-                        if not self.is_running:
-                            break
-
-                        if not response.results:
-                            continue
+    def _resample(self, chunk: AudioChunk) -> AudioChunk:
+        """Resample a chunk to RECOGNIZER_SAMPLE_RATE with a per-source stateful resampler"""
+        if chunk.sample_rate == RECOGNIZER_SAMPLE_RATE:
+            return chunk
 
-                        for result in response.results:
-                            if not result.alternatives:
-                                continue
+        resampler = self.resamplers.get(chunk.audio_type)
+        if resampler is None or resampler.in_rate != chunk.sample_rate:
+            logger.info(f"Resampling {chunk.audio_type} audio from {chunk.sample_rate} Hz to {RECOGNIZER_SAMPLE_RATE} Hz")
+            resampler = StreamingResampler(chunk.sample_rate, RECOGNIZER_SAMPLE_RATE)
+            self.resamplers[chunk.audio_type] = resampler
+        return resampler.process_chunk(chunk)
 
-                            alternative = result.alternatives[0]
-                            transcript = alternative.transcript
-                            is_final = result.is_final
-                            confidence = alternative.confidence if is_final else None
+    async def _handle_result(self, audio_type: str, result):
+        """Publish one recognition result from a source's pipeline to the client and, when final, to on_transcript"""
+        if not result.alternatives:
+            return
 
-                            # Create message with current audio type
-                            message = {
-                                "type": "transcript",
-                                "text": transcript,
-                                "is_final": is_final,
-                                "confidence": confidence,
-                                "audioType": self.current_audio_type or "unknown", # Use tracked audio type
-                                "timestamp": datetime.now().isoformat()
-                            }
-                            logger.info(f"Generated transcript for client {self.client_id}: {transcript[:50]}...")
-                            # Send through WebSocket
-                            try:
-                                future = asyncio.run_coroutine_threadsafe(
-                                    self.send_websocket_message(message),
-                                    self.loop
-                              )
-                                future.result(timeout=1)
-                                logger.debug("Sent transcript through WebSocket")
-                            except Exception as ws_error:
-                                logger.error(f"WebSocket send error: {ws_error}")
+        alternative = result.alternatives[0]
+        transcript = alternative.transcript
+        is_final = result.is_final
+        confidence = alternative.confidence if is_final else None
 
-                            if is_final:
-                                try:
-                                    logger.info(f"Calling on_transcript for final transcript: {transcript[:50]}...")
-                                    future = asyncio.run_coroutine_threadsafe(
-                                       self.on_transcript(message),
-                                       self.loop
-                                )
-                                    future.result(timeout=1)
-                                    logger.debug("Successfully processed final transcript")
-                                except Exception as callback_error:
-                                    logger.error(f"Callback error: {callback_error}")    
+        # Tag the message with the source whose pipeline produced it
+        message = {
+            "type": "transcript",
+            "text": transcript,
+            "is_final": is_final,
+            "confidence": confidence,
+            "audioType": audio_type,
+            "timestamp": datetime.now().isoformat()
+        }
+        logger.info(f"Generated {audio_type} transcript for client {self.client_id}: {transcript[:50]}...")
+        # Hand off without waiting: the fan-out sends to the client and
+        # persists finals on its own tasks, so recognition never stalls
+        self.fanout.publish(message)
 
-                      
-                except Exception as e:
-                    logger.error(f"Error in speech API communication for client {self.client_id}: {e}", exc_info=True)
-                    if self.is_running:
-                        time.sleep(1)  # Wait before retrying
-                        continue
-                    break
-
-        except Exception as e:
-            logger.error(f"Fatal error in audio processing: {e}", exc_info=True)
-        finally:
-            logger.info("Audio processing loop ended")
+    def _on_backpressure(self, audio_type: str, under_pressure: bool):
+        """Tell the client to slow down or buffer while a source's recognition queue is backed up"""
+        status = self.recognizers[audio_type].queue.get_status()
+        logger.info(f"Backpressure {'on' if under_pressure else 'off'} for {audio_type} "
+                    f"on client {self.client_id} ({status['queued_ms']} ms queued)")
+        self.fanout.publish_control({
+            "type": "backpressure",
+            "state": "slow_down" if under_pressure else "resume",
+            "audioType": audio_type,
+            "queued_ms": status["queued_ms"],
+            "dropped_ms": status["dropped_ms"],
+            "timestamp": datetime.now().isoformat()
+        })
 
     async def send_websocket_message(self, message: dict):
         """Send message with audio type verification"""
@@ -252,12 +278,17 @@ class EnhancedAudioProcessor:
         """Start the audio processing pipeline"""
         try:
             # Initialize streams
-            await self.stream_manager.add_stream(f"{self.client_id}", "microphone")
-            await self.stream_manager.add_stream(f"{self.client_id}", "system")
+            for audio_type in AUDIO_SOURCES:
+                await self.stream_manager.add_stream(f"{self.client_id}", audio_type)
+            
+            self.fanout.start()
+            if self.recorder is not None:
+                self.recorder.start()
             
-            # Start audio processing thread
-            self.processing_thread = threading.Thread(target=self._process_audio)
-            self.processing_thread.start()
+            # Start one recognition pipeline per source (event-loop tasks, or
+            # threads in fallback mode); they run in parallel
+            for recognizer in self.recognizers.values():
+                recognizer.start()
             
             logger.info(f"Started enhanced audio processor for client: {self.client_id}")
             return True
@@ -269,12 +300,14 @@ class EnhancedAudioProcessor:
         """Stop the audio processor"""
         try:
             self.is_running = False
-            if hasattr(self, 'processing_thread'):
-                self.processing_thread.join()
+            await asyncio.gather(*(recognizer.stop() for recognizer in self.recognizers.values()))
+            await self.fanout.stop()
+            if self.recorder is not None:
+                await self.recorder.stop()
             
             # Clean up streams
-            await self.stream_manager.remove_stream(self.client_id, "microphone")
-            await self.stream_manager.remove_stream(self.client_id, "system")
+            for audio_type in AUDIO_SOURCES:
+                await self.stream_manager.remove_stream(self.client_id, audio_type)
             
             logger.info(f"Stopped audio processor for client: {self.client_id}")
             return True
@@ -289,5 +322,18 @@ class EnhancedAudioProcessor:
             "is_running": self.is_running,
             "current_audio_type": self.current_audio_type,
             "sample_rate": self.current_sample_rate,
+            "recognition": {audio_type: recognizer.get_status()
+                            for audio_type, recognizer in self.recognizers.items()},
+            "audio_queue": {audio_type: recognizer.queue.get_status()
+                            for audio_type, recognizer in self.recognizers.items()},
+            "decoders": {audio_type: {"sample_rate": decoder.sample_rate, "packets": decoder.packets,
+                                      "errors": decoder.errors}
+                         for audio_type, decoder in self.decoders.items()},
+            "frames": self.sequences.get_status(),
+            "transcripts": self.fanout.get_status(),
+            "recording": self.recorder.get_status() if self.recorder is not None else None,
+            "packets": {audio_type: {"frame_ms": packetizer.frame_ms, "sent": packetizer.packets,
+                                     "flushes": packetizer.flushes, "pending_samples": packetizer.pending_samples}
+                        for audio_type, packetizer in self.packetizers.items()},
             "streams": self.stream_manager.get_all_stream_statuses()
         }
\ No newline at end of file
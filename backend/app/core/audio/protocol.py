@@ -0,0 +1,103 @@
+import struct
+import time
+import logging
+from typing import Dict, NamedTuple, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Binary audio frame: fixed little-endian header followed by the payload
+#   magic      4s  b"MAF\x01" (protocol version 1)
+#   stream     B   index into FRAME_STREAMS
+#   codec      B   index into FRAME_CODECS
+#   flags      H   reserved, 0
+#   sampleRate I   Hz (ignored for self-describing codecs)
+#   sequence   I   per-stream counter, wraps at 2**32
+#   capturedAt Q   client capture time, ms since the epoch
+FRAME_MAGIC = b"MAF\x01"
+FRAME_HEADER = struct.Struct("<4sBBHIIQ")
+FRAME_HEADER_SIZE = FRAME_HEADER.size
+FRAME_STREAMS = ("microphone", "system")
+FRAME_CODECS = ("pcm", "webm_opus", "pcm_f32le")
+
+SEQUENCE_MODULUS = 1 << 32
+
+class AudioFrame(NamedTuple):
+    audio_type: str
+    codec: str
+    sample_rate: int
+    sequence: int
+    captured_at: float  # Seconds since the epoch
+    payload: memoryview  # View into the received message, not a copy
+
+def is_audio_frame(data: Union[bytes, bytearray, memoryview]) -> bool:
+    return len(data) >= FRAME_HEADER_SIZE and bytes(data[:4]) == FRAME_MAGIC
+
+def parse_frame(data: Union[bytes, bytearray, memoryview]) -> AudioFrame:
+    """Split a framed message into its header fields and a zero-copy payload view"""
+    view = memoryview(data)
+    if len(view) < FRAME_HEADER_SIZE:
+        raise ValueError("Audio frame shorter than its header")
+    magic, stream, codec, _flags, sample_rate, sequence, captured_ms = FRAME_HEADER.unpack_from(view)
+    if magic != FRAME_MAGIC:
+        raise ValueError("Not an audio frame")
+    if stream >= len(FRAME_STREAMS):
+        raise ValueError(f"Unknown frame stream: {stream}")
+    if codec >= len(FRAME_CODECS):
+        raise ValueError(f"Unknown frame codec: {codec}")
+    return AudioFrame(FRAME_STREAMS[stream], FRAME_CODECS[codec], sample_rate, sequence,
+                      captured_ms / 1000.0, view[FRAME_HEADER_SIZE:])
+
+def encode_frame(payload: bytes, audio_type: str = "microphone", codec: str = "pcm", sample_rate: int = 16000,
+                 sequence: int = 0, captured_at: Optional[float] = None) -> bytes:
+    """Build a framed message (used by clients and tests)"""
+    captured_ms = int((time.time() if captured_at is None else captured_at) * 1000)
+    header = FRAME_HEADER.pack(FRAME_MAGIC, FRAME_STREAMS.index(audio_type), FRAME_CODECS.index(codec), 0,
+                               sample_rate, sequence % SEQUENCE_MODULUS, captured_ms)
+    return header + payload
+
+class SequenceTracker:
+    """Per-stream gap and reorder detection from frame sequence numbers.
+
+    A frame ahead of the expected number means frames were lost; one behind
+    it is a late or duplicate frame. Stateful stages downstream cannot take
+    audio out of order, so late frames are rejected and only counted.
+    """
+
+    def __init__(self):
+        self.expected: Dict[str, int] = {}
+        self.received: Dict[str, int] = {}
+        self.lost: Dict[str, int] = {}
+        self.late: Dict[str, int] = {}
+        self.capture_latency_ms: Dict[str, float] = {}
+
+    def accept(self, frame: AudioFrame) -> bool:
+        """Record a frame; returns False if it arrived out of order and should be dropped"""
+        stream = frame.audio_type
+        self.received[stream] = self.received.get(stream, 0) + 1
+        latency = max((time.time() - frame.captured_at) * 1000, 0.0)
+        previous = self.capture_latency_ms.get(stream)
+        self.capture_latency_ms[stream] = latency if previous is None else 0.9 * previous + 0.1 * latency
+
+        expected = self.expected.get(stream)
+        if expected is not None:
+            ahead = (frame.sequence - expected) % SEQUENCE_MODULUS
+            if ahead >= SEQUENCE_MODULUS // 2:
+                self.late[stream] = self.late.get(stream, 0) + 1
+                logger.warning(f"Dropping late {stream} frame {frame.sequence} (expected {expected})")
+                return False
+            if ahead:
+                self.lost[stream] = self.lost.get(stream, 0) + ahead
+                logger.warning(f"Gap in {stream} frames: {ahead} missing before {frame.sequence}")
+        self.expected[stream] = (frame.sequence + 1) % SEQUENCE_MODULUS
+        return True
+
+    def get_status(self) -> dict:
+        return {
+            stream: {
+                "received": self.received.get(stream, 0),
+                "lost": self.lost.get(stream, 0),
+                "late": self.late.get(stream, 0),
+                "capture_latency_ms": round(self.capture_latency_ms.get(stream, 0.0), 1),
+            }
+            for stream in self.received
+        }
@@ -1,15 +1,201 @@
 import numpy as np
-from typing import Tuple
+from typing import Deque, Dict, Hashable, List, Mapping, Optional, Tuple
+from collections import deque
 import logging
+from .chunk import AudioChunk, INT16_SCALE
+from .noise import SpectralNoiseSuppressor
+
+try:
+    import webrtcvad
+except ImportError:  # Fall back to the NumPy energy detector
+    webrtcvad = None
 
 logger = logging.getLogger(__name__)
 
+class StreamingVAD:
+    """Frame-level voice activity detector for a single audio stream.
+
+    Audio is cut into fixed frames (10, 20 or 30 ms) and each frame is
+    classified by webrtcvad when it is installed, or otherwise by a vectorized
+    energy / zero-crossing test against an adaptive noise floor. Decisions are
+    smoothed: speech starts after `onset_frames` consecutive speech frames and
+    continues for `hangover_frames` after the last one. The `preroll_frames`
+    preceding an onset are forwarded too, so word beginnings are not clipped.
+    """
+
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = 20, aggressiveness: int = 2,
+                 onset_frames: int = 2, hangover_frames: int = 15, preroll_frames: int = 10,
+                 energy_threshold: float = 0.005, use_webrtc: bool = True):
+        if frame_ms not in (10, 20, 30):
+            raise ValueError("frame_ms must be 10, 20 or 30")
+        self.sample_rate = sample_rate
+        self.frame_size = sample_rate * frame_ms // 1000
+        self.onset_frames = onset_frames
+        self.hangover_frames = hangover_frames
+        self.energy_threshold = energy_threshold
+        self.noise_floor = 0.0
+        self._vad = webrtcvad.Vad(aggressiveness) if (use_webrtc and webrtcvad is not None) else None
+
+        self._remainder = np.zeros(0, dtype=np.int16)
+        self._preroll: Deque[np.ndarray] = deque(maxlen=preroll_frames)
+        self._pending: List[np.ndarray] = []  # Frames of a possible onset
+        self.in_speech = False
+        self._hangover = 0
+
+    def classify(self, frames: np.ndarray) -> np.ndarray:
+        """Return a speech flag for each row of an int16 (n_frames, frame_size) array"""
+        if self._vad is not None:
+            return np.fromiter(
+                (self._vad.is_speech(frame.tobytes(), self.sample_rate) for frame in frames),
+                dtype=bool, count=frames.shape[0]
+            )
+
+        scaled = frames.astype(np.float32) * (1.0 / INT16_SCALE)
+        rms = np.sqrt(np.mean(scaled * scaled, axis=1))
+        zcr = np.count_nonzero(np.diff(np.signbit(scaled), axis=1), axis=1) / frames.shape[1]
+        flags = (rms > max(self.energy_threshold, self.noise_floor * 3.0)) & (zcr < 0.4)
+
+        # Minimum-tracking noise floor: falls immediately, rises slowly
+        quietest = float(np.min(rms))
+        if quietest < self.noise_floor:
+            self.noise_floor = quietest
+        else:
+            self.noise_floor = 0.98 * self.noise_floor + 0.02 * quietest
+        return flags
+
+    def process(self, chunk: AudioChunk) -> Tuple[Optional[AudioChunk], bool]:
+        """Consume a chunk and return (speech audio to forward, speech ended in this chunk)"""
+        samples = np.concatenate((self._remainder, chunk.samples)) if self._remainder.size else chunk.samples
+        n_frames = samples.shape[0] // self.frame_size
+        self._remainder = samples[n_frames * self.frame_size:].copy()
+        if n_frames == 0:
+            return None, False
+
+        frames = samples[:n_frames * self.frame_size].reshape(n_frames, self.frame_size)
+        flags = self.classify(frames)
+
+        forwarded: List[np.ndarray] = []
+        speech_ended = False
+        for frame, is_speech in zip(frames, flags):
+            if self.in_speech:
+                forwarded.append(frame)
+                if is_speech:
+                    self._hangover = self.hangover_frames
+                else:
+                    self._hangover -= 1
+                    if self._hangover <= 0:
+                        self.in_speech = False
+                        speech_ended = True
+            elif is_speech:
+                self._pending.append(frame)
+                if len(self._pending) >= self.onset_frames:
+                    self.in_speech = True
+                    self._hangover = self.hangover_frames
+                    forwarded.extend(self._preroll)
+                    forwarded.extend(self._pending)
+                    self._preroll.clear()
+                    self._pending.clear()
+            else:
+                # A burst shorter than the onset (e.g. a click) is treated as silence
+                self._preroll.extend(self._pending)
+                self._pending.clear()
+                self._preroll.append(frame)
+
+        if not forwarded:
+            return None, speech_ended
+        return AudioChunk(np.concatenate(forwarded), self.sample_rate, chunk.audio_type,
+                          received_at=chunk.received_at), speech_ended
+
+    def is_speech_level(self, chunk: AudioChunk) -> bool:
+        """Whether a forwarded chunk is loud enough to be speech rather than padding (no state change)"""
+        if not len(chunk):
+            return False
+        samples = chunk.as_float()
+        rms = float(np.sqrt(np.dot(samples, samples) / samples.shape[0]))
+        return rms > max(self.energy_threshold, self.noise_floor * 3.0)
+
+    def reset(self):
+        self._remainder = np.zeros(0, dtype=np.int16)
+        self._preroll.clear()
+        self._pending.clear()
+        self.in_speech = False
+        self._hangover = 0
+
+def compute_batch_metrics(streams: Mapping[Hashable, np.ndarray], sample_rate: int = 16000,
+                          frame_ms: int = 20, speech_threshold: float = 0.02,
+                          clip_level: float = 0.99) -> Dict[Hashable, dict]:
+    """
+    Compute quality metrics for many streams at once
+    Each stream's samples (int16 PCM or float in [-1, 1]) become a row of one
+    zero-padded float32 matrix, and every metric is reduced over that matrix
+    with row masks, so the cost is a handful of vectorized passes regardless
+    of how many streams are active.
+    Returns: stream_id -> {rms_level, peak_level, clipping_ratio,
+             zero_crossing_rate, speech_ratio, samples}
+    """
+    ids = [stream_id for stream_id, samples in streams.items() if len(samples)]
+    if not ids:
+        return {stream_id: _empty_metrics() for stream_id in streams}
+
+    lengths = np.array([len(streams[stream_id]) for stream_id in ids])
+    width = int(lengths.max())
+    stacked = np.zeros((len(ids), width), dtype=np.float32)
+    for row, stream_id in enumerate(ids):
+        samples = streams[stream_id]
+        scale = 1.0 / INT16_SCALE if samples.dtype == np.int16 else 1.0
+        np.multiply(samples.reshape(-1), scale, out=stacked[row, :lengths[row]], casting="unsafe")
+
+    magnitude = np.abs(stacked)
+    rms = np.sqrt(np.einsum("ij,ij->i", stacked, stacked) / lengths)
+    peak = magnitude.max(axis=1)
+    clipping = np.count_nonzero(magnitude >= clip_level, axis=1) / lengths
+
+    # Padding is zero, so only crossings inside each row's length are counted
+    crossings = np.diff(np.signbit(stacked), axis=1)
+    crossings &= np.arange(width - 1)[None, :] < (lengths - 1)[:, None]
+    zcr = crossings.sum(axis=1) / np.maximum(lengths - 1, 1)
+
+    frame = sample_rate * frame_ms // 1000
+    n_frames = width // frame
+    if n_frames:
+        frames = stacked[:, :n_frames * frame].reshape(len(ids), n_frames, frame)
+        frame_rms = np.sqrt(np.einsum("ijk,ijk->ij", frames, frames) / frame)
+        complete = np.arange(n_frames)[None, :] < (lengths // frame)[:, None]
+        speech_ratio = np.count_nonzero((frame_rms > speech_threshold) & complete, axis=1) \
+            / np.maximum(complete.sum(axis=1), 1)
+    else:
+        speech_ratio = np.zeros(len(ids))
+
+    metrics = {stream_id: _empty_metrics() for stream_id in streams}
+    for row, stream_id in enumerate(ids):
+        metrics[stream_id] = {
+            "rms_level": float(rms[row]),
+            "peak_level": float(peak[row]),
+            "clipping_ratio": float(clipping[row]),
+            "zero_crossing_rate": float(zcr[row]),
+            "speech_ratio": float(speech_ratio[row]),
+            "samples": int(lengths[row]),
+        }
+    return metrics
+
+def _empty_metrics() -> dict:
+    return {
+        "rms_level": 0.0,
+        "peak_level": 0.0,
+        "clipping_ratio": 0.0,
+        "zero_crossing_rate": 0.0,
+        "speech_ratio": 0.0,
+        "samples": 0,
+    }
+
 class AudioQualityController:
     def __init__(self, sample_rate: int = 16000):
         self.sample_rate = sample_rate
         self.noise_threshold = 0.02
+        self.vads: Dict[str, StreamingVAD] = {}  # stream_id -> detector
+        self.suppressors: Dict[str, SpectralNoiseSuppressor] = {}  # stream_id -> noise suppressor
         
-    def process_audio(self, audio_data: np.ndarray) -> Tuple[np.ndarray, bool]:
+    def process_audio(self, audio_data: np.ndarray, stream_id: str = "default") -> Tuple[np.ndarray, bool]:
         """
         Process audio data for quality improvement
         Returns: (processed_audio, is_speech)
@@ -20,7 +206,7 @@ class AudioQualityController:
                 audio_data = audio_data.astype(np.float32)
 
             # Noise reduction
-            audio_data = self._reduce_noise(audio_data)
+            audio_data = self._reduce_noise(audio_data, stream_id)
 
             # Check if speech is present
             is_speech = self._detect_speech(audio_data)
@@ -34,29 +220,53 @@ class AudioQualityController:
             logger.error(f"Error processing audio: {e}")
             return audio_data, False
 
-    def _reduce_noise(self, audio_data: np.ndarray) -> np.ndarray:
-        """Simple noise reduction"""
-        # Calculate noise floor
-        noise_floor = np.mean(np.abs(audio_data[audio_data < self.noise_threshold]))
-        
-        # Apply noise gate
-        audio_data[np.abs(audio_data) < noise_floor * 2] = 0
-        
-        return audio_data
+    def _suppressor(self, stream_id: str, sample_rate: int) -> SpectralNoiseSuppressor:
+        suppressor = self.suppressors.get(stream_id)
+        if suppressor is None or suppressor.sample_rate != sample_rate:
+            suppressor = self.suppressors[stream_id] = SpectralNoiseSuppressor(sample_rate)
+        return suppressor
+
+    def suppress_noise(self, stream_id: str, chunk: AudioChunk) -> AudioChunk:
+        """Denoise a chunk with the stream's running noise profile (output trails input by one hop)"""
+        return self._suppressor(stream_id, chunk.sample_rate).process_chunk(chunk)
+
+    def _reduce_noise(self, audio_data: np.ndarray, stream_id: str = "default") -> np.ndarray:
+        """Spectral noise suppression"""
+        return self._suppressor(stream_id, self.sample_rate).process(audio_data)
+
+    def filter_speech(self, stream_id: str, chunk: AudioChunk) -> Tuple[Optional[AudioChunk], bool]:
+        """
+        Run the stream's frame-level VAD over a chunk
+        Returns: (speech frames plus padding, or None; whether speech ended)
+        """
+        vad = self.vads.get(stream_id)
+        if vad is None or vad.sample_rate != chunk.sample_rate:
+            vad = self.vads[stream_id] = StreamingVAD(chunk.sample_rate)
+        return vad.process(chunk)
+
+    def is_speech(self, stream_id: str, chunk: AudioChunk) -> bool:
+        """Classify a chunk already passed by filter_speech as speech or VAD padding"""
+        vad = self.vads.get(stream_id)
+        return vad.is_speech_level(chunk) if vad is not None else True
+
+    def remove_stream(self, stream_id: str):
+        self.vads.pop(stream_id, None)
+        self.suppressors.pop(stream_id, None)
 
     def _detect_speech(self, audio_data: np.ndarray) -> bool:
-        """Detect if audio contains speech using energy levels"""
+        """Detect if audio contains speech using per-frame energy levels"""
         try:
-            # Calculate RMS energy
-            rms = np.sqrt(np.mean(audio_data**2))
-            
-            # Calculate zero crossing rate
-            zero_crossings = np.sum(np.abs(np.diff(np.signbit(audio_data)))) / len(audio_data)
-            
-            # Simple speech detection heuristic
-            is_speech = rms > self.noise_threshold and zero_crossings > 0.1
-            
-            return bool(is_speech)
+            vad = StreamingVAD(self.sample_rate, use_webrtc=False, energy_threshold=self.noise_threshold)
+            frame_count = len(audio_data) // vad.frame_size
+            if frame_count == 0:
+                return False
+
+            pcm = np.clip(audio_data[:frame_count * vad.frame_size] * INT16_SCALE, -INT16_SCALE, INT16_SCALE - 1)
+            flags = vad.classify(pcm.astype(np.int16).reshape(frame_count, vad.frame_size))
+
+            # Require at least onset_frames consecutive speech frames
+            run = np.convolve(flags.astype(np.int8), np.ones(vad.onset_frames, dtype=np.int8), mode="valid")
+            return bool(np.any(run >= vad.onset_frames))
             
         except Exception as e:
             logger.error(f"Error detecting speech: {e}")
@@ -71,9 +281,14 @@ class AudioQualityController:
 
     def check_quality(self, audio_data: np.ndarray) -> dict:
         """Check audio quality metrics"""
+        metrics = compute_batch_metrics({"audio": audio_data}, self.sample_rate,
+                                        speech_threshold=self.noise_threshold)["audio"]
         return {
-            "rms_level": float(np.sqrt(np.mean(audio_data**2))),
-            "peak_level": float(np.max(np.abs(audio_data))),
-            "has_speech": self._detect_speech(audio_data),
-            "zero_crossings": len(np.where(np.diff(np.signbit(audio_data)))[0]),
-        }
\ No newline at end of file
+            **metrics,
+            "has_speech": metrics["speech_ratio"] > 0,
+            "zero_crossings": int(round(metrics["zero_crossing_rate"] * max(len(audio_data) - 1, 1))),
+        }
+
+    def check_quality_batch(self, streams: Dict[str, np.ndarray]) -> Dict[str, dict]:
+        """Check audio quality metrics for several streams in one vectorized pass"""
+        return compute_batch_metrics(streams, self.sample_rate, speech_threshold=self.noise_threshold)
\ No newline at end of file
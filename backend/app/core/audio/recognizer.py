@@ -0,0 +1,360 @@
+import asyncio
+import logging
+import queue
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterator, List, Optional, Set, Tuple
+from google.cloud import speech
+from .audio_queue import BoundedAudioQueue
+from .chunk import AudioChunk
+
+logger = logging.getLogger(__name__)
+
+RECOGNIZER_SAMPLE_RATE = 16000
+
+# One async client (and gRPC channel) per event loop, shared by every session
+_async_clients: Dict[asyncio.AbstractEventLoop, speech.SpeechAsyncClient] = {}
+
+def get_async_speech_client() -> speech.SpeechAsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = speech.SpeechAsyncClient()
+    return client
+
+def build_streaming_config(sample_rate: int = RECOGNIZER_SAMPLE_RATE) -> speech.StreamingRecognitionConfig:
+    return speech.StreamingRecognitionConfig(
+        config=speech.RecognitionConfig(
+            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+            sample_rate_hertz=sample_rate,
+            language_code="en-US",
+            enable_automatic_punctuation=True,
+            model="video",
+            use_enhanced=True,
+            enable_word_time_offsets=True,
+            max_alternatives=1,
+            enable_word_confidence=True,
+            metadata=speech.RecognitionMetadata(
+                interaction_type=speech.RecognitionMetadata.InteractionType.DISCUSSION,
+                microphone_distance=speech.RecognitionMetadata.MicrophoneDistance.NEARFIELD,
+                original_media_type=speech.RecognitionMetadata.OriginalMediaType.AUDIO
+            ),
+        ),
+        interim_results=True,
+        single_utterance=False
+    )
+
+def _log_callback_error(future):
+    if not future.cancelled() and future.exception() is not None:
+        logger.error(f"Callback error: {future.exception()}")
+
+class RecognitionStream:
+    """One provider streaming session, positioned on the global audio timeline"""
+
+    def __init__(self, index: int, start_offset: float, replay: List[AudioChunk]):
+        self.index = index
+        self.start_offset = start_offset  # Global audio seconds at the stream's first sample
+        self.replay = replay
+        self.opened_at = time.time()
+        self.closed = asyncio.Event()
+        self.rotated = False
+
+class StreamingRecognizer:
+    """
+    Feeds queued audio chunks to Google streaming recognition
+    mode="async" runs on the event loop with the shared SpeechAsyncClient, so
+    sessions cost a coroutine instead of an OS thread. mode="thread" keeps the
+    original blocking SpeechClient in a dedicated thread, as a fallback.
+    Both read from a BoundedAudioQueue, so a stalled stream drops old audio
+    instead of growing without limit.
+
+    Streams are rotated before the provider's duration cap: the outgoing stream
+    is half-closed and left to deliver its last results while the next one is
+    opened straight away, starting with a replay of the last REPLAY_SECONDS of
+    audio. Results are placed on a global audio timeline so the replayed
+    overlap is not transcribed twice.
+    Every recognition result is passed to the on_result coroutine.
+    """
+
+    STREAM_LIMIT_SECONDS = 280  # The provider ends a streaming session at ~305 s
+    REPLAY_SECONDS = 2.0
+    DUPLICATE_TOLERANCE = 0.05
+
+    def __init__(self, client_id: str, on_result: Callable[[Any], Awaitable[None]],
+                 loop: asyncio.AbstractEventLoop, mode: str = "async", timeout_seconds: int = 60,
+                 max_queue_ms: int = 3000, drop_policy: str = "non_speech_first",
+                 on_pressure: Optional[Callable[[bool], None]] = None):
+        if mode not in ("async", "thread"):
+            raise ValueError(f"Unknown recognition mode: {mode}")
+        self.client_id = client_id
+        self.on_result = on_result
+        self.loop = loop
+        self.mode = mode
+        self.timeout_seconds = timeout_seconds
+        self.streaming_config = build_streaming_config()
+        self.queue = BoundedAudioQueue(max_queue_ms, drop_policy, loop=loop, on_pressure=on_pressure)
+        self.is_running = False
+        self.last_audio_timestamp = time.time()
+        self._task: Optional[asyncio.Task] = None
+        self._thread = None
+
+        # Global audio timeline shared by all streams of the session
+        self.sent_seconds = 0.0
+        self.final_until = 0.0  # End of the last delivered final result
+        self._history: Deque[Tuple[float, AudioChunk]] = deque()
+        self._streams_opened = 0
+        self._draining: Set[asyncio.Task] = set()
+        self.rotations = 0
+        self.duplicates_dropped = 0
+
+    def start(self):
+        self.is_running = True
+        if self.mode == "async":
+            self._task = self.loop.create_task(self._run_async())
+        else:
+            import threading
+            self._thread = threading.Thread(target=self._run_blocking, daemon=True)
+            self._thread.start()
+
+    async def stop(self):
+        self.is_running = False
+        tasks = list(self._draining)
+        if self._task is not None:
+            tasks.append(self._task)
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self._thread is not None:
+            await asyncio.to_thread(self._thread.join)
+
+    def put(self, audio_type: str, chunk: AudioChunk, speech: bool = True) -> bool:
+        """Queue a chunk for recognition (called on the event loop); False if it was dropped"""
+        return self.queue.put(audio_type, chunk, speech)
+
+    def _timed_out(self) -> bool:
+        return time.time() - self.last_audio_timestamp > self.timeout_seconds
+
+    def _open_stream(self) -> RecognitionStream:
+        """Start a stream at the oldest audio still held for replay"""
+        replay = [chunk for _, chunk in self._history]
+        start_offset = self._history[0][0] if self._history else self.sent_seconds
+        stream = RecognitionStream(self._streams_opened, start_offset, replay)
+        self._streams_opened += 1
+        logger.info(f"Starting streaming recognition for client: {self.client_id} "
+                    f"(stream {stream.index}, replaying {self.sent_seconds - start_offset:.2f}s)")
+        return stream
+
+    def _remember(self, chunk: AudioChunk):
+        """Advance the global timeline and keep the replay tail"""
+        self._history.append((self.sent_seconds, chunk))
+        self.sent_seconds += chunk.duration
+        horizon = self.sent_seconds - self.REPLAY_SECONDS
+        while self._history and self._history[0][0] + self._history[0][1].duration <= horizon:
+            self._history.popleft()
+
+    def _accept(self, stream: RecognitionStream, result) -> bool:
+        """Drop results for audio already finalized and trim overlapping words"""
+        if not result.alternatives:
+            return False
+        end = stream.start_offset + result.result_end_time.total_seconds()
+        if end <= self.final_until + self.DUPLICATE_TOLERANCE:
+            self.duplicates_dropped += 1
+            logger.debug(f"Dropping duplicate result from stream {stream.index}")
+            return False
+        if not result.is_final:
+            return True
+
+        alternative = result.alternatives[0]
+        if stream.start_offset < self.final_until and alternative.words:
+            cutoff = self.final_until - self.DUPLICATE_TOLERANCE
+            kept = [w for w in alternative.words
+                    if stream.start_offset + w.start_time.total_seconds() >= cutoff]
+            if len(kept) < len(alternative.words):
+                alternative.transcript = " ".join(w.word for w in kept)
+                del alternative.words[:len(alternative.words) - len(kept)]
+        self.final_until = end
+        return bool(alternative.transcript.strip())
+
+    def _stream_deadline(self, stream: RecognitionStream) -> float:
+        return stream.opened_at + self.STREAM_LIMIT_SECONDS
+
+    async def _requests_async(self, stream: RecognitionStream) -> AsyncIterator[speech.StreamingRecognizeRequest]:
+        try:
+            yield speech.StreamingRecognizeRequest(streaming_config=self.streaming_config)
+            for chunk in stream.replay:
+                yield speech.StreamingRecognizeRequest(audio_content=chunk.to_bytes())
+            while self.is_running:
+                now = time.time()
+                idle_left = self.timeout_seconds - (now - self.last_audio_timestamp)
+                rotate_left = self._stream_deadline(stream) - now
+                if rotate_left <= 0:
+                    stream.rotated = True
+                    logger.info(f"Rotating recognition stream {stream.index} before the duration limit")
+                    return
+                try:
+                    audio_type, chunk = await asyncio.wait_for(self.queue.get(), timeout=max(min(idle_left, rotate_left), 0))
+                except asyncio.TimeoutError:
+                    if rotate_left <= idle_left:
+                        continue
+                    logger.warning("Audio timeout detected, closing stream")
+                    self._history.clear()
+                    return
+                self.last_audio_timestamp = time.time()
+                logger.debug(f"Processing audio chunk of type: {audio_type}")
+                self._remember(chunk)
+                yield speech.StreamingRecognizeRequest(audio_content=chunk.to_bytes())
+        finally:
+            stream.closed.set()
+
+    async def _run_stream(self, stream: RecognitionStream):
+        client = get_async_speech_client()
+        responses = await client.streaming_recognize(requests=self._requests_async(stream))
+        async for response in responses:
+            if not self.is_running:
+                break
+            for result in response.results:
+                if self._accept(stream, result):
+                    await self.on_result(result)
+
+    async def _run_async(self):
+        """Recognition loop on the event loop"""
+        logger.info("Starting async audio processing loop")
+        failures = 0
+        try:
+            while self.is_running:
+                # Don't hold a stream open while nothing is being said
+                if self._timed_out() and self.queue.empty():
+                    await self.queue.wait_nonempty()
+                    self.last_audio_timestamp = time.time()
+
+                stream = self._open_stream()
+                task = asyncio.create_task(self._run_stream(stream))
+                closed = asyncio.create_task(stream.closed.wait())
+                await asyncio.wait((task, closed), return_when=asyncio.FIRST_COMPLETED)
+                closed.cancel()
+                if stream.rotated:
+                    self.rotations += 1
+
+                if not task.done():
+                    # The request side has closed; let the stream deliver its
+                    # last results while the next one starts
+                    self._draining.add(task)
+                    task.add_done_callback(self._stream_finished)
+                    failures = 0
+                    continue
+
+                error = task.exception()
+                if error is None:
+                    failures = 0
+                    continue
+                failures += 1
+                logger.error(f"Error in speech API communication for client {self.client_id}: {error}",
+                             exc_info=error)
+                if failures > 1:
+                    # Reconnect at once the first time, then back off
+                    await asyncio.sleep(min(0.5 * 2 ** (failures - 2), 5.0))
+        except asyncio.CancelledError:
+            raise
+        finally:
+            logger.info("Audio processing loop ended")
+
+    def _stream_finished(self, task: asyncio.Task):
+        self._draining.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Recognition stream ended with error: {task.exception()}")
+
+    def _requests_blocking(self, stream: RecognitionStream) -> Iterator[speech.StreamingRecognizeRequest]:
+        for chunk in stream.replay:
+            yield speech.StreamingRecognizeRequest(audio_content=chunk.to_bytes())
+        while self.is_running:
+            try:
+                # Check for timeout
+                if self._timed_out():
+                    logger.warning("Audio timeout detected, closing stream")
+                    self._history.clear()
+                    break
+                if time.time() >= self._stream_deadline(stream):
+                    stream.rotated = True
+                    logger.info(f"Rotating recognition stream {stream.index} before the duration limit")
+                    break
+
+                try:
+                    audio_type, chunk = self.queue.get_blocking(timeout=0.1)
+                    self.last_audio_timestamp = time.time()
+                    logger.debug(f"Processing audio chunk of type: {audio_type}")
+                except queue.Empty:
+                    continue
+
+                # Create the streaming request
+                self._remember(chunk)
+                yield speech.StreamingRecognizeRequest(audio_content=chunk.to_bytes())
+
+            except Exception as e:
+                logger.error(f"Error in request generator: {e}", exc_info=True)
+                if not self.is_running:
+                    break
+                time.sleep(0.1)  # Prevent tight loop on error
+
+    def _run_blocking(self):
+        """Recognition loop on a dedicated thread (fallback path)
+
+        The blocking client cannot overlap streams, so rotation here reconnects
+        immediately and relies on the replayed tail to cover the handover.
+        """
+        logger.info("Starting threaded audio processing loop")
+        speech_client = speech.SpeechClient()
+        failures = 0
+        try:
+            while self.is_running:
+                try:
+                    stream = self._open_stream()
+                    responses = speech_client.streaming_recognize(
+                        self.streaming_config,
+                        self._requests_blocking(stream)
+                    )
+                    for response in responses:
+                        if not self.is_running:
+                            break
+                        for result in response.results:
+                            if not self._accept(stream, result):
+                                continue
+                            # Fire and forget: results are scheduled in order and
+                            # the loop never waits on the client or the database
+                            future = asyncio.run_coroutine_threadsafe(self.on_result(result), self.loop)
+                            future.add_done_callback(_log_callback_error)
+                    failures = 0
+                    if stream.rotated:
+                        self.rotations += 1
+
+                    if self._timed_out():
+                        # Idle: wait here for audio instead of reopening streams
+                        while self.is_running and self.queue.empty():
+                            time.sleep(0.1)
+                        self.last_audio_timestamp = time.time()
+
+                except Exception as e:
+                    logger.error(f"Error in speech API communication for client {self.client_id}: {e}", exc_info=True)
+                    failures += 1
+                    if self.is_running:
+                        if failures > 1:
+                            time.sleep(min(0.5 * 2 ** (failures - 2), 5.0))  # Back off on repeated failures
+                        continue
+                    break
+        except Exception as e:
+            logger.error(f"Fatal error in audio processing: {e}", exc_info=True)
+        finally:
+            logger.info("Audio processing loop ended")
+
+    def get_status(self) -> dict:
+        return {
+            "mode": self.mode,
+            "streams_opened": self._streams_opened,
+            "rotations": self.rotations,
+            "duplicates_dropped": self.duplicates_dropped,
+            "audio_seconds": round(self.sent_seconds, 2),
+            "queue": self.queue.get_status(),
+        }
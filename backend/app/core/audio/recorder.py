@@ -0,0 +1,86 @@
+import asyncio
+import logging
+import os
+import time
+import wave
+from typing import Optional
+import numpy as np
+from .chunk import INT16_SCALE
+
+logger = logging.getLogger(__name__)
+
+# Unset disables recording; otherwise each session writes its mixed audio here
+AUDIO_RECORDING_DIR = os.getenv("AUDIO_RECORDING_DIR")
+
+class MixRecorder:
+    """
+    Records a session's mixed audio to a 16-bit WAV file
+    Every `interval_ms` the stream manager's sample-clock mixer releases the
+    audio that elapsed since the previous tick, with late sources padded with
+    silence, so the recording stays aligned with wall-clock time however
+    bursty the input was. stop() writes out the jitter window still buffered.
+    """
+
+    def __init__(self, stream_manager, path: str, interval_ms: int = 100):
+        self.stream_manager = stream_manager
+        self.path = path
+        self.interval = interval_ms / 1000.0
+        self.samples_written = 0
+        self.errors = 0
+        self._wav: Optional[wave.Wave_write] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        buffer = self.stream_manager.audio_buffer
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._wav = wave.open(self.path, "wb")
+        self._wav.setnchannels(buffer.channels)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(buffer.sample_rate)
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Recording mixed audio to {self.path}")
+
+    async def stop(self):
+        """Stop ticking, write the rest of the mix and close the file"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._wav is None:
+            return
+        buffer = self.stream_manager.audio_buffer
+        # No more audio is coming, so the jitter window can be released too
+        await self.write_pending(time.monotonic() + buffer.jitter_samples / buffer.sample_rate)
+        self._wav.close()
+        self._wav = None
+        logger.info(f"Recorded {self.samples_written / buffer.sample_rate:.1f} s of mixed audio to {self.path}")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.write_pending()
+
+    async def write_pending(self, now: Optional[float] = None) -> int:
+        """Append the mix up to the clock (minus the jitter window); returns the samples written"""
+        try:
+            mixed = await self.stream_manager.get_combined_audio(now)
+            if mixed is None or self._wav is None:
+                return 0
+            pcm = np.clip(mixed * INT16_SCALE, -INT16_SCALE, INT16_SCALE - 1).astype("<i2")
+            self._wav.writeframes(pcm.tobytes())
+            self.samples_written += pcm.shape[0]
+            return pcm.shape[0]
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Error recording mixed audio to {self.path}: {e}")
+            return 0
+
+    def get_status(self) -> dict:
+        return {
+            "path": self.path,
+            "seconds": self.samples_written / self.stream_manager.audio_buffer.sample_rate,
+            "errors": self.errors,
+        }
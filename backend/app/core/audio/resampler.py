@@ -0,0 +1,70 @@
+import numpy as np
+import logging
+from math import gcd
+from scipy.signal import firwin
+from .chunk import AudioChunk, INT16_SCALE
+
+logger = logging.getLogger(__name__)
+
+class StreamingResampler:
+    """Rational-ratio polyphase resampler that keeps its filter state between chunks.
+
+    The anti-aliasing FIR is split into `up` phases so each output sample is a
+    single dot product over the last `taps_per_phase` input samples. The tail
+    of every chunk is carried into the next one, so chunk boundaries produce
+    exactly the same output as resampling the whole stream at once.
+    """
+
+    def __init__(self, in_rate: int, out_rate: int, half_width: int = 10, beta: float = 5.0):
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        g = gcd(in_rate, out_rate)
+        self.up = out_rate // g
+        self.down = in_rate // g
+        self.passthrough = self.up == self.down
+
+        max_rate = max(self.up, self.down)
+        num_taps = 2 * half_width * max_rate + 1
+        taps = firwin(num_taps, 1.0 / max_rate, window=("kaiser", beta)) * self.up
+        self.taps_per_phase = -(-num_taps // self.up)
+        taps = np.pad(taps, (0, self.taps_per_phase * self.up - num_taps))
+        # phases[p, i] == taps[p + i * up]
+        self._phases = taps.reshape(self.taps_per_phase, self.up).T.astype(np.float32)
+        self._tap_offsets = np.arange(self.taps_per_phase)
+
+        self._history = np.zeros(self.taps_per_phase - 1, dtype=np.float32)
+        self._consumed = 0  # Input samples seen so far
+        self._produced = 0  # Output samples emitted so far
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """Resample a block of float32 samples, returning every output now computable"""
+        if self.passthrough:
+            return samples
+
+        block = np.concatenate((self._history, samples))
+        base = self._consumed - self._history.shape[0]  # Input index of block[0]
+        self._consumed += samples.shape[0]
+
+        end = -(-self._consumed * self.up // self.down)
+        positions = np.arange(self._produced, end, dtype=np.int64) * self.down
+        self._produced = end
+
+        newest = positions // self.up - base
+        window = block[newest[:, None] - self._tap_offsets]
+        out = np.einsum("nt,nt->n", self._phases[positions % self.up], window)
+
+        self._history = block[block.shape[0] - self._history.shape[0]:]
+        return out.astype(np.float32, copy=False)
+
+    def process_chunk(self, chunk: AudioChunk) -> AudioChunk:
+        """Resample an int16 chunk to the output rate"""
+        if self.passthrough:
+            return chunk
+        resampled = self.process(chunk.as_float())
+        pcm = np.clip(np.rint(resampled * INT16_SCALE), -INT16_SCALE, INT16_SCALE - 1).astype(np.int16)
+        return AudioChunk(pcm, self.out_rate, chunk.audio_type, received_at=chunk.received_at)
+
+    def reset(self):
+        self._history[:] = 0
+        self._consumed = 0
+        self._produced = 0
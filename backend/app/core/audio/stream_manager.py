@@ -1,47 +1,123 @@
-from typing import Dict, Optional
+from typing import Callable, Deque, Dict, Iterable, Optional
+from collections import deque
 import numpy as np
 import asyncio
 import logging
 from datetime import datetime
 from .buffer import AudioBuffer
-from .quality import AudioQualityController
+from .quality import AudioQualityController, compute_batch_metrics
+from .chunk import AudioChunk
 
 logger = logging.getLogger(__name__)
 
+def publish_batch_metrics(managers: Iterable["StreamManager"]) -> int:
+    """
+    Compute quality metrics for the pending audio of every stream of every
+    manager in a single batched pass and publish them as stream metrics
+    Returns: number of streams updated
+    """
+    managers = list(managers)
+    batch = {}
+    for index, manager in enumerate(managers):
+        for stream_id, chunks in manager.pending_chunks.items():
+            if chunks:
+                batch[(index, stream_id)] = np.concatenate([chunk.samples for chunk in chunks])
+                chunks.clear()
+                manager.pending_samples[stream_id] = 0
+    if not batch:
+        return 0
+
+    for (index, stream_id), metrics in compute_batch_metrics(batch).items():
+        stream_metrics = managers[index].stream_metrics.setdefault(stream_id, {})
+        stream_metrics.update(metrics)
+        stream_metrics['max_amplitude'] = metrics['peak_level']
+    return len(batch)
+
+class BatchMetricsPublisher:
+    """
+    One periodic task per worker that publishes the metrics of every live
+    session with a single publish_batch_metrics pass per tick. Sessions only
+    queue audio as it arrives, so the cost per tick stays one vectorized
+    pass however many sessions are connected.
+    """
+
+    def __init__(self, get_managers: Callable[[], Iterable["StreamManager"]], interval_ms: int = 1000):
+        self.get_managers = get_managers
+        self.interval = interval_ms / 1000.0
+        self.ticks = 0
+        self.streams_published = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Batch metrics publisher started (every {self.interval * 1000:.0f} ms)")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            self.publish()
+
+    def publish(self) -> int:
+        """Run one batched pass over the live managers; returns the streams updated"""
+        try:
+            published = publish_batch_metrics(self.get_managers())
+        except Exception as e:
+            logger.error(f"Error publishing batch metrics: {e}", exc_info=True)
+            return 0
+        self.ticks += 1
+        self.streams_published += published
+        return published
+
 class StreamManager:
-    def __init__(self):
+    def __init__(self, metrics_window_seconds: float = 1.0, buffer_audio: bool = False):
         self.audio_buffer = AudioBuffer()
+        # Only buffer for the mixer when something reads the mix (the session
+        # recorder); unread rings would just overrun for the whole session
+        self.buffer_audio = buffer_audio
         self.quality_controller = AudioQualityController()
         self.active_streams: Dict[str, dict] = {}
         self.stream_metrics: Dict[str, dict] = {}
         self.last_processed: Dict[str, datetime] = {}
+        # Recent audio per stream awaiting the next batched metrics pass
+        self.pending_chunks: Dict[str, Deque[AudioChunk]] = {}
+        self.pending_samples: Dict[str, int] = {}
+        self.metrics_window = int(metrics_window_seconds * self.audio_buffer.sample_rate)
 
-    async def process_audio_chunk(self, client_id: str, audio_data: bytes, audio_type: str = "microphone") -> Optional[dict]:
+    async def process_audio_chunk(self, client_id: str, chunk: AudioChunk) -> Optional[dict]:
         """Process a new chunk of audio data"""
         try:
+            audio_type = chunk.audio_type
             logger.debug(f"Processing {audio_type} audio chunk for client {client_id}")
             
-            # Convert bytes to numpy array
-            audio_array = np.frombuffer(audio_data, dtype=np.int16)
-            
-            # Ensure array is properly shaped for buffer (2D array with shape [samples, 1])
-            if audio_array.ndim == 1:
-                audio_array = audio_array.reshape(-1, 1)
-            
             # Create final stream ID
             final_stream_id = f"{client_id}_{audio_type}"
             
-            logger.debug(f"Shaped audio array: {audio_array.shape} for stream {final_stream_id}")
+            logger.debug(f"Buffering {len(chunk)} samples for stream {final_stream_id}")
             
-            # Add to buffer
-            self.audio_buffer.add_audio(final_stream_id, audio_array)
+            # Add to buffer; the int16 samples are copied straight into the ring storage
+            if self.buffer_audio:
+                self.audio_buffer.add_audio(final_stream_id, chunk.samples)
             
-            # Update metrics
-            self.stream_metrics[final_stream_id] = {
-                'last_updated': datetime.now(),
-                'chunk_size': len(audio_array),
-                'max_amplitude': float(np.max(np.abs(audio_array)))
-            }
+            # Queue the chunk for the next batched metrics pass, keeping only
+            # the most recent metrics window
+            pending = self.pending_chunks.setdefault(final_stream_id, deque())
+            pending.append(chunk)
+            self.pending_samples[final_stream_id] = self.pending_samples.get(final_stream_id, 0) + len(chunk)
+            while len(pending) > 1 and self.pending_samples[final_stream_id] - len(pending[0]) >= self.metrics_window:
+                self.pending_samples[final_stream_id] -= len(pending.popleft())
+            
+            metrics = self.stream_metrics.setdefault(final_stream_id, {})
+            metrics['last_updated'] = datetime.now()
+            metrics['chunk_size'] = len(chunk)
             
             return {
                 'stream_id': final_stream_id,
@@ -70,7 +146,8 @@ class StreamManager:
             }
 
             # Add the stream to the audio buffer
-            self.audio_buffer.add_stream(final_stream_id)
+            if self.buffer_audio:
+                self.audio_buffer.add_stream(final_stream_id)
             logger.info(f"Added new {stream_type} stream: {final_stream_id}")
             return True
         except Exception as e:
@@ -106,10 +183,10 @@ class StreamManager:
     #        logger.error(f"Error processing audio chunk: {e}")
     #        return None
     
-    async def get_combined_audio(self) -> Optional[np.ndarray]:
-        """Get combined audio from all active streams"""
+    async def get_combined_audio(self, now: Optional[float] = None) -> Optional[np.ndarray]:
+        """Get combined audio from all active streams up to the mixer clock"""
         try:
-            return self.audio_buffer.get_combined_audio()
+            return self.audio_buffer.get_combined_audio(now)
         except Exception as e:
             logger.error(f"Error getting combined audio: {e}")
             return None
@@ -121,18 +198,28 @@ class StreamManager:
             if final_stream_id in self.active_streams:
                 self.active_streams[final_stream_id]['is_active'] = False
                 self.audio_buffer.remove_stream(final_stream_id)
+                self.quality_controller.remove_stream(final_stream_id)
                 if final_stream_id in self.stream_metrics:
                     del self.stream_metrics[final_stream_id]
+                self.pending_chunks.pop(final_stream_id, None)
+                self.pending_samples.pop(final_stream_id, None)
                 logger.info(f"Removed stream: {final_stream_id}")
         except Exception as e:
             logger.error(f"Error removing stream {stream_id} ({stream_type}): {e}")
 
+    def refresh_metrics(self) -> int:
+        """Publish metrics for all of this manager's streams in one batch"""
+        return publish_batch_metrics([self])
+
     def get_stream_status(self, stream_id: str, stream_type: str) -> Optional[dict]:
         """Get current status of a stream"""
         final_stream_id = f"{stream_id}_{stream_type}"
         if final_stream_id not in self.active_streams:
             return None
 
+        if self.pending_chunks.get(final_stream_id):
+            self.refresh_metrics()
+
         return {
             **self.active_streams[final_stream_id],
             'metrics': self.stream_metrics.get(final_stream_id, {}),
@@ -141,6 +228,7 @@ class StreamManager:
 
     def get_all_stream_statuses(self) -> Dict[str, dict]:
         """Get status of all streams"""
+        self.refresh_metrics()
         return {
             stream_id: self.get_stream_status(*stream_id.split('_'))
             for stream_id in self.active_streams.keys()
@@ -1,40 +1,204 @@
-from sqlalchemy.orm import Session
+import base64
+import threading
+from collections import OrderedDict
+from sqlalchemy import and_, event, func, insert, or_, select
+from sqlalchemy.orm import Session, noload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from . import models, schemas
-from datetime import datetime
-from typing import List, Optional
+from . import insights_cache  # Every process that writes must register its invalidation events
+from .search import LIKE_ESCAPE, contains_pattern
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
 
-def create_meeting(db: Session, meeting: schemas.MeetingCreate):
+# A meeting is addressed by its public UUID or by an already resolved primary key
+MeetingRef = Union[str, int]
+
+MEETING_PAGE_MAX = 100
+MEETING_INCLUDES = ("transcripts", "action_items")
+FIRST_LINE_CHARS = 200
+EXPORT_BATCH_SIZE = 500
+
+# Loader options per use case; Meeting children are lazy="raise" otherwise
+WRITE_LOADS = (noload("*"),)
+DETAIL_LOADS = (
+    selectinload(models.Meeting.transcripts),
+    selectinload(models.Meeting.action_items),
+)
+INSIGHT_LOADS = (
+    selectinload(models.Meeting.summaries),
+    selectinload(models.Meeting.topics),
+    selectinload(models.Meeting.follow_up_questions),
+)
+
+class MeetingPkCache:
+    """
+    Process-wide LRU of public meeting UUID -> integer primary key.
+    The mapping never changes while a meeting exists, so entries only
+    leave on eviction or once a transaction deleting the meeting commits.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # Bumped by every invalidation, so a lookup that raced a delete is not stored
+        self.generation = 0
+
+    def get(self, meeting_id: str) -> Optional[int]:
+        with self._lock:
+            meeting_pk = self._entries.get(meeting_id)
+            if meeting_pk is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(meeting_id)
+            self.hits += 1
+            return meeting_pk
+
+    def put(self, meeting_id: str, meeting_pk: int, generation: Optional[int] = None):
+        """Store a key read at `generation` (if given) unless a delete committed since"""
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[meeting_id] = meeting_pk
+            self._entries.move_to_end(meeting_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, meeting_id: str):
+        with self._lock:
+            self._entries.pop(meeting_id, None)
+            self.generation += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def get_status(self) -> dict:
+        return {"size": len(self._entries), "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
+
+meeting_pk_cache = MeetingPkCache()
+
+# Deleted meetings are collected per session and forgotten after commit; a
+# concurrent lookup between flush and commit still sees the row and may
+# cache it again. None in the set stands for "unknown meetings".
+DELETED_MEETINGS_KEY = "deleted_meetings"
+
+@event.listens_for(Session, "after_flush")
+def _collect_deleted_meetings(session, flush_context):
+    for instance in session.deleted:
+        if isinstance(instance, models.Meeting):
+            session.info.setdefault(DELETED_MEETINGS_KEY, set()).add(instance.meeting_id)
+            # Not resolvable in this transaction any more either
+            meeting_pk_cache.invalidate(instance.meeting_id)
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_meeting_statements(orm_execute_state):
+    """Bulk DELETE (or UPDATE of the UUID) bypasses the flush"""
+    if orm_execute_state.is_delete or orm_execute_state.is_update:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None and table.name == models.Meeting.__tablename__:
+            orm_execute_state.session.info.setdefault(DELETED_MEETINGS_KEY, set()).add(None)
+
+@event.listens_for(Session, "after_commit")
+def _forget_deleted_meetings(session):
+    deleted = session.info.pop(DELETED_MEETINGS_KEY, None)
+    if not deleted:
+        return
+    if None in deleted:
+        meeting_pk_cache.clear()
+        return
+    for meeting_id in deleted:
+        meeting_pk_cache.invalidate(meeting_id)
+
+@event.listens_for(Session, "after_rollback")
+def _keep_meetings_after_rollback(session):
+    session.info.pop(DELETED_MEETINGS_KEY, None)
+
+async def resolve_meeting_pk(db: AsyncSession, meeting: MeetingRef) -> Optional[int]:
+    """Primary key for a meeting UUID (cached), or the key itself if already resolved"""
+    if isinstance(meeting, int):
+        return meeting
+    meeting_pk = meeting_pk_cache.get(meeting)
+    if meeting_pk is None:
+        generation = meeting_pk_cache.generation
+        result = await db.execute(select(models.Meeting.id).where(models.Meeting.meeting_id == meeting))
+        meeting_pk = result.scalar()
+        if meeting_pk is not None:
+            meeting_pk_cache.put(meeting, meeting_pk, generation)
+    return meeting_pk
+
+async def resolve_meeting_pks(db: AsyncSession, meeting_ids: Iterable[str]) -> Dict[str, int]:
+    """Batch form of resolve_meeting_pk: one query for all uncached UUIDs; unknown ones are left out"""
+    resolved, missing = {}, []
+    for meeting_id in set(meeting_ids):
+        meeting_pk = meeting_pk_cache.get(meeting_id)
+        if meeting_pk is None:
+            missing.append(meeting_id)
+        else:
+            resolved[meeting_id] = meeting_pk
+    if missing:
+        generation = meeting_pk_cache.generation
+        result = await db.execute(
+            select(models.Meeting.meeting_id, models.Meeting.id).where(models.Meeting.meeting_id.in_(missing))
+        )
+        for meeting_id, meeting_pk in result.all():
+            meeting_pk_cache.put(meeting_id, meeting_pk, generation)
+            resolved[meeting_id] = meeting_pk
+    return resolved
+
+async def create_meeting(db: AsyncSession, meeting: schemas.MeetingCreate):
     db_meeting = models.Meeting(**meeting.dict())
     db.add(db_meeting)
-    db.commit()
-    db.refresh(db_meeting)
+    await db.commit()
+    await db.refresh(db_meeting)
+    meeting_pk_cache.put(db_meeting.meeting_id, db_meeting.id)
     return db_meeting
 
-def get_meeting(db: Session, meeting_id: str):
-    return db.query(models.Meeting).filter(models.Meeting.meeting_id == meeting_id).first()
+async def get_meeting(db: AsyncSession, meeting_id: str, *options):
+    generation = meeting_pk_cache.generation
+    result = await db.execute(
+        select(models.Meeting)
+        .where(models.Meeting.meeting_id == meeting_id)
+        .options(*options)
+    )
+    meeting = result.scalars().first()
+    if meeting is not None:
+        meeting_pk_cache.put(meeting.meeting_id, meeting.id, generation)
+    return meeting
+
+async def get_meeting_details(db: AsyncSession, meeting_id: str) -> Optional[models.Meeting]:
+    """Meeting with its transcripts and action items loaded"""
+    return await get_meeting(db, meeting_id, *DETAIL_LOADS)
+
+async def get_meeting_insights(db: AsyncSession, meeting_id: str) -> Optional[models.Meeting]:
+    """Meeting with its summaries, topics and follow-up questions loaded"""
+    return await get_meeting(db, meeting_id, *INSIGHT_LOADS)
 
-def add_action_item(db: Session, meeting_id: str, action_item: schemas.ActionItemCreate):
-    meeting = get_meeting(db, meeting_id)
-    if meeting:
-        db_action_item = models.ActionItem(**action_item.dict(), meeting_id=meeting.id)
+async def add_action_item(db: AsyncSession, meeting_id: MeetingRef, action_item: schemas.ActionItemCreate):
+    meeting_pk = await resolve_meeting_pk(db, meeting_id)
+    if meeting_pk is not None:
+        db_action_item = models.ActionItem(**action_item.dict(), meeting_id=meeting_pk)
         db.add(db_action_item)
-        db.commit()
-        db.refresh(db_action_item)
+        await db.commit()
+        await db.refresh(db_action_item)
         return db_action_item
     return None
 
-def add_transcript_segment(
-    db: Session, 
-    meeting_id: str, 
+async def add_transcript_segment(
+    db: AsyncSession, 
+    meeting_id: MeetingRef, 
     text: str, 
     speaker: Optional[str] = None,
     confidence: Optional[float] = None,
     audio_type: str = "microphone"
 ):
-    meeting = get_meeting(db, meeting_id)
-    if meeting:
+    meeting_pk = await resolve_meeting_pk(db, meeting_id)
+    if meeting_pk is not None:
         segment = models.TranscriptSegment(
-            meeting_id=meeting.id,
+            meeting_id=meeting_pk,
             text=text,
             speaker=speaker,
             confidence=confidence,
@@ -42,107 +206,336 @@ def add_transcript_segment(
             timestamp=datetime.utcnow()
         )
         db.add(segment)
-        db.commit()
-        db.refresh(segment)
+        await db.commit()
+        await db.refresh(segment)
         return segment
     return None
 
-def add_summary(
-    db: Session, 
-    meeting_id: str, 
-    summary: schemas.SummaryCreate
+async def add_summary(
+    db: AsyncSession, 
+    meeting_id: MeetingRef, 
+    summary: schemas.SummaryCreate,
+    commit: bool = True
 ):
-    meeting = get_meeting(db, meeting_id)
-    if meeting:
-        db_summary = models.Summary(**summary.dict(), meeting_id=meeting.id)
+    meeting_pk = await resolve_meeting_pk(db, meeting_id)
+    if meeting_pk is not None:
+        db_summary = models.Summary(**summary.dict(), meeting_id=meeting_pk)
         db.add(db_summary)
-        db.commit()
-        db.refresh(db_summary)
+        if not commit:
+            # Part of a larger transaction; the caller commits
+            await db.flush()
+            return db_summary
+        await db.commit()
+        await db.refresh(db_summary)
         return db_summary
     return None
 
-def add_follow_up_question(
-    db: Session,
-    meeting_id: str,
+async def add_follow_up_question(
+    db: AsyncSession,
+    meeting_id: MeetingRef,
     question: schemas.FollowUpQuestionCreate
 ):
-    meeting = get_meeting(db, meeting_id)
-    if meeting:
-        db_question = models.FollowUpQuestion(**question.dict(), meeting_id=meeting.id)
+    meeting_pk = await resolve_meeting_pk(db, meeting_id)
+    if meeting_pk is not None:
+        db_question = models.FollowUpQuestion(**question.dict(), meeting_id=meeting_pk)
         db.add(db_question)
-        db.commit()
-        db.refresh(db_question)
+        await db.commit()
+        await db.refresh(db_question)
         return db_question
     return None
 
-def add_topic(
-    db: Session,
-    meeting_id: str,
+async def add_topic(
+    db: AsyncSession,
+    meeting_id: MeetingRef,
     topic: schemas.TopicCreate
 ):
-    meeting = get_meeting(db, meeting_id)
-    if meeting:
-        db_topic = models.Topic(**topic.dict(), meeting_id=meeting.id)
+    meeting_pk = await resolve_meeting_pk(db, meeting_id)
+    if meeting_pk is not None:
+        db_topic = models.Topic(**topic.dict(), meeting_id=meeting_pk)
         db.add(db_topic)
-        db.commit()
-        db.refresh(db_topic)
+        await db.commit()
+        await db.refresh(db_topic)
         return db_topic
     return None
 
-def get_meeting_topics(db: Session, meeting_id: str) -> List[models.Topic]:
-    meeting = get_meeting(db, meeting_id)
-    if meeting:
-        return db.query(models.Topic)\
-            .filter(models.Topic.meeting_id == meeting.id)\
-            .order_by(models.Topic.created_at.desc())\
-            .all()
+async def _bulk_add(db: AsyncSession, model, meeting_id: MeetingRef, items: list, commit: bool) -> Optional[List[int]]:
+    """
+    Insert items for one meeting as a single multi-row INSERT ... RETURNING.
+    Returns the new ids in input order, or None if the meeting does not exist.
+    """
+    meeting_pk = await resolve_meeting_pk(db, meeting_id)
+    if meeting_pk is None:
+        return None
+    if not items:
+        return []
+    result = await db.scalars(
+        insert(model).returning(model.id),
+        [{**item.dict(), "meeting_id": meeting_pk} for item in items]
+    )
+    # RETURNING order is unspecified, but one statement allocates ids in row
+    # order. sort_by_parameter_order would make SQLite insert row by row.
+    ids = sorted(result)
+    if commit:
+        await db.commit()
+    return ids
+
+async def add_follow_up_questions(
+    db: AsyncSession,
+    meeting_id: MeetingRef,
+    questions: List[schemas.FollowUpQuestionCreate],
+    commit: bool = True
+) -> Optional[List[int]]:
+    return await _bulk_add(db, models.FollowUpQuestion, meeting_id, questions, commit)
+
+async def add_action_items(
+    db: AsyncSession,
+    meeting_id: MeetingRef,
+    action_items: List[schemas.ActionItemCreate],
+    commit: bool = True
+) -> Optional[List[int]]:
+    return await _bulk_add(db, models.ActionItem, meeting_id, action_items, commit)
+
+async def add_topics(
+    db: AsyncSession,
+    meeting_id: MeetingRef,
+    topics: List[schemas.TopicCreate],
+    commit: bool = True
+) -> Optional[List[int]]:
+    return await _bulk_add(db, models.Topic, meeting_id, topics, commit)
+
+async def get_meeting_topics(db: AsyncSession, meeting_id: MeetingRef) -> List[models.Topic]:
+    meeting_pk = await resolve_meeting_pk(db, meeting_id)
+    if meeting_pk is not None:
+        result = await db.execute(
+            select(models.Topic)
+            .where(models.Topic.meeting_id == meeting_pk)
+            .order_by(models.Topic.created_at.desc())
+        )
+        return result.scalars().all()
     return []
 
-def update_follow_up_question_status(
-    db: Session,
+async def update_follow_up_question_status(
+    db: AsyncSession,
     question_id: int,
     answered: bool
 ):
-    question = db.query(models.FollowUpQuestion).filter(models.FollowUpQuestion.id == question_id).first()
+    question = await db.get(models.FollowUpQuestion, question_id)
     if question:
         question.answered = answered
-        db.commit()
-        db.refresh(question)
+        await db.commit()
+        await db.refresh(question)
         return question
     return None
 
-def get_unanswered_questions(db: Session, meeting_id: str) -> List[models.FollowUpQuestion]:
-    meeting = get_meeting(db, meeting_id)
-    if meeting:
-        return db.query(models.FollowUpQuestion)\
-            .filter(
-                models.FollowUpQuestion.meeting_id == meeting.id,
+async def get_unanswered_questions(db: AsyncSession, meeting_id: MeetingRef) -> List[models.FollowUpQuestion]:
+    meeting_pk = await resolve_meeting_pk(db, meeting_id)
+    if meeting_pk is not None:
+        result = await db.execute(
+            select(models.FollowUpQuestion)
+            .where(
+                models.FollowUpQuestion.meeting_id == meeting_pk,
                 models.FollowUpQuestion.answered == False
-            )\
-            .order_by(models.FollowUpQuestion.created_at.desc())\
-            .all()
+            )
+            .order_by(models.FollowUpQuestion.created_at.desc())
+        )
+        return result.scalars().all()
     return []
 
-def get_progressive_summaries(db: Session, meeting_id: str) -> List[models.Summary]:
-    meeting = get_meeting(db, meeting_id)
-    if meeting:
-        return db.query(models.Summary)\
-            .filter(
-                models.Summary.meeting_id == meeting.id,
+async def get_progressive_summaries(db: AsyncSession, meeting_id: MeetingRef) -> List[models.Summary]:
+    meeting_pk = await resolve_meeting_pk(db, meeting_id)
+    if meeting_pk is not None:
+        result = await db.execute(
+            select(models.Summary)
+            .where(
+                models.Summary.meeting_id == meeting_pk,
                 models.Summary.summary_type == 'progressive'
-            )\
-            .order_by(models.Summary.created_at.desc())\
-            .all()
+            )
+            .order_by(models.Summary.created_at.desc())
+        )
+        return result.scalars().all()
     return []
 
-def get_final_summary(db: Session, meeting_id: str) -> Optional[models.Summary]:
-    meeting = get_meeting(db, meeting_id)
-    if meeting:
-        return db.query(models.Summary)\
-            .filter(
-                models.Summary.meeting_id == meeting.id,
+async def get_final_summary(db: AsyncSession, meeting_id: MeetingRef) -> Optional[models.Summary]:
+    meeting_pk = await resolve_meeting_pk(db, meeting_id)
+    if meeting_pk is not None:
+        result = await db.execute(
+            select(models.Summary)
+            .where(
+                models.Summary.meeting_id == meeting_pk,
                 models.Summary.summary_type == 'final'
-            )\
-            .order_by(models.Summary.created_at.desc())\
-            .first()
-    return None
\ No newline at end of file
+            )
+            .order_by(models.Summary.created_at.desc())
+            .limit(1)
+        )
+        return result.scalars().first()
+    return None
+
+def encode_meeting_cursor(start_time: datetime, meeting_pk: int) -> str:
+    """Opaque keyset cursor for the (start_time, id) position of a listed meeting"""
+    return base64.urlsafe_b64encode(f"{start_time.isoformat()}|{meeting_pk}".encode()).decode()
+
+def decode_meeting_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of encode_meeting_cursor; raises ValueError for a malformed cursor"""
+    try:
+        start_time, meeting_pk = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit("|", 1)
+        return datetime.fromisoformat(start_time), int(meeting_pk)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+def _duration_seconds(start_time: Optional[datetime], end_time: Optional[datetime]) -> Optional[float]:
+    if start_time is None:
+        return None
+    if end_time is None:
+        end_time = datetime.now(timezone.utc) if start_time.tzinfo else datetime.utcnow()
+    return max((end_time - start_time).total_seconds(), 0.0)
+
+async def list_meetings(
+    db: AsyncSession,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    title: Optional[str] = None,
+    started_after: Optional[datetime] = None,
+    started_before: Optional[datetime] = None,
+    include: Iterable[str] = ()
+) -> Tuple[List[Dict], Optional[str]]:
+    """
+    One page of meetings, newest first, as plain dicts.
+
+    Rows are a column projection (counts, duration and the first transcript
+    line come from correlated subqueries), so no ORM children are loaded.
+    Pagination is keyset on (start_time, id): pass the returned cursor back
+    to get the next page. `include` names child collections to attach,
+    fetched with one IN query per collection for the whole page.
+    """
+    Meeting, Segment, Action = models.Meeting, models.TranscriptSegment, models.ActionItem
+    limit = max(1, min(limit, MEETING_PAGE_MAX))
+    include = set(include)
+    unknown = include.difference(MEETING_INCLUDES)
+    if unknown:
+        raise ValueError(f"Unknown include: {', '.join(sorted(unknown))}")
+
+    transcript_count = (
+        select(func.count(Segment.id))
+        .where(Segment.meeting_id == Meeting.id)
+        .scalar_subquery()
+    )
+    action_item_count = (
+        select(func.count(Action.id))
+        .where(Action.meeting_id == Meeting.id)
+        .scalar_subquery()
+    )
+    first_line = (
+        select(func.substr(Segment.text, 1, FIRST_LINE_CHARS))
+        .where(Segment.meeting_id == Meeting.id)
+        .order_by(Segment.timestamp.asc(), Segment.id.asc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    query = (
+        select(
+            Meeting.id,
+            Meeting.meeting_id,
+            Meeting.title,
+            Meeting.start_time,
+            Meeting.end_time,
+            Meeting.is_active,
+            transcript_count.label("transcript_count"),
+            action_item_count.label("action_item_count"),
+            first_line.label("first_line"),
+        )
+        .order_by(Meeting.start_time.desc(), Meeting.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        after_time, after_id = decode_meeting_cursor(cursor)
+        query = query.where(or_(
+            Meeting.start_time < after_time,
+            and_(Meeting.start_time == after_time, Meeting.id < after_id)
+        ))
+    if is_active is not None:
+        query = query.where(Meeting.is_active == is_active)
+    if title:
+        query = query.where(Meeting.title.ilike(contains_pattern(title), escape=LIKE_ESCAPE))
+    if started_after is not None:
+        query = query.where(Meeting.start_time >= started_after)
+    if started_before is not None:
+        query = query.where(Meeting.start_time < started_before)
+
+    rows = (await db.execute(query)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_meeting_cursor(rows[-1].start_time, rows[-1].id)
+
+    meetings = []
+    for row in rows:
+        meeting = dict(row._mapping)
+        meeting["duration_seconds"] = _duration_seconds(row.start_time, row.end_time)
+        meetings.append(meeting)
+
+    if include and meetings:
+        by_pk = {meeting["id"]: meeting for meeting in meetings}
+        if "transcripts" in include:
+            result = await db.execute(
+                select(Segment)
+                .where(Segment.meeting_id.in_(by_pk))
+                .order_by(Segment.timestamp.asc(), Segment.id.asc())
+            )
+            for meeting in meetings:
+                meeting["transcripts"] = []
+            for segment in result.scalars():
+                by_pk[segment.meeting_id]["transcripts"].append(segment)
+        if "action_items" in include:
+            result = await db.execute(
+                select(Action)
+                .where(Action.meeting_id.in_(by_pk))
+                .order_by(Action.created_at.desc(), Action.id.desc())
+            )
+            for meeting in meetings:
+                meeting["action_items"] = []
+            for item in result.scalars():
+                by_pk[item.meeting_id]["action_items"].append(item)
+
+    return meetings, next_cursor
+
+
+async def stream_transcripts(
+    db: AsyncSession,
+    meeting_pk: int,
+    since_id: Optional[int] = None,
+    since_timestamp: Optional[datetime] = None,
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> AsyncIterator[List[Dict]]:
+    """
+    Yield a meeting's transcript rows in id order, `batch_size` at a time.
+
+    Rows come from a server-side cursor as plain column mappings, so memory
+    is bounded by one batch however long the meeting is. `since_id` and
+    `since_timestamp` are exclusive lower bounds for incremental fetches.
+    """
+    Segment = models.TranscriptSegment
+    query = (
+        select(
+            Segment.id,
+            Segment.text,
+            Segment.timestamp,
+            Segment.speaker,
+            Segment.confidence,
+            Segment.audio_type,
+        )
+        .where(Segment.meeting_id == meeting_pk)
+        .order_by(Segment.id.asc())
+        .execution_options(yield_per=batch_size)
+    )
+    if since_id is not None:
+        query = query.where(Segment.id > since_id)
+    if since_timestamp is not None:
+        query = query.where(Segment.timestamp > since_timestamp)
+
+    result = await db.stream(query)
+    try:
+        async for partition in result.mappings().partitions():
+            yield [dict(row) for row in partition]
+    finally:
+        await result.close()
@@ -0,0 +1,328 @@
+import os
+import json
+import asyncio
+import hashlib
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from . import models
+
+try:
+    from redis import asyncio as redis
+except ImportError:  # Only the in-process backend is available without redis-py
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Unset keeps the cache in-process; a redis:// URL shares it between workers
+INSIGHTS_CACHE_URL = os.getenv("INSIGHTS_CACHE_URL")
+INSIGHTS_CACHE_TTL = 3600
+
+# Rows that make up the insights payload
+INSIGHT_MODELS = (models.Summary, models.Topic, models.FollowUpQuestion)
+INSIGHT_TABLES = {model.__tablename__ for model in INSIGHT_MODELS}
+
+class InsightsEntry:
+    """An assembled insights payload, serialized once, with its ETag"""
+
+    def __init__(self, body: bytes, etag: str):
+        self.body = body
+        self.etag = etag
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "InsightsEntry":
+        body = json.dumps(jsonable_encoder(payload), separators=(",", ":")).encode()
+        # Content-derived, so a rebuild of unchanged insights keeps its ETag
+        return cls(body, f'"{hashlib.sha1(body).hexdigest()}"')
+
+class InsightsCacheBackend(ABC):
+    """
+    Storage for InsightsEntry values keyed by meeting primary key.
+
+    Every delete or clear changes the version of the meetings it covers, and
+    set() only stores if the version is still the one read before the payload
+    was built. A rebuild that raced an invalidation, in this worker or any
+    other sharing the backend, therefore never overwrites it.
+    """
+
+    @abstractmethod
+    async def get(self, meeting_pk: int) -> Optional[InsightsEntry]:
+        """The current entry, or None if missing or invalidated"""
+
+    @abstractmethod
+    async def version(self, meeting_pk: int) -> str:
+        """Opaque token that changes whenever the meeting is invalidated"""
+
+    @abstractmethod
+    async def set(self, meeting_pk: int, entry: InsightsEntry, version: str) -> bool:
+        """Store entry if the version is unchanged; returns whether it was stored"""
+
+    @abstractmethod
+    async def delete(self, meeting_pk: int):
+        """Invalidate one meeting"""
+
+    @abstractmethod
+    async def clear(self):
+        """Invalidate every meeting"""
+
+class MemoryInsightsBackend(InsightsCacheBackend):
+    """Per-process LRU; one version counter covers every meeting"""
+
+    def __init__(self, max_size: int = 1000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[int, InsightsEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Shared by all meetings: an unrelated invalidation only costs a skipped store
+        self._version = 0
+
+    async def get(self, meeting_pk: int) -> Optional[InsightsEntry]:
+        with self._lock:
+            entry = self._entries.get(meeting_pk)
+            if entry is not None:
+                self._entries.move_to_end(meeting_pk)
+            return entry
+
+    async def version(self, meeting_pk: int) -> str:
+        return str(self._version)
+
+    async def set(self, meeting_pk: int, entry: InsightsEntry, version: str) -> bool:
+        with self._lock:
+            if version != str(self._version):
+                return False
+            self._entries[meeting_pk] = entry
+            self._entries.move_to_end(meeting_pk)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            return True
+
+    async def delete(self, meeting_pk: int):
+        with self._lock:
+            self._entries.pop(meeting_pk, None)
+            self._version += 1
+
+    async def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._version += 1
+
+class RedisInsightsBackend(InsightsCacheBackend):
+    """
+    Shared between workers. Each meeting has a version counter next to its
+    entry, INCRed on delete; clear() INCRs an epoch that is part of every
+    version. Entries are stored with the version they were built at, and
+    get() ignores one whose version has moved, so clear() never has to find
+    the entries it invalidates. set() WATCHes the epoch and the counter, so
+    it fails if either moved since version(). Entries still expire after ttl
+    seconds as a safety net.
+    """
+
+    def __init__(self, client, ttl: int = INSIGHTS_CACHE_TTL, prefix: str = "insights:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.epoch_key = f"{prefix}epoch"
+
+    def _entry_key(self, meeting_pk: int) -> str:
+        return f"{self.prefix}entry:{meeting_pk}"
+
+    def _version_key(self, meeting_pk: int) -> str:
+        return f"{self.prefix}version:{meeting_pk}"
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisInsightsBackend":
+        if redis is None:
+            raise RuntimeError("A shared insights cache requires redis-py (pip install redis)")
+        return cls(redis.from_url(url), **kwargs)
+
+    @staticmethod
+    def _format_version(epoch, version) -> str:
+        return f"{int(epoch or 0)}:{int(version or 0)}"
+
+    async def get(self, meeting_pk: int) -> Optional[InsightsEntry]:
+        # One round trip for the entry and the version it must still match
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.hmget(self._entry_key(meeting_pk), "etag", "body", "version")
+            pipe.mget(self.epoch_key, self._version_key(meeting_pk))
+            (etag, body, stored_version), current = await pipe.execute()
+        if etag is None or body is None or stored_version is None:
+            return None
+        if stored_version.decode() != self._format_version(*current):
+            return None
+        return InsightsEntry(body, etag.decode())
+
+    async def version(self, meeting_pk: int) -> str:
+        return self._format_version(*await self.client.mget(self.epoch_key, self._version_key(meeting_pk)))
+
+    async def set(self, meeting_pk: int, entry: InsightsEntry, version: str) -> bool:
+        version_key = self._version_key(meeting_pk)
+        async with self.client.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(self.epoch_key, version_key)
+                if self._format_version(*await pipe.mget(self.epoch_key, version_key)) != version:
+                    return False
+                pipe.multi()
+                pipe.hset(self._entry_key(meeting_pk),
+                          mapping={"etag": entry.etag, "body": entry.body, "version": version})
+                pipe.expire(self._entry_key(meeting_pk), self.ttl)
+                await pipe.execute()
+                return True
+            except redis.WatchError:
+                return False  # Invalidated between the check and the write
+
+    async def delete(self, meeting_pk: int):
+        version_key = self._version_key(meeting_pk)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.incr(version_key)
+            # Outlives any entry built before the bump
+            pipe.expire(version_key, self.ttl * 2)
+            pipe.delete(self._entry_key(meeting_pk))
+            await pipe.execute()
+
+    async def clear(self):
+        # Every stored version is now stale; the entries expire on their own
+        await self.client.incr(self.epoch_key)
+
+class InsightsCache:
+    """
+    Assembled insights payloads per meeting. Writes to summaries, topics or
+    follow-up questions invalidate their meeting once the transaction commits.
+    Backend errors are logged and treated as misses; the database is the truth.
+    """
+
+    def __init__(self, backend: Optional[InsightsCacheBackend] = None):
+        self.backend = backend or MemoryInsightsBackend()
+        self.hits = 0
+        self.misses = 0
+        # Commits are reported synchronously; the backend is updated before the next use
+        self._pending: Set[Optional[int]] = set()
+        self._lock = threading.Lock()
+        # The loop only keeps weak references to tasks
+        self._tasks: Set[asyncio.Task] = set()
+
+    def mark_stale(self, meeting_pks: Iterable[Optional[int]]):
+        """Queue invalidations; None stands for every meeting"""
+        with self._lock:
+            self._pending.update(meeting_pks)
+        try:
+            # Applied now rather than on this worker's next cache use, so
+            # workers sharing the backend stop serving the entry promptly
+            task = asyncio.get_running_loop().create_task(self.apply_invalidations())
+        except RuntimeError:
+            return  # No loop (sync session); applied on the next cache use
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def apply_invalidations(self):
+        with self._lock:
+            pending, self._pending = self._pending, set()
+        if not pending:
+            return
+        try:
+            if None in pending:
+                await self.backend.clear()
+            else:
+                for meeting_pk in pending:
+                    await self.backend.delete(meeting_pk)
+        except Exception as e:
+            logger.error(f"Error invalidating insights cache: {e}")
+
+    async def invalidate(self, meeting_pk: Optional[int] = None):
+        """Drop one meeting's entry, or every entry when meeting_pk is None"""
+        self.mark_stale([meeting_pk])
+        await self.apply_invalidations()
+
+    async def get(self, meeting_pk: int) -> Optional[InsightsEntry]:
+        await self.apply_invalidations()
+        try:
+            entry = await self.backend.get(meeting_pk)
+        except Exception as e:
+            logger.error(f"Error reading insights cache: {e}")
+            entry = None
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    async def version(self, meeting_pk: int) -> Optional[str]:
+        """Read before building a payload, and hand the result to put()"""
+        await self.apply_invalidations()
+        try:
+            return await self.backend.version(meeting_pk)
+        except Exception as e:
+            logger.error(f"Error reading insights cache version: {e}")
+            return None
+
+    async def put(self, meeting_pk: int, payload: dict, version: Optional[str]) -> InsightsEntry:
+        """Store a payload built after reading `version`; returns its entry either way"""
+        entry = InsightsEntry.from_payload(payload)
+        # Invalidations committed in this process while the payload was built
+        await self.apply_invalidations()
+        if version is None:
+            return entry
+        try:
+            await self.backend.set(meeting_pk, entry, version)
+        except Exception as e:
+            logger.error(f"Error writing insights cache: {e}")
+        return entry
+
+    def get_status(self) -> Dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+def _default_backend() -> InsightsCacheBackend:
+    if INSIGHTS_CACHE_URL:
+        return RedisInsightsBackend.from_url(INSIGHTS_CACHE_URL)
+    return MemoryInsightsBackend()
+
+insights_cache = InsightsCache(_default_backend())
+
+# Changed meetings are collected per session and invalidated after commit,
+# so a concurrent rebuild cannot cache rows that are later rolled back.
+# None in the set stands for "unknown meetings" and clears everything.
+CHANGED_KEY = "insights_changed"
+
+def _changed(session) -> set:
+    return session.info.setdefault(CHANGED_KEY, set())
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed(session, flush_context):
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, INSIGHT_MODELS):
+            _changed(session).add(instance.meeting_id)
+    for instance in session.deleted:
+        if isinstance(instance, models.Meeting):
+            _changed(session).add(instance.id)
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_statements(orm_execute_state):
+    """Bulk INSERT/UPDATE/DELETE statements bypass the flush"""
+    if orm_execute_state.is_select:
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if table is None or table.name not in INSIGHT_TABLES | {models.Meeting.__tablename__}:
+        return
+    params = orm_execute_state.parameters
+    rows = params if isinstance(params, list) else [params or {}]
+    if orm_execute_state.is_insert and table.name in INSIGHT_TABLES and all("meeting_id" in row for row in rows):
+        _changed(orm_execute_state.session).update(row["meeting_id"] for row in rows)
+    elif not orm_execute_state.is_insert:
+        _changed(orm_execute_state.session).add(None)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    changed = session.info.pop(CHANGED_KEY, None)
+    if changed:
+        insights_cache.mark_stale(changed)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session):
+    session.info.pop(CHANGED_KEY, None)
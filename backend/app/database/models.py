@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean, Float
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean, Float, DDL, Index, event, func, literal_column
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .config import Base
@@ -9,15 +9,20 @@ class Meeting(Base):
     id = Column(Integer, primary_key=True, index=True)
     meeting_id = Column(String, unique=True, index=True)
     title = Column(String, nullable=True)
-    start_time = Column(DateTime, default=datetime.utcnow, index=True)
+    # Never NULL: the listing's keyset cursor is (start_time, id)
+    start_time = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     end_time = Column(DateTime, nullable=True)
     is_active = Column(Boolean, default=True)
     
+    # Children never load implicitly (lazy="raise"): each query states what it
+    # needs with loader options (crud.DETAIL_LOADS, crud.INSIGHT_LOADS), and
+    # deletes leave the cascade to the ON DELETE CASCADE foreign keys
     transcripts = relationship(
         "TranscriptSegment",
         back_populates="meeting",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise",
         order_by="TranscriptSegment.timestamp.asc()"
     )
     
@@ -25,7 +30,8 @@ class Meeting(Base):
         "ActionItem",
         back_populates="meeting",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise",
         order_by="ActionItem.created_at.desc()"
     )
     
@@ -33,7 +39,8 @@ class Meeting(Base):
         "Summary",
         back_populates="meeting",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise",
         order_by="Summary.created_at.desc()"
     )
     
@@ -41,7 +48,8 @@ class Meeting(Base):
         "FollowUpQuestion",
         back_populates="meeting",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise",
         order_by="FollowUpQuestion.created_at.desc()"
     )
 
@@ -49,10 +57,16 @@ class Meeting(Base):
         "Topic",
         back_populates="meeting",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise",
         order_by="Topic.created_at.desc()"
     )
 
+    # Keyset order of the meeting listing
+    __table_args__ = (
+        Index("ix_meetings_start_time_id", "start_time", "id"),
+    )
+
     def __repr__(self):
         return f"<Meeting(id={self.id}, meeting_id={self.meeting_id})>"
 
@@ -67,7 +81,19 @@ class TranscriptSegment(Base):
     confidence = Column(Float, nullable=True)
     audio_type = Column(String, nullable=False, default="microphone", index=True)
     
-    meeting = relationship("Meeting", back_populates="transcripts")
+    meeting = relationship("Meeting", back_populates="transcripts", lazy="raise")
+
+    __table_args__ = (
+        # Per-meeting reads in time order, and the id-ordered export stream
+        Index("ix_transcript_segments_meeting_id_timestamp", "meeting_id", "timestamp"),
+        Index("ix_transcript_segments_meeting_id_id", "meeting_id", "id"),
+        # Full-text search on Postgres; the expression must match database/search.py
+        Index(
+            "ix_transcript_segments_text_search",
+            func.to_tsvector(literal_column("'english'"), text),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
     
     def __repr__(self):
         return f"<TranscriptSegment(id={self.id}, audio_type={self.audio_type}, text={self.text[:30]}...)>"
@@ -84,8 +110,12 @@ class ActionItem(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     priority = Column(String, nullable=True)  # Added priority field
     
-    meeting = relationship("Meeting", back_populates="action_items")
+    meeting = relationship("Meeting", back_populates="action_items", lazy="raise")
     
+    __table_args__ = (
+        Index("ix_action_items_meeting_id_created_at", "meeting_id", "created_at"),
+    )
+
     def __repr__(self):
         return f"<ActionItem(id={self.id}, status={self.status})>"
 
@@ -100,8 +130,12 @@ class Summary(Base):
     key_points = Column(Text, nullable=True)  # Added for structured key points
     decisions = Column(Text, nullable=True)   # Added for tracking decisions
     
-    meeting = relationship("Meeting", back_populates="summaries")
+    meeting = relationship("Meeting", back_populates="summaries", lazy="raise")
     
+    __table_args__ = (
+        Index("ix_summaries_meeting_id_type_created_at", "meeting_id", "summary_type", "created_at"),
+    )
+
     def __repr__(self):
         return f"<Summary(id={self.id}, type={self.summary_type})>"
 
@@ -115,8 +149,12 @@ class FollowUpQuestion(Base):
     context = Column(Text, nullable=True)  # Added to store context that triggered the question
     answered = Column(Boolean, default=False)  # Added to track if question was addressed
     
-    meeting = relationship("Meeting", back_populates="follow_up_questions")
+    meeting = relationship("Meeting", back_populates="follow_up_questions", lazy="raise")
     
+    __table_args__ = (
+        Index("ix_follow_up_questions_meeting_id_created_at", "meeting_id", "created_at"),
+    )
+
     def __repr__(self):
         return f"<FollowUpQuestion(id={self.id})>"
 
@@ -131,7 +169,33 @@ class Topic(Base):
     participants = Column(Text, nullable=True)  # Key participants in the topic
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     
-    meeting = relationship("Meeting", back_populates="topics")
+    meeting = relationship("Meeting", back_populates="topics", lazy="raise")
     
+    __table_args__ = (
+        Index("ix_topics_meeting_id_created_at", "meeting_id", "created_at"),
+    )
+
     def __repr__(self):
-        return f"<Topic(id={self.id}, name={self.name})>"
\ No newline at end of file
+        return f"<Topic(id={self.id}, name={self.name})>"
+
+# SQLite full-text fallback: an external-content FTS5 table over
+# transcript_segments.text, kept in sync by triggers
+TRANSCRIPT_FTS_TABLE = "transcript_segments_fts"
+TRANSCRIPT_FTS_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {TRANSCRIPT_FTS_TABLE} USING fts5("
+    "text, content='transcript_segments', content_rowid='id', tokenize='porter unicode61')",
+    f"CREATE TRIGGER IF NOT EXISTS {TRANSCRIPT_FTS_TABLE}_ai AFTER INSERT ON transcript_segments BEGIN "
+    f"INSERT INTO {TRANSCRIPT_FTS_TABLE}(rowid, text) VALUES (new.id, new.text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {TRANSCRIPT_FTS_TABLE}_ad AFTER DELETE ON transcript_segments BEGIN "
+    f"INSERT INTO {TRANSCRIPT_FTS_TABLE}({TRANSCRIPT_FTS_TABLE}, rowid, text) VALUES ('delete', old.id, old.text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {TRANSCRIPT_FTS_TABLE}_au AFTER UPDATE OF text ON transcript_segments BEGIN "
+    f"INSERT INTO {TRANSCRIPT_FTS_TABLE}({TRANSCRIPT_FTS_TABLE}, rowid, text) VALUES ('delete', old.id, old.text); "
+    f"INSERT INTO {TRANSCRIPT_FTS_TABLE}(rowid, text) VALUES (new.id, new.text); END",
+)
+
+for statement in TRANSCRIPT_FTS_DDL:
+    event.listen(TranscriptSegment.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(
+    TranscriptSegment.__table__, "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {TRANSCRIPT_FTS_TABLE}").execute_if(dialect="sqlite")
+)
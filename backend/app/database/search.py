@@ -0,0 +1,172 @@
+import re
+import html
+import logging
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import column, func, literal_column, select, table
+from sqlalchemy.ext.asyncio import AsyncSession
+from .models import Meeting, TranscriptSegment, TRANSCRIPT_FTS_TABLE
+
+logger = logging.getLogger(__name__)
+
+SEARCH_PAGE_MAX = 100
+SNIPPET_WORDS = 12
+MARK_START = "<mark>"
+MARK_END = "</mark>"
+
+# The database highlights with private-use characters; the text around them is
+# HTML-escaped before they become MARK_START/MARK_END, so transcript text can
+# never inject markup into a snippet rendered as HTML
+HIGHLIGHT_START = "\ue000"
+HIGHLIGHT_END = "\ue001"
+
+# Must render exactly like ix_transcript_segments_text_search, or Postgres
+# will not use the index (a bound parameter for the config would not match)
+SEARCH_CONFIG = literal_column("'english'")
+
+LIKE_ESCAPE = "\\"
+
+def contains_pattern(text: str) -> str:
+    """ILIKE pattern matching `text` literally anywhere; pass escape=LIKE_ESCAPE with it"""
+    for special in (LIKE_ESCAPE, "%", "_"):
+        text = text.replace(special, LIKE_ESCAPE + special)
+    return f"%{text}%"
+
+def _meeting_pk(meeting_id: str):
+    return select(Meeting.id).where(Meeting.meeting_id == meeting_id).scalar_subquery()
+
+def _postgres_query(query: str, meeting_id: Optional[str], limit: int, offset: int):
+    ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+    vector = func.to_tsvector(SEARCH_CONFIG, TranscriptSegment.text)
+    rank = func.ts_rank_cd(vector, ts_query)
+    hits = (
+        select(TranscriptSegment.id.label("segment_id"), rank.label("score"))
+        .where(vector.op("@@")(ts_query))
+        .order_by(rank.desc(), TranscriptSegment.id.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+    if meeting_id is not None:
+        hits = hits.where(TranscriptSegment.meeting_id == _meeting_pk(meeting_id))
+    hits = hits.subquery()
+
+    # Headlines are costly, so only the page's rows get one
+    snippet = func.ts_headline(
+        SEARCH_CONFIG, TranscriptSegment.text, ts_query,
+        f"StartSel={HIGHLIGHT_START},StopSel={HIGHLIGHT_END},MaxWords={SNIPPET_WORDS * 2},MinWords={SNIPPET_WORDS // 2}"
+    )
+    return (
+        select(
+            hits.c.segment_id,
+            hits.c.score,
+            snippet.label("snippet"),
+            TranscriptSegment.timestamp,
+            TranscriptSegment.speaker,
+            TranscriptSegment.audio_type,
+            Meeting.meeting_id,
+            Meeting.title.label("meeting_title"),
+        )
+        .join(TranscriptSegment, TranscriptSegment.id == hits.c.segment_id)
+        .join(Meeting, Meeting.id == TranscriptSegment.meeting_id)
+        .order_by(hits.c.score.desc(), hits.c.segment_id.desc())
+    )
+
+def _render_snippet(raw: Optional[str]) -> Optional[str]:
+    """Escape a highlighted snippet as HTML, keeping only our <mark> tags"""
+    if raw is None:
+        return None
+    return html.escape(raw).replace(HIGHLIGHT_START, MARK_START).replace(HIGHLIGHT_END, MARK_END)
+
+def _fts5_match(query: str) -> Optional[str]:
+    """Quote every word so user input can never be parsed as FTS5 syntax"""
+    words = re.findall(r"\w+", query)
+    return " ".join(f'"{word}"' for word in words) if words else None
+
+def _sqlite_query(match: str, meeting_id: Optional[str], limit: int, offset: int):
+    fts_table = table(TRANSCRIPT_FTS_TABLE, column("rowid"))
+    fts = literal_column(TRANSCRIPT_FTS_TABLE)  # The table-named hidden column
+    # bm25() is lower for better matches
+    score = (-func.bm25(fts)).label("score")
+    query = (
+        select(
+            TranscriptSegment.id.label("segment_id"),
+            score,
+            func.snippet(fts, 0, HIGHLIGHT_START, HIGHLIGHT_END, "…", SNIPPET_WORDS).label("snippet"),
+            TranscriptSegment.timestamp,
+            TranscriptSegment.speaker,
+            TranscriptSegment.audio_type,
+            Meeting.meeting_id,
+            Meeting.title.label("meeting_title"),
+        )
+        .select_from(fts_table)
+        .join(TranscriptSegment, TranscriptSegment.id == fts_table.c.rowid)
+        .join(Meeting, Meeting.id == TranscriptSegment.meeting_id)
+        .where(fts.op("MATCH")(match))
+        .order_by(score.desc(), TranscriptSegment.id.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+    if meeting_id is not None:
+        query = query.where(TranscriptSegment.meeting_id == _meeting_pk(meeting_id))
+    return query
+
+def _scan_query(query: str, meeting_id: Optional[str], limit: int, offset: int):
+    """Unindexed fallback for other databases"""
+    select_query = (
+        select(
+            TranscriptSegment.id.label("segment_id"),
+            literal_column("0.0").label("score"),
+            TranscriptSegment.text.label("snippet"),
+            TranscriptSegment.timestamp,
+            TranscriptSegment.speaker,
+            TranscriptSegment.audio_type,
+            Meeting.meeting_id,
+            Meeting.title.label("meeting_title"),
+        )
+        .join(Meeting, Meeting.id == TranscriptSegment.meeting_id)
+        .where(TranscriptSegment.text.ilike(contains_pattern(query), escape=LIKE_ESCAPE))
+        .order_by(TranscriptSegment.id.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+    if meeting_id is not None:
+        select_query = select_query.where(TranscriptSegment.meeting_id == _meeting_pk(meeting_id))
+    return select_query
+
+async def search_transcripts(
+    db: AsyncSession,
+    query: str,
+    meeting_id: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0
+) -> Tuple[List[Dict], Optional[int]]:
+    """
+    Ranked transcript hits with highlighted snippets, best first.
+
+    Postgres uses the tsvector GIN index, SQLite the FTS5 table; both
+    answer from the index instead of scanning transcripts. Returns the
+    hits and the offset of the next page (None on the last page).
+    Snippets are HTML: escaped transcript text with matches in <mark> tags.
+    """
+    query = query.strip()
+    limit = max(1, min(limit, SEARCH_PAGE_MAX))
+    offset = max(offset, 0)
+    if not query:
+        return [], None
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        statement = _postgres_query(query, meeting_id, limit + 1, offset)
+    elif dialect == "sqlite":
+        match = _fts5_match(query)
+        if match is None:
+            return [], None
+        statement = _sqlite_query(match, meeting_id, limit + 1, offset)
+    else:
+        logger.warning(f"No full-text index for {dialect}; scanning transcripts")
+        statement = _scan_query(query, meeting_id, limit + 1, offset)
+
+    rows = [dict(row) for row in (await db.execute(statement)).mappings()]
+    for row in rows:
+        row["snippet"] = _render_snippet(row["snippet"])
+    next_offset = offset + limit if len(rows) > limit else None
+    return rows[:limit], next_offset
@@ -0,0 +1,163 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Callable, Deque, Dict, List, Optional
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from .crud import resolve_meeting_pks
+from .models import TranscriptSegment
+
+logger = logging.getLogger(__name__)
+
+class TranscriptWriter:
+    """
+    Write-behind queue for final transcript segments
+    Sessions submit() rows without touching the database. A background task
+    flushes everything pending every `flush_interval_ms`, or as soon as
+    `max_batch` rows are waiting, with one multi-row INSERT per batch on an
+    async session (meeting ids resolve through the shared PK cache). flush() forces a synchronous flush
+    for durability points such as meeting end and shutdown.
+    """
+
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, session_factory: Callable[[], AsyncSession], flush_interval_ms: int = 250,
+                 max_batch: int = 200):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_batch = max_batch
+        self._pending: Deque[dict] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.rows_submitted = 0
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self.flushes = 0
+        self.flush_errors = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.total_flush_ms = 0.0
+        self.max_batch_size = 0
+
+    def start(self):
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Transcript writer started (every {self.flush_interval * 1000:.0f} ms or {self.max_batch} rows)")
+
+    async def stop(self):
+        """Stop the background task and write everything still pending"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        logger.info(f"Transcript writer stopped: {self.get_metrics()}")
+
+    def submit(self, meeting_id: str, transcript_data: dict):
+        """Queue a final transcript for the meeting with public id `meeting_id`"""
+        self._pending.append({
+            "meeting_uuid": meeting_id,
+            "text": transcript_data["text"],
+            "timestamp": datetime.now(timezone.utc),
+            "confidence": transcript_data.get("confidence"),
+            "speaker": transcript_data.get("speaker"),
+            "audio_type": transcript_data.get("audioType", "microphone"),
+            "attempts": 0,
+        })
+        self.rows_submitted += 1
+        if len(self._pending) >= self.max_batch and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Write all pending rows now; returns the number written"""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        written = 0
+        async with self._flush_lock:
+            while self._pending:
+                batch = [self._pending.popleft() for _ in range(min(self.max_batch, len(self._pending)))]
+                started = time.perf_counter()
+                try:
+                    written += await self._write(batch)
+                except Exception as e:
+                    self.flush_errors += 1
+                    logger.error(f"Error flushing {len(batch)} transcripts: {e}", exc_info=True)
+                    self._requeue(batch)
+                    break
+                self._record_flush((time.perf_counter() - started) * 1000, len(batch))
+        return written
+
+    async def _write(self, batch: List[dict]) -> int:
+        """At most one meeting lookup (cache misses only) and one multi-row INSERT for the whole batch"""
+        async with self.session_factory() as db:
+            ids: Dict[str, int] = await resolve_meeting_pks(db, (row["meeting_uuid"] for row in batch))
+            rows = []
+            for row in batch:
+                meeting_pk = ids.get(row["meeting_uuid"])
+                if meeting_pk is None:
+                    logger.error(f"Meeting {row['meeting_uuid']} not found when saving transcript")
+                    self.rows_dropped += 1
+                    continue
+                rows.append({
+                    "meeting_id": meeting_pk,
+                    "text": row["text"],
+                    "timestamp": row["timestamp"],
+                    "confidence": row["confidence"],
+                    "speaker": row["speaker"],
+                    "audio_type": row["audio_type"],
+                })
+            if rows:
+                await db.execute(insert(TranscriptSegment).values(rows))
+                await db.commit()
+            self.rows_written += len(rows)
+            return len(rows)
+
+    def _requeue(self, batch: List[dict]):
+        """Put a failed batch back at the front, dropping rows that keep failing"""
+        for row in reversed(batch):
+            row["attempts"] += 1
+            if row["attempts"] >= self.MAX_ATTEMPTS:
+                self.rows_dropped += 1
+                logger.error(f"Dropping transcript for meeting {row['meeting_uuid']} after {row['attempts']} attempts")
+            else:
+                self._pending.appendleft(row)
+
+    def _record_flush(self, elapsed_ms: float, batch_size: int):
+        self.flushes += 1
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        self.total_flush_ms += elapsed_ms
+        self.max_batch_size = max(self.max_batch_size, batch_size)
+
+    def get_metrics(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "rows_submitted": self.rows_submitted,
+            "rows_written": self.rows_written,
+            "rows_dropped": self.rows_dropped,
+            "flushes": self.flushes,
+            "flush_errors": self.flush_errors,
+            "avg_batch_size": round(self.rows_written / self.flushes, 2) if self.flushes else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "avg_flush_ms": round(self.total_flush_ms / self.flushes, 2) if self.flushes else 0.0,
+            "max_flush_ms": round(self.max_flush_ms, 2),
+        }
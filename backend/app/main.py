@@ -1,9 +1,10 @@
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Depends, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session, joinedload 
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 import logging
 import json
 import asyncio
@@ -14,15 +15,20 @@ from .services.ai_service import AIService
 from fastapi import BackgroundTasks
 from .database.models import Meeting, Summary, TranscriptSegment, ActionItem
 from .database import schemas
-from .database.config import SessionLocal, engine
+from .database import crud
+from .database.search import search_transcripts
+from .database.config import AsyncSessionLocal, get_db
+from .database.writer import TranscriptWriter
 from .core.audio.processor import EnhancedAudioProcessor
-from .services.enhanced_ai_service import EnhancedAIService 
+from .core.audio.stream_manager import BatchMetricsPublisher
+from .core.audio.chunk import AudioChunk
+from .routers import meeting_insights
+from .routers.meeting_insights import get_ai_service
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 app = FastAPI()
-ai_service = EnhancedAIService()
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -33,90 +39,58 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+# Progressive analysis, finalization and the cached insights read model
+app.include_router(meeting_insights.router)
+
 # Store active processors
 active_processors: Dict[str, EnhancedAudioProcessor] = {}
 
-# Dependency for DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# Final transcripts from every live session are batched into multi-row inserts
+transcript_writer = TranscriptWriter(AsyncSessionLocal)
 
-async def handle_transcript(meeting_id: str, transcript_data: dict, db: Session):
-    """Handle incoming transcript data"""
-    try:
-        logger.info(f"START handle_transcript for meeting {meeting_id}")
-        logger.info(f"Transcript data: {transcript_data}")
-        
-        if transcript_data.get("is_final"):
-            logger.info(f"Processing final transcript for meeting {meeting_id}")
-            
-            # Get the meeting first
-            meeting = db.query(Meeting)\
-                .filter(Meeting.meeting_id == meeting_id)\
-                .first()
-                
-            if not meeting:
-                logger.error(f"Meeting {meeting_id} not found when saving transcript")
-                return
+# Stream quality metrics for every live session, in one batched pass per tick
+metrics_publisher = BatchMetricsPublisher(
+    lambda: [processor.stream_manager for processor in active_processors.values()]
+)
 
-            logger.info(f"Found meeting with ID {meeting.id} for transcript")
+@app.on_event("startup")
+async def start_transcript_writer():
+    transcript_writer.start()
 
-            # Create transcript
-            transcript = TranscriptSegment(
-                meeting_id=meeting.id,
-                text=transcript_data["text"],
-                timestamp=datetime.now(timezone.utc),
-                confidence=transcript_data.get("confidence"),
-                speaker=transcript_data.get("speaker"),
-                audio_type=transcript_data.get("audioType", "microphone")
-            )
-            
-            logger.info(f"Created transcript object: {transcript.text[:100]}...")
-            logger.info(f"Audio type: {transcript.audio_type}")
-            
-            try:
-                db.add(transcript)
-                logger.info("Added transcript to session")
-                
-                db.commit()
-                db.refresh(transcript)
-                logger.info(f"Successfully saved transcript with ID {transcript.id}")
-
-                # Verify the transcript was saved
-                saved_transcript = db.query(TranscriptSegment)\
-                    .filter(TranscriptSegment.id == transcript.id)\
-                    .first()
-                    
-                if saved_transcript:
-                    logger.info("Verified transcript was saved correctly")
-                else:
-                    logger.error("Failed to verify saved transcript")
-
-            except Exception as commit_error:
-                logger.error(f"Error committing transcript: {commit_error}")
-                logger.exception(commit_error)  # Log full stack trace
-                logger.exception(e) 
-                db.rollback()
-                raise
-            
+@app.on_event("startup")
+async def start_metrics_publisher():
+    metrics_publisher.start()
+
+@app.on_event("shutdown")
+async def stop_transcript_writer():
+    # Durability: nothing queued is lost on a clean shutdown
+    await transcript_writer.stop()
+
+@app.on_event("shutdown")
+async def stop_metrics_publisher():
+    await metrics_publisher.stop()
+
+async def handle_transcript(meeting_id: str, transcript_data: dict):
+    """Queue final transcripts for the write-behind writer"""
+    try:
+        if transcript_data.get("is_final"):
+            transcript_writer.submit(meeting_id, transcript_data)
+            logger.debug(f"Queued final transcript for meeting {meeting_id}: {transcript_data['text'][:100]}")
     except Exception as e:
         logger.error(f"Error handling transcript: {e}")
         logger.exception(e)  # Log full stack trace
-        db.rollback()
-        
 
-def verify_transcript_saved(db: Session, meeting_id: int, text: str) -> bool:
+async def verify_transcript_saved(db: AsyncSession, meeting_id: int, text: str) -> bool:
     """Verify if a transcript was saved successfully"""
     try:
-        transcript = db.query(TranscriptSegment)\
-            .filter(
+        result = await db.execute(
+            select(TranscriptSegment)
+            .where(
                 TranscriptSegment.meeting_id == meeting_id,
                 TranscriptSegment.text == text
-            )\
-            .first()
+            )
+        )
+        transcript = result.scalars().first()
         return transcript is not None
     except Exception as e:
         logger.error(f"Error verifying transcript: {e}")
@@ -126,8 +100,7 @@ def verify_transcript_saved(db: Session, meeting_id: int, text: str) -> bool:
 @app.websocket("/ws/{client_id}")
 async def websocket_endpoint(
     websocket: WebSocket, 
-    client_id: str, 
-    db: Session = Depends(get_db)
+    client_id: str
 ):
     try:
         await websocket.accept()
@@ -140,7 +113,7 @@ async def websocket_endpoint(
         processor = EnhancedAudioProcessor(
             websocket=websocket,
             client_id=client_id,
-            on_transcript=lambda x: handle_transcript(client_id, x, db),
+            on_transcript=lambda x: handle_transcript(client_id, x),
             loop=loop
         )
         
@@ -168,7 +141,9 @@ async def websocket_endpoint(
                     
                 if "bytes" in message:
                     logger.info(f"Received audio chunk from {client_id} size: {len(message['bytes'])}")
-                    await processor.process_chunk(message["bytes"], "microphone")
+                    # The source comes from the audio_meta message that preceded this chunk;
+                    # without one it is legacy microphone PCM
+                    await processor.handle_message(message["bytes"])
                 elif "text" in message:
                     data = json.loads(message["text"])
                     logger.info(f"Received text message from {client_id}: {data.get('type')}")
@@ -176,7 +151,8 @@ async def websocket_endpoint(
                         await processor.handle_message(message["text"])
                     elif data.get("type") == "system_audio":
                         logger.info(f"Processing system audio chunk size: {len(data['audio'])}")
-                        await processor.process_chunk(data["audio"], "system")
+                        chunk = AudioChunk.from_float(data["audio"], processor.current_sample_rate, "system")
+                        await processor.process_chunk(chunk, "system")
 
             except asyncio.TimeoutError:
                 try:
@@ -217,12 +193,10 @@ async def websocket_endpoint(
 
 
 @app.post("/meetings/{meeting_id}/test-transcript")
-async def create_test_transcript(meeting_id: str, db: Session = Depends(get_db)):
+async def create_test_transcript(meeting_id: str, db: AsyncSession = Depends(get_db)):
     try:
         # Find the meeting
-        meeting = db.query(Meeting)\
-            .filter(Meeting.meeting_id == meeting_id)\
-            .first()
+        meeting = await crud.get_meeting(db, meeting_id, *crud.WRITE_LOADS)
             
         if not meeting:
             raise HTTPException(status_code=404, detail="Meeting not found")
@@ -236,8 +210,8 @@ async def create_test_transcript(meeting_id: str, db: Session = Depends(get_db))
         )
         
         db.add(transcript)
-        db.commit()
-        db.refresh(transcript)
+        await db.commit()
+        await db.refresh(transcript)
         
         return JSONResponse(
             content={
@@ -251,23 +225,30 @@ async def create_test_transcript(meeting_id: str, db: Session = Depends(get_db))
         raise HTTPException(status_code=500, detail=str(e))
     
 @app.delete("/meetings/{meeting_id}")
-async def delete_meeting(meeting_id: str, db: Session = Depends(get_db)):
-    meeting = db.query(Meeting).filter(Meeting.meeting_id == meeting_id).first()
+async def delete_meeting(meeting_id: str, db: AsyncSession = Depends(get_db)):
+    meeting = await crud.get_meeting(db, meeting_id, *crud.WRITE_LOADS)
     if meeting is None:
         raise HTTPException(status_code=404, detail="Meeting not found")
     
-    db.delete(meeting)
-    db.commit()
+    await db.delete(meeting)
+    await db.commit()
     return {"message": "Meeting deleted successfully"}
    
+@app.get("/debug/transcript-writer")
+async def get_transcript_writer_metrics():
+    """Flush latency, batch size and backlog of the transcript write-behind queue"""
+    return transcript_writer.get_metrics()
+
 @app.get("/debug/active-meetings")
-async def get_active_meetings(db: Session = Depends(get_db)):
+async def get_active_meetings(db: AsyncSession = Depends(get_db)):
     try:
         # Get all meetings
-        meetings = db.query(Meeting)\
-            .order_by(Meeting.start_time.desc())\
-            .limit(5)\
-            .all()
+        result = await db.execute(
+            select(Meeting)
+            .order_by(Meeting.start_time.desc())
+            .limit(5)
+        )
+        meetings = result.scalars().all()
             
         return JSONResponse(
             content={
@@ -303,7 +284,7 @@ async def health_check():
     )
 
 @app.post("/meetings/")
-async def create_meeting(title: Optional[str] = None, db: Session = Depends(get_db)):
+async def create_meeting(title: Optional[str] = None, db: AsyncSession = Depends(get_db)):
     try:
         meeting = Meeting(
             meeting_id=str(uuid.uuid4()),
@@ -312,8 +293,8 @@ async def create_meeting(title: Optional[str] = None, db: Session = Depends(get_
             is_active=True
         )
         db.add(meeting)
-        db.commit()
-        db.refresh(meeting)
+        await db.commit()
+        await db.refresh(meeting)
         logger.info(f"Created new meeting: {meeting.id}")
         
         return JSONResponse(
@@ -334,78 +315,97 @@ async def create_meeting(title: Optional[str] = None, db: Session = Depends(get_
         )
     except Exception as e:
         logger.error(f"Error creating meeting: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/meetings/")
-async def list_meetings(db: Session = Depends(get_db)):
+async def list_meetings(
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    title: Optional[str] = None,
+    started_after: Optional[datetime] = None,
+    started_before: Optional[datetime] = None,
+    include: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Page through meetings, newest first.
+    Each row carries counts, duration and the first transcript line; pass
+    include=transcripts,action_items to attach the full children. Follow
+    next_cursor for the next page (null on the last one).
+    """
     try:
-        # Get all meetings ordered by start time
-        meetings = db.query(Meeting)\
-            .order_by(Meeting.start_time.desc())\
-            .all()
+        includes = [name.strip() for name in include.split(",") if name.strip()] if include else []
+        try:
+            meetings, next_cursor = await crud.list_meetings(
+                db,
+                limit=limit,
+                cursor=cursor,
+                is_active=is_active,
+                title=title,
+                started_after=started_after,
+                started_before=started_before,
+                include=includes
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
         response_data = []
-        
         for meeting in meetings:
-            # Get transcripts for this meeting
-            transcripts = db.query(TranscriptSegment)\
-                .filter(TranscriptSegment.meeting_id == meeting.id)\
-                .order_by(TranscriptSegment.timestamp.asc())\
-                .all()
-                
-            # Get action items for this meeting
-            action_items = db.query(ActionItem)\
-                .filter(ActionItem.meeting_id == meeting.id)\
-                .all()
-
             meeting_data = {
-                "id": meeting.id,
-                "meeting_id": meeting.meeting_id,
-                "title": meeting.title,
-                "start_time": meeting.start_time.isoformat() if meeting.start_time else None,
-                "end_time": meeting.end_time.isoformat() if meeting.end_time else None,
-                "is_active": meeting.is_active,
-                "transcripts": [
+                "id": meeting["id"],
+                "meeting_id": meeting["meeting_id"],
+                "title": meeting["title"],
+                "start_time": meeting["start_time"].isoformat() if meeting["start_time"] else None,
+                "end_time": meeting["end_time"].isoformat() if meeting["end_time"] else None,
+                "is_active": meeting["is_active"],
+                "duration_seconds": meeting["duration_seconds"],
+                "transcript_count": meeting["transcript_count"],
+                "action_item_count": meeting["action_item_count"],
+                "first_line": meeting["first_line"],
+            }
+            if "transcripts" in meeting:
+                meeting_data["transcripts"] = [
                     {
                         "id": t.id,
                         "text": t.text,
                         "timestamp": t.timestamp.isoformat() if t.timestamp else None,
                         "speaker": t.speaker,
-                        "confidence": t.confidence if hasattr(t, 'confidence') else None
-                    } for t in transcripts
-                ],
-                "action_items": [
+                        "confidence": t.confidence
+                    } for t in meeting["transcripts"]
+                ]
+            if "action_items" in meeting:
+                meeting_data["action_items"] = [
                     {
                         "id": a.id,
                         "description": a.description,
                         "status": a.status,
-                        "assigned_to": a.assigned_to if hasattr(a, 'assigned_to') else None,
-                        "created_at": a.created_at.isoformat() if hasattr(a, 'created_at') and a.created_at else None
-                    } for a in action_items
+                        "assigned_to": a.assigned_to,
+                        "created_at": a.created_at.isoformat() if a.created_at else None
+                    } for a in meeting["action_items"]
                 ]
-            }
             response_data.append(meeting_data)
 
         return JSONResponse(
-            content=response_data,
+            content={"meetings": response_data, "next_cursor": next_cursor},
             headers={
                 "Access-Control-Allow-Origin": "http://localhost:5173",
                 "Access-Control-Allow-Credentials": "true",
             }
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching meetings: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
     
 @app.get("/debug/meeting/{meeting_id}/transcripts")
-async def debug_meeting_transcripts(meeting_id: str, db: Session = Depends(get_db)):
+async def debug_meeting_transcripts(meeting_id: str, db: AsyncSession = Depends(get_db)):
     try:
         # Get the meeting
-        meeting = db.query(Meeting)\
-            .filter(Meeting.meeting_id == meeting_id)\
-            .first()
+        meeting = await crud.get_meeting(db, meeting_id)
             
         if not meeting:
             return JSONResponse(
@@ -414,10 +414,12 @@ async def debug_meeting_transcripts(meeting_id: str, db: Session = Depends(get_d
             )
             
         # Get transcripts directly
-        transcripts = db.query(TranscriptSegment)\
-            .filter(TranscriptSegment.meeting_id == meeting.id)\
-            .order_by(TranscriptSegment.timestamp.asc())\
-            .all()
+        result = await db.execute(
+            select(TranscriptSegment)
+            .where(TranscriptSegment.meeting_id == meeting.id)
+            .order_by(TranscriptSegment.timestamp.asc())
+        )
+        transcripts = result.scalars().all()
             
         return JSONResponse(
             content={
@@ -440,20 +442,20 @@ async def debug_meeting_transcripts(meeting_id: str, db: Session = Depends(get_d
             status_code=500
         )
 @app.get("/meetings/{meeting_id}/debug")
-async def debug_meeting(meeting_id: str, db: Session = Depends(get_db)):
+async def debug_meeting(meeting_id: str, db: AsyncSession = Depends(get_db)):
     try:
         # Get meeting
-        meeting = db.query(Meeting)\
-            .filter(Meeting.meeting_id == meeting_id)\
-            .first()
+        meeting = await crud.get_meeting(db, meeting_id)
             
         if not meeting:
             raise HTTPException(status_code=404, detail=f"Meeting not found with ID: {meeting_id}")
             
         # Get transcripts directly
-        transcripts = db.query(TranscriptSegment)\
-            .filter(TranscriptSegment.meeting_id == meeting.id)\
-            .all()
+        result = await db.execute(
+            select(TranscriptSegment)
+            .where(TranscriptSegment.meeting_id == meeting.id)
+        )
+        transcripts = result.scalars().all()
             
         # Get raw data
         return JSONResponse(
@@ -488,30 +490,19 @@ async def debug_meeting(meeting_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/meetings/{meeting_id}/details")
-async def get_meeting_details(meeting_id: str, db: Session = Depends(get_db)):
+async def get_meeting_details(meeting_id: str, db: AsyncSession = Depends(get_db)):
     try:
         logger.info(f"Fetching details for meeting: {meeting_id}")
         
-        # Find the meeting first
-        meeting = db.query(Meeting)\
-            .filter(Meeting.meeting_id == meeting_id)\
-            .first()
+        # Meeting plus transcripts and action items: three statements in total
+        meeting = await crud.get_meeting_details(db, meeting_id)
 
         if not meeting:
             logger.warning(f"Meeting not found: {meeting_id}")
             raise HTTPException(status_code=404, detail="Meeting not found")
 
-        # Get transcripts with explicit ordering
-        transcripts = db.query(TranscriptSegment)\
-            .filter(TranscriptSegment.meeting_id == meeting.id)\
-            .order_by(TranscriptSegment.timestamp.asc())\
-            .all()
-
-        # Get action items
-        action_items = db.query(ActionItem)\
-            .filter(ActionItem.meeting_id == meeting.id)\
-            .order_by(ActionItem.created_at.desc())\
-            .all()
+        transcripts = meeting.transcripts
+        action_items = meeting.action_items
 
         logger.info(f"Found {len(transcripts)} transcripts for meeting {meeting_id}")
         
@@ -561,21 +552,23 @@ async def get_meeting_details(meeting_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/meetings/{meeting_id}/transcripts")
-async def get_meeting_transcripts(meeting_id: str, db: Session = Depends(get_db)):
+async def get_meeting_transcripts(meeting_id: str, db: AsyncSession = Depends(get_db)):
     try:
         logger.info(f"Fetching transcripts for meeting: {meeting_id}")
         
         # Find the meeting
-        meeting = db.query(Meeting).filter(Meeting.meeting_id == meeting_id).first()
+        meeting_pk = await crud.resolve_meeting_pk(db, meeting_id)
         
-        if not meeting:
+        if meeting_pk is None:
             raise HTTPException(status_code=404, detail="Meeting not found")
             
         # Get transcripts directly
-        transcripts = db.query(TranscriptSegment)\
-            .filter(TranscriptSegment.meeting_id == meeting.id)\
-            .order_by(TranscriptSegment.timestamp.asc())\
-            .all()
+        result = await db.execute(
+            select(TranscriptSegment)
+            .where(TranscriptSegment.meeting_id == meeting_pk)
+            .order_by(TranscriptSegment.timestamp.asc())
+        )
+        transcripts = result.scalars().all()
             
         logger.info(f"Found {len(transcripts)} transcripts for meeting {meeting_id}")
         
@@ -603,11 +596,106 @@ async def get_meeting_transcripts(meeting_id: str, db: Session = Depends(get_db)
         logger.error(f"Error fetching transcripts: {e}")
         raise HTTPException(status_code=500, detail=str(e))
     
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "json": "application/json"}
+
+def _export_line(row: dict) -> str:
+    return json.dumps({
+        "id": row["id"],
+        "text": row["text"],
+        "timestamp": row["timestamp"].isoformat() if row["timestamp"] else None,
+        "speaker": row["speaker"],
+        "confidence": row["confidence"],
+        "audioType": row["audio_type"],
+    })
+
+async def _export_transcripts(meeting_pk: int, since_id: Optional[int], since_timestamp: Optional[datetime],
+                              format: str):
+    # The generator owns its session: it outlives the request dependency
+    async with AsyncSessionLocal() as db:
+        first = True
+        if format == "json":
+            yield "["
+        async for batch in crud.stream_transcripts(db, meeting_pk, since_id, since_timestamp):
+            if format == "json":
+                lines = ",".join(_export_line(row) for row in batch)
+                yield lines if first else "," + lines
+            else:
+                yield "".join(_export_line(row) + "\n" for row in batch)
+            first = False
+        if format == "json":
+            yield "]"
+
+@app.get("/meetings/{meeting_id}/transcripts/stream")
+async def stream_meeting_transcripts(
+    meeting_id: str,
+    since_id: Optional[int] = None,
+    since_timestamp: Optional[datetime] = None,
+    format: str = "ndjson",
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Stream a meeting's transcripts in id order as NDJSON (one object per
+    line) or as one chunked JSON array (format=json). Rows are read in
+    server-side cursor batches, so memory does not grow with the meeting.
+    Resume with since_id set to the last id received.
+    """
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
+    meeting_pk = await crud.resolve_meeting_pk(db, meeting_id)
+    if meeting_pk is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+
+    return StreamingResponse(
+        _export_transcripts(meeting_pk, since_id, since_timestamp, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Access-Control-Allow-Origin": "http://localhost:5173",
+            "Access-Control-Allow-Credentials": "true",
+        }
+    )
+
+@app.get("/search/transcripts")
+async def search_meeting_transcripts(
+    q: str,
+    meeting_id: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+    db: AsyncSession = Depends(get_db)
+):
+    """Full-text search across all meetings (or one), best matches first"""
+    try:
+        hits, next_offset = await search_transcripts(db, q, meeting_id=meeting_id, limit=limit, offset=offset)
+        return JSONResponse(
+            content={
+                "query": q,
+                "results": [
+                    {
+                        "segment_id": hit["segment_id"],
+                        "meeting_id": hit["meeting_id"],
+                        "meeting_title": hit["meeting_title"],
+                        "snippet": hit["snippet"],
+                        "timestamp": hit["timestamp"].isoformat() if hit["timestamp"] else None,
+                        "speaker": hit["speaker"],
+                        "audioType": hit["audio_type"],
+                        "score": float(hit["score"]),
+                    } for hit in hits
+                ],
+                "next_offset": next_offset
+            },
+            headers={
+                "Access-Control-Allow-Origin": "http://localhost:5173",
+                "Access-Control-Allow-Credentials": "true",
+            }
+        )
+    except Exception as e:
+        logger.error(f"Error searching transcripts: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/meetings/{meeting_id}/test-transcripts")
-async def create_test_transcripts(meeting_id: str, db: Session = Depends(get_db)):
+async def create_test_transcripts(meeting_id: str, db: AsyncSession = Depends(get_db)):
     try:
         # Find the meeting
-        meeting = db.query(Meeting).filter(Meeting.meeting_id == meeting_id).first()
+        meeting = await crud.get_meeting(db, meeting_id, *crud.WRITE_LOADS)
         
         if not meeting:
             raise HTTPException(status_code=404, detail="Meeting not found")
@@ -630,7 +718,7 @@ async def create_test_transcripts(meeting_id: str, db: Session = Depends(get_db)
             db.add(transcript)
             created_transcripts.append(transcript)
         
-        db.commit()
+        await db.commit()
         
         return JSONResponse(
             content={
@@ -650,26 +738,28 @@ async def create_test_transcripts(meeting_id: str, db: Session = Depends(get_db)
             }
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error creating test transcripts: {e}")
         raise HTTPException(status_code=500, detail=str(e))    
     
 @app.post("/meetings/{meeting_id}/generate-summary")
 async def generate_meeting_summary(
     meeting_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     try:
         # Find the meeting
-        meeting = db.query(Meeting).filter(Meeting.meeting_id == meeting_id).first()
+        meeting = await crud.get_meeting(db, meeting_id)
         if not meeting:
             raise HTTPException(status_code=404, detail="Meeting not found")
 
         # Get all transcripts for the meeting
-        transcripts = db.query(TranscriptSegment)\
-            .filter(TranscriptSegment.meeting_id == meeting.id)\
-            .order_by(TranscriptSegment.timestamp.asc())\
-            .all()
+        result = await db.execute(
+            select(TranscriptSegment)
+            .where(TranscriptSegment.meeting_id == meeting.id)
+            .order_by(TranscriptSegment.timestamp.asc())
+        )
+        transcripts = result.scalars().all()
 
         if not transcripts:
             raise HTTPException(status_code=400, detail="No transcripts found for meeting")
@@ -687,7 +777,7 @@ async def generate_meeting_summary(
         ]
 
         # Generate summary using OpenAI
-        summary_text = await ai_service.process_with_retry(messages)
+        summary_text = await get_ai_service().process_with_retry(messages)
 
         if summary_text:
             # Save summary to database
@@ -696,8 +786,8 @@ async def generate_meeting_summary(
                 summary_text=summary_text,
             )
             db.add(summary)
-            db.commit()
-            db.refresh(summary)
+            await db.commit()
+            await db.refresh(summary)
 
             return JSONResponse(
                 content={
@@ -721,7 +811,7 @@ async def generate_meeting_summary(
 @app.get("/ai-usage-stats")
 async def get_ai_usage_stats():
     try:
-        stats = ai_service.get_usage_stats()
+        stats = get_ai_service().get_usage_stats()
         return JSONResponse(
             content=stats,
             headers={
@@ -737,24 +827,24 @@ async def get_ai_usage_stats():
 @app.post("/meetings/{meeting_id}/progressive-summary")
 async def generate_progressive_summary(
     meeting_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     try:
         # Get the most recent transcripts (e.g., last 5 minutes)
-        meeting = db.query(Meeting)\
-            .filter(Meeting.meeting_id == meeting_id)\
-            .first()
+        meeting = await crud.get_meeting(db, meeting_id)
             
         if not meeting:
             raise HTTPException(status_code=404, detail="Meeting not found")
 
-        recent_transcripts = db.query(TranscriptSegment)\
-            .filter(
+        result = await db.execute(
+            select(TranscriptSegment)
+            .where(
                 TranscriptSegment.meeting_id == meeting.id,
                 TranscriptSegment.timestamp >= datetime.now(timezone.utc) - timedelta(minutes=5)
-            )\
-            .order_by(TranscriptSegment.timestamp.asc())\
-            .all()
+            )
+            .order_by(TranscriptSegment.timestamp.asc())
+        )
+        recent_transcripts = result.scalars().all()
 
         if not recent_transcripts:
             return JSONResponse(
@@ -775,7 +865,7 @@ async def generate_progressive_summary(
             }
         ]
 
-        summary_text = await ai_service.process_with_retry(messages)
+        summary_text = await get_ai_service().process_with_retry(messages)
         
         if summary_text:
             return JSONResponse(
@@ -795,24 +885,25 @@ async def generate_progressive_summary(
         raise HTTPException(status_code=500, detail=str(e))
     
 @app.delete("/meetings/{meeting_id}")
-async def delete_meeting(meeting_id: str, db: Session = Depends(get_db)):
-    meeting = db.query(Meeting).filter(Meeting.meeting_id == meeting_id).first()
+async def delete_meeting(meeting_id: str, db: AsyncSession = Depends(get_db)):
+    meeting = await crud.get_meeting(db, meeting_id, *crud.WRITE_LOADS)
     if meeting is None:
         raise HTTPException(status_code=404, detail="Meeting not found")
     
-    db.delete(meeting)
-    db.commit()
+    await db.delete(meeting)
+    await db.commit()
     return {"message": "Meeting deleted successfully"}
 
 @app.put("/meetings/{meeting_id}/end")
-async def end_meeting(meeting_id: str, db: Session = Depends(get_db)):
+async def end_meeting(meeting_id: str, db: AsyncSession = Depends(get_db)):
     try:
         logger.info(f"Attempting to end meeting: {meeting_id}")
         
+        # Durability point: the meeting's queued transcripts are written before it closes
+        await transcript_writer.flush()
+        
         # Find meeting by meeting_id
-        meeting = db.query(Meeting)\
-            .filter(Meeting.meeting_id == meeting_id)\
-            .first()
+        meeting = await crud.get_meeting(db, meeting_id, *crud.WRITE_LOADS)
             
         if not meeting:
             logger.error(f"Meeting not found: {meeting_id}")
@@ -824,11 +915,11 @@ async def end_meeting(meeting_id: str, db: Session = Depends(get_db)):
         meeting.is_active = False
         
         try:
-            db.commit()
+            await db.commit()
             logger.info(f"Successfully ended meeting {meeting_id}")
         except Exception as commit_error:
             logger.error(f"Error committing changes: {commit_error}")
-            db.rollback()
+            await db.rollback()
             raise
         
         return JSONResponse(
@@ -847,39 +938,41 @@ async def end_meeting(meeting_id: str, db: Session = Depends(get_db)):
         raise
     except Exception as e:
         logger.error(f"Error ending meeting: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
     
 @app.post("/meetings/{meeting_id}/live-insights")
 async def generate_live_insights(
     meeting_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     try:
         logger.info(f"Generating insights for meeting {meeting_id}")
-        meeting = db.query(Meeting).filter(Meeting.meeting_id == meeting_id).first()
+        meeting = await crud.get_meeting(db, meeting_id)
         if not meeting:
             raise HTTPException(status_code=404, detail="Meeting not found")
 
         # Get recent transcripts
-        recent_transcripts = db.query(TranscriptSegment)\
-            .filter(TranscriptSegment.meeting_id == meeting.id)\
-            .order_by(TranscriptSegment.timestamp.desc())\
-            .limit(10)\
-            .all()
+        result = await db.execute(
+            select(TranscriptSegment)
+            .where(TranscriptSegment.meeting_id == meeting.id)
+            .order_by(TranscriptSegment.timestamp.desc())
+            .limit(10)
+        )
+        recent_transcripts = result.scalars().all()
 
         transcript_texts = [t.text for t in recent_transcripts]
         
         logger.info(f"Processing {len(transcript_texts)} transcript segments")
         
         # Generate insights using AI service
-        summary = await ai_service.generate_progressive_summary(transcript_texts)
+        summary = await get_ai_service().generate_progressive_summary(transcript_texts)
         logger.info(f"Generated summary: {summary}")
         
-        questions = await ai_service.generate_followup_questions(' '.join(transcript_texts))
+        questions = await get_ai_service().generate_followup_questions(' '.join(transcript_texts))
         logger.info(f"Generated questions: {questions}")
         
-        action_items = await ai_service.extract_action_items(' '.join(transcript_texts))
+        action_items = await get_ai_service().extract_action_items(' '.join(transcript_texts))
         logger.info(f"Generated action items: {action_items}")
 
         return JSONResponse(content={
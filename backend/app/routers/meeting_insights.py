@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timezone, timedelta
 import logging
-from typing import List
+from typing import List, Optional
 
 from ..database.config import get_db
-from .. import crud, schemas
+from ..database.insights_cache import insights_cache
+from ..database import crud, schemas
 from ..services.enhanced_ai_service import EnhancedAIService
 from ..database import models
 
@@ -14,30 +16,42 @@ router = APIRouter(
     tags=["meetings"]
 )
 
-ai_service = EnhancedAIService()
 logger = logging.getLogger(__name__)
 
+_ai_service: Optional[EnhancedAIService] = None
+
+def get_ai_service() -> EnhancedAIService:
+    """Created on first use, so reading insights never needs the OpenAI client"""
+    global _ai_service
+    if _ai_service is None:
+        _ai_service = EnhancedAIService()
+    return _ai_service
+
 @router.post("/{meeting_id}/analyze")
 async def analyze_meeting_segment(
     meeting_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    ai_service: EnhancedAIService = Depends(get_ai_service)
 ):
     """
     Analyze recent meeting segments and generate insights
     """
     try:
-        meeting = crud.get_meeting(db, meeting_id)
-        if not meeting:
+        # Resolved once; every insight row below reuses the key
+        meeting_pk = await crud.resolve_meeting_pk(db, meeting_id)
+        if meeting_pk is None:
             raise HTTPException(status_code=404, detail="Meeting not found")
 
         # Get recent transcripts (last 5 minutes)
-        recent_transcripts = db.query(models.TranscriptSegment)\
-            .filter(
-                models.TranscriptSegment.meeting_id == meeting.id,
+        result = await db.execute(
+            select(models.TranscriptSegment)
+            .where(
+                models.TranscriptSegment.meeting_id == meeting_pk,
                 models.TranscriptSegment.timestamp >= datetime.now(timezone.utc) - timedelta(minutes=5)
-            )\
-            .order_by(models.TranscriptSegment.timestamp.asc())\
-            .all()
+            )
+            .order_by(models.TranscriptSegment.timestamp.asc())
+        )
+        recent_transcripts = result.scalars().all()
 
         if not recent_transcripts:
             return {"message": "No recent transcripts to analyze"}
@@ -53,29 +67,31 @@ async def analyze_meeting_segment(
                 key_points=summary.get('topics'),
                 decisions=summary.get('decisions')
             )
-            crud.add_summary(db, meeting_id, summary_schema)
+            await crud.add_summary(db, meeting_pk, summary_schema, commit=False)
 
         # Generate follow-up questions
         questions = await ai_service.generate_followup_questions(' '.join(transcript_texts))
         if questions:
-            for question in questions:
-                question_schema = schemas.FollowUpQuestionCreate(
-                    question_text=question,
-                    context=' '.join(transcript_texts[-2:])
-                )
-                crud.add_follow_up_question(db, meeting_id, question_schema)
+            context = ' '.join(transcript_texts[-2:])
+            await crud.add_follow_up_questions(db, meeting_pk, [
+                schemas.FollowUpQuestionCreate(question_text=question, context=context)
+                for question in questions
+            ], commit=False)
 
         # Extract action items
         action_items = await ai_service.extract_action_items(' '.join(transcript_texts))
         if action_items:
-            for item in action_items:
-                action_schema = schemas.ActionItemCreate(
+            await crud.add_action_items(db, meeting_pk, [
+                schemas.ActionItemCreate(
                     description=item['description'],
                     assigned_to=item.get('assigned_to'),
                     due_date=item.get('due_date'),
                     priority=item.get('priority', 'medium')
-                )
-                crud.add_action_item(db, meeting_id, action_schema)
+                ) for item in action_items
+            ], commit=False)
+
+        # The whole pass is one transaction
+        await db.commit()
 
         return {
             "summary": summary,
@@ -90,20 +106,23 @@ async def analyze_meeting_segment(
 @router.post("/{meeting_id}/finalize")
 async def finalize_meeting(
     meeting_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    ai_service: EnhancedAIService = Depends(get_ai_service)
 ):
     """
     Generate final meeting summary and insights
     """
     try:
-        meeting = crud.get_meeting(db, meeting_id)
+        meeting = await crud.get_meeting(db, meeting_id)
         if not meeting:
             raise HTTPException(status_code=404, detail="Meeting not found")
 
-        transcripts = db.query(models.TranscriptSegment)\
-            .filter(models.TranscriptSegment.meeting_id == meeting.id)\
-            .order_by(models.TranscriptSegment.timestamp.asc())\
-            .all()
+        result = await db.execute(
+            select(models.TranscriptSegment)
+            .where(models.TranscriptSegment.meeting_id == meeting.id)
+            .order_by(models.TranscriptSegment.timestamp.asc())
+        )
+        transcripts = result.scalars().all()
 
         if not transcripts:
             raise HTTPException(status_code=400, detail="No transcripts found")
@@ -119,24 +138,24 @@ async def finalize_meeting(
                 key_points=final_summary['discussion_points'],
                 decisions=final_summary['decisions']
             )
-            crud.add_summary(db, meeting_id, summary_schema)
+            await crud.add_summary(db, meeting.id, summary_schema, commit=False)
 
         # Identify topics
         topics = await ai_service.identify_topics(full_transcript)
         if topics:
-            for topic in topics:
-                topic_schema = schemas.TopicCreate(
+            await crud.add_topics(db, meeting.id, [
+                schemas.TopicCreate(
                     name=topic['topic'],
                     description=topic['description'],
                     time_spent=topic['time_spent'],
                     participants=topic['participants']
-                )
-                crud.add_topic(db, meeting_id, topic_schema)
+                ) for topic in topics
+            ], commit=False)
 
-        # Mark meeting as inactive
+        # Mark meeting as inactive; insights and status commit together
         meeting.is_active = False
         meeting.end_time = datetime.now(timezone.utc)
-        db.commit()
+        await db.commit()
 
         return {
             "summary": final_summary,
@@ -148,56 +167,87 @@ async def finalize_meeting(
         logger.error(f"Error finalizing meeting: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _insights_payload(meeting: models.Meeting) -> dict:
+    # Collections are already ordered newest first
+    progressive_summaries = [s for s in meeting.summaries if s.summary_type == 'progressive']
+    final_summary = next((s for s in meeting.summaries if s.summary_type == 'final'), None)
+    topics = meeting.topics
+    questions = [q for q in meeting.follow_up_questions if not q.answered]
+
+    return {
+        "progressive_summaries": [
+            {
+                "summary": s.summary_text,
+                "key_points": s.key_points,
+                "decisions": s.decisions,
+                "created_at": s.created_at
+            } for s in progressive_summaries
+        ],
+        "final_summary": {
+            "summary": final_summary.summary_text,
+            "key_points": final_summary.key_points,
+            "decisions": final_summary.decisions,
+            "created_at": final_summary.created_at
+        } if final_summary else None,
+        "topics": [
+            {
+                "name": t.name,
+                "description": t.description,
+                "time_spent": t.time_spent,
+                "participants": t.participants
+            } for t in topics
+        ],
+        "unanswered_questions": [
+            {
+                "question": q.question_text,
+                "context": q.context,
+                "created_at": q.created_at
+            } for q in questions
+        ]
+    }
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # Weak comparison, as If-None-Match requires
+    return "*" in candidates or etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
 @router.get("/{meeting_id}/insights")
 async def get_meeting_insights(
     meeting_id: str,
-    db: Session = Depends(get_db)
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get all insights for a meeting
+
+    Served from the insights cache while nothing changed; a matching
+    If-None-Match gets a 304. With the meeting's key and payload cached,
+    a poll does not touch the database.
     """
     try:
-        meeting = crud.get_meeting(db, meeting_id)
-        if not meeting:
+        meeting_pk = await crud.resolve_meeting_pk(db, meeting_id)
+        if meeting_pk is None:
             raise HTTPException(status_code=404, detail="Meeting not found")
 
-        progressive_summaries = crud.get_progressive_summaries(db, meeting_id)
-        final_summary = crud.get_final_summary(db, meeting_id)
-        topics = crud.get_meeting_topics(db, meeting_id)
-        questions = crud.get_unanswered_questions(db, meeting_id)
-
-        return {
-            "progressive_summaries": [
-                {
-                    "summary": s.summary_text,
-                    "key_points": s.key_points,
-                    "decisions": s.decisions,
-                    "created_at": s.created_at
-                } for s in progressive_summaries
-            ],
-            "final_summary": {
-                "summary": final_summary.summary_text,
-                "key_points": final_summary.key_points,
-                "decisions": final_summary.decisions,
-                "created_at": final_summary.created_at
-            } if final_summary else None,
-            "topics": [
-                {
-                    "name": t.name,
-                    "description": t.description,
-                    "time_spent": t.time_spent,
-                    "participants": t.participants
-                } for t in topics
-            ],
-            "unanswered_questions": [
-                {
-                    "question": q.question_text,
-                    "context": q.context,
-                    "created_at": q.created_at
-                } for q in questions
-            ]
-        }
-
+        entry = await insights_cache.get(meeting_pk)
+        if entry is None:
+            # Read first: a write committing while we build makes the store a no-op
+            version = await insights_cache.version(meeting_pk)
+            # One meeting lookup plus one selectin query per collection
+            meeting = await crud.get_meeting_insights(db, meeting_id)
+            if not meeting:
+                raise HTTPException(status_code=404, detail="Meeting not found")
+            entry = await insights_cache.put(meeting_pk, _insights_payload(meeting), version)
+
+        headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+        if _etag_matches(if_none_match, entry.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting meeting insights: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
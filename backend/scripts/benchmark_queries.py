@@ -0,0 +1,277 @@
+import sys
+import os
+import json
+import time
+import uuid
+import random
+import asyncio
+import argparse
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.database import crud
+from app.database.config import Base, to_async_url
+from app.database.models import ActionItem, FollowUpQuestion, Meeting, Summary, Topic, TranscriptSegment
+from app.database.search import search_transcripts
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+WORDS = (
+    "budget release roadmap customer deadline launch review metrics hiring design feedback migration "
+    "database latency outage incident sprint backlog priority estimate contract invoice partner demo "
+    "onboarding security audit quarter forecast revenue churn pricing support ticket feature bug"
+).split()
+FILLER = "the a we so and then I think that this it is was will should can to of for on with".split()
+SPEAKERS = ["Alice", "Bob", "Carol", "Dan", "Erin", None]
+INSERT_BATCH = 5000
+
+class Sample(NamedTuple):
+    """The meeting and cursor the per-meeting queries run against"""
+    meeting_uuid: str
+    meeting_pk: int
+    meeting_end: datetime
+    lookup_uuids: List[str]
+    cursor: Optional[str]
+
+class Case(NamedTuple):
+    name: str
+    source: str  # Where the application issues this query
+    run: Callable[[AsyncSession, Sample], Awaitable[object]]
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(FILLER if rng.random() < 0.6 else WORDS) for _ in range(rng.randint(6, 24))]
+    return " ".join(words).capitalize()
+
+async def _insert(conn, table, rows: List[dict]):
+    for start in range(0, len(rows), INSERT_BATCH):
+        await conn.execute(insert(table), rows[start:start + INSERT_BATCH])
+
+async def seed(engine, meetings: int, segments_per_meeting: int, seed: int = 42):
+    """Meetings over the past year with transcripts, summaries, action items, questions and topics"""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        if (await conn.execute(select(func.count(Meeting.id)))).scalar():
+            raise RuntimeError("Database already has meetings; benchmark against a scratch database or use --skip-seed")
+
+        meeting_rows = []
+        for i in range(meetings):
+            start = now - timedelta(days=rng.uniform(0, 365))
+            meeting_rows.append({
+                "meeting_id": str(uuid.uuid4()),
+                "title": f"{rng.choice(WORDS).capitalize()} sync {i}",
+                "start_time": start,
+                "end_time": None if i % 50 == 0 else start + timedelta(minutes=rng.randint(15, 120)),
+                "is_active": i % 50 == 0,
+            })
+        await _insert(conn, Meeting, meeting_rows)
+        result = await conn.execute(select(Meeting.id, Meeting.start_time))
+        meeting_starts = result.all()
+
+        started = time.perf_counter()
+        segment_rows, child_rows = [], {ActionItem: [], Summary: [], FollowUpQuestion: [], Topic: []}
+        for meeting_pk, start in meeting_starts:
+            count = max(1, int(segments_per_meeting * rng.uniform(0.5, 1.5)))
+            for n in range(count):
+                segment_rows.append({
+                    "meeting_id": meeting_pk,
+                    "text": _sentence(rng),
+                    "timestamp": start + timedelta(seconds=3 * n),
+                    "speaker": rng.choice(SPEAKERS),
+                    "confidence": rng.uniform(0.6, 1.0),
+                    "audio_type": "microphone" if n % 3 else "system",
+                })
+            if len(segment_rows) >= INSERT_BATCH * 10:
+                await _insert(conn, TranscriptSegment, segment_rows)
+                segment_rows = []
+            created = start + timedelta(minutes=5)
+            child_rows[ActionItem] += [{"meeting_id": meeting_pk, "description": _sentence(rng), "status": "pending",
+                                        "created_at": created + timedelta(minutes=k)} for k in range(3)]
+            child_rows[Summary] += [{"meeting_id": meeting_pk, "summary_text": _sentence(rng),
+                                     "summary_type": "final" if k == 4 else "progressive",
+                                     "created_at": created + timedelta(minutes=k)} for k in range(5)]
+            child_rows[FollowUpQuestion] += [{"meeting_id": meeting_pk, "question_text": _sentence(rng) + "?",
+                                              "answered": k % 2 == 0,
+                                              "created_at": created + timedelta(minutes=k)} for k in range(4)]
+            child_rows[Topic] += [{"meeting_id": meeting_pk, "name": rng.choice(WORDS),
+                                   "created_at": created + timedelta(minutes=k)} for k in range(3)]
+        await _insert(conn, TranscriptSegment, segment_rows)
+        for table, rows in child_rows.items():
+            await _insert(conn, table, rows)
+    logger.info(f"Seeded {meetings} meetings in {time.perf_counter() - started:.1f}s")
+
+async def _all(db: AsyncSession, statement):
+    return (await db.execute(statement)).scalars().all()
+
+async def _drain(db: AsyncSession, sample: Sample):
+    return sum([len(batch) async for batch in crud.stream_transcripts(db, sample.meeting_pk)])
+
+CASES = (
+    Case("get_meeting", "crud.get_meeting", lambda db, s: crud.get_meeting(db, s.meeting_uuid)),
+    Case("meeting_details", "main.get_meeting_details", lambda db, s: crud.get_meeting_details(db, s.meeting_uuid)),
+    Case("meeting_insights", "meeting_insights.get_meeting_insights",
+         lambda db, s: crud.get_meeting_insights(db, s.meeting_uuid)),
+    Case("list_meetings", "main.list_meetings", lambda db, s: crud.list_meetings(db)),
+    Case("list_meetings_next_page", "main.list_meetings", lambda db, s: crud.list_meetings(db, cursor=s.cursor)),
+    Case("list_active_meetings", "main.list_meetings", lambda db, s: crud.list_meetings(db, is_active=True)),
+    Case("meeting_topics", "crud.get_meeting_topics", lambda db, s: crud.get_meeting_topics(db, s.meeting_uuid)),
+    Case("unanswered_questions", "crud.get_unanswered_questions",
+         lambda db, s: crud.get_unanswered_questions(db, s.meeting_uuid)),
+    Case("progressive_summaries", "crud.get_progressive_summaries",
+         lambda db, s: crud.get_progressive_summaries(db, s.meeting_uuid)),
+    Case("final_summary", "crud.get_final_summary", lambda db, s: crud.get_final_summary(db, s.meeting_uuid)),
+    Case("meeting_transcripts", "main.get_meeting_transcripts", lambda db, s: _all(db,
+         select(TranscriptSegment)
+         .where(TranscriptSegment.meeting_id == s.meeting_pk)
+         .order_by(TranscriptSegment.timestamp.asc()))),
+    # Relative to the meeting's end rather than now(), so seeded meetings have recent rows
+    Case("recent_transcripts", "main.generate_progressive_summary", lambda db, s: _all(db,
+         select(TranscriptSegment)
+         .where(
+             TranscriptSegment.meeting_id == s.meeting_pk,
+             TranscriptSegment.timestamp >= s.meeting_end - timedelta(minutes=5)
+         )
+         .order_by(TranscriptSegment.timestamp.asc()))),
+    Case("latest_transcripts", "main.generate_live_insights", lambda db, s: _all(db,
+         select(TranscriptSegment)
+         .where(TranscriptSegment.meeting_id == s.meeting_pk)
+         .order_by(TranscriptSegment.timestamp.desc())
+         .limit(10))),
+    Case("active_meetings", "main.get_active_meetings", lambda db, s: _all(db,
+         select(Meeting).order_by(Meeting.start_time.desc()).limit(5))),
+    Case("writer_meeting_lookup", "writer.TranscriptWriter._write", lambda db, s: db.execute(
+         select(Meeting.meeting_id, Meeting.id).where(Meeting.meeting_id.in_(s.lookup_uuids)))),
+    Case("stream_transcripts", "main.stream_meeting_transcripts", _drain),
+    Case("search_transcripts", "main.search_meeting_transcripts",
+         lambda db, s: search_transcripts(db, "budget deadline")),
+)
+
+async def _sample(Session) -> Sample:
+    async with Session() as db:
+        count = (await db.execute(select(func.count(Meeting.id)))).scalar()
+        if not count:
+            raise RuntimeError("No meetings to benchmark; run without --skip-seed first")
+        meeting = (await db.execute(select(Meeting).order_by(Meeting.id).offset(count // 2).limit(1))).scalars().one()
+        last = (await db.execute(
+            select(func.max(TranscriptSegment.timestamp)).where(TranscriptSegment.meeting_id == meeting.id)
+        )).scalar()
+        uuids = (await db.execute(select(Meeting.meeting_id).order_by(Meeting.id.desc()).limit(10))).scalars().all()
+        _, cursor = await crud.list_meetings(db)
+    return Sample(meeting.meeting_id, meeting.id, last or meeting.start_time, list(uuids), cursor)
+
+async def _explain(engine, statement: str, parameters, analyze: bool) -> List[str]:
+    dialect = engine.dialect.name
+    if dialect == "postgresql":
+        prefix = "EXPLAIN (ANALYZE, BUFFERS) " if analyze else "EXPLAIN "
+    elif dialect == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN "
+    else:
+        return []
+    async with engine.connect() as conn:
+        rows = (await conn.exec_driver_sql(prefix + statement, parameters)).all()
+    return [str(row[-1]) for row in rows]
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(round(fraction * (len(ordered) - 1)))]
+
+async def benchmark_case(engine, Session, case: Case, sample: Sample, repeat: int, analyze: bool) -> Dict:
+    statements = []
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    # One untimed run warms caches and records the statements the case emits
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        async with Session() as db:
+            await case.run(db, sample)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    timings = []
+    for _ in range(repeat):
+        async with Session() as db:
+            started = time.perf_counter()
+            await case.run(db, sample)
+            timings.append((time.perf_counter() - started) * 1000)
+
+    return {
+        "name": case.name,
+        "source": case.source,
+        "runs": repeat,
+        "median_ms": round(_percentile(timings, 0.5), 3),
+        "p95_ms": round(_percentile(timings, 0.95), 3),
+        "min_ms": round(min(timings), 3),
+        "statements": [
+            {"sql": statement, "plan": await _explain(engine, statement, parameters, analyze)}
+            for statement, parameters in statements
+        ],
+    }
+
+async def run_benchmark(database_url: str, meetings: int, segments_per_meeting: int, repeat: int,
+                        analyze: bool = False, skip_seed: bool = False, seed_value: int = 42) -> Dict:
+    engine = create_async_engine(to_async_url(database_url))
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    try:
+        if not skip_seed:
+            await seed(engine, meetings, segments_per_meeting, seed_value)
+        async with Session() as db:
+            dataset = {
+                "meetings": (await db.execute(select(func.count(Meeting.id)))).scalar(),
+                "segments": (await db.execute(select(func.count(TranscriptSegment.id)))).scalar(),
+            }
+        sample = await _sample(Session)
+        results = [await benchmark_case(engine, Session, case, sample, repeat, analyze) for case in CASES]
+    finally:
+        await engine.dispose()
+    return {
+        "database": engine.dialect.name,
+        "dataset": dataset,
+        "recorded_at": datetime.utcnow().isoformat(),
+        "queries": results,
+    }
+
+def log_report(report: Dict, baseline: Optional[Dict] = None):
+    before = {query["name"]: query for query in (baseline or {}).get("queries", [])}
+    logger.info(f"{report['database']}: {report['dataset']['meetings']} meetings, "
+                f"{report['dataset']['segments']} segments")
+    for query in report["queries"]:
+        line = (f"{query['name']:<26} median {query['median_ms']:>9.3f} ms  p95 {query['p95_ms']:>9.3f} ms  "
+                f"{len(query['statements'])} statements  ({query['source']})")
+        previous = before.get(query["name"])
+        if previous and previous["median_ms"]:
+            line += f"  {(query['median_ms'] / previous['median_ms'] - 1) * 100:+.0f}% vs baseline"
+        logger.info(line)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed a dataset and record latency and EXPLAIN plans of the app's queries")
+    parser.add_argument("--database-url", default=os.getenv("BENCHMARK_DATABASE_URL", "sqlite:///benchmark.db"),
+                        help="Scratch database; never point this at production")
+    parser.add_argument("--meetings", type=int, default=2000)
+    parser.add_argument("--segments-per-meeting", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--analyze", action="store_true", help="Use EXPLAIN ANALYZE on Postgres")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse the dataset already in the database")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="query_benchmark.json")
+    parser.add_argument("--compare", help="Previous report to compare median latencies against")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(args.database_url, args.meetings, args.segments_per_meeting, args.repeat,
+                                       args.analyze, args.skip_seed, args.seed))
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    log_report(report, baseline)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    logger.info(f"Report with query plans written to {args.output}")
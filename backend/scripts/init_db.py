@@ -1,3 +1,4 @@
+import asyncio
 import sys
 import os
 from pathlib import Path
@@ -6,18 +7,13 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from app.database import crud, models, schemas
-from app.database.config import SessionLocal, engine
+from app.database.config import AsyncSessionLocal, engine
 from app.database.models import Base
 
-def init_db():
-    print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
-    
-    print("Initializing test data...")
-    db = SessionLocal()
-    try:
+async def seed_db():
+    async with AsyncSessionLocal() as db:
         # Create a test meeting
-        meeting = crud.create_meeting(
+        meeting = await crud.create_meeting(
             db, 
             schemas.MeetingCreate(
                 meeting_id="test-meeting-1",
@@ -27,15 +23,19 @@ def init_db():
         print(f"Created meeting: {meeting.meeting_id}")
 
         # Add a test transcript
-        segment = crud.add_transcript_segment(
+        segment = await crud.add_transcript_segment(
             db, 
             meeting.meeting_id, 
             "Hello, this is a test transcript"
         )
         print("Added test transcript segment")
 
-    finally:
-        db.close()
+def init_db():
+    print("Creating database tables...")
+    Base.metadata.create_all(bind=engine)
+
+    print("Initializing test data...")
+    asyncio.run(seed_db())
 
 if __name__ == "__main__":
     init_db()
\ No newline at end of file
@@ -0,0 +1,84 @@
+import sys
+import os
+import asyncio
+import inspect
+
+# Add the parent directory to the Python path so we can import our app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.database import crud
+from app.database.config import Base, enable_sqlite_foreign_keys
+from app.database.insights_cache import insights_cache
+
+class SqliteDatabase:
+    """A fresh in-memory database with the app's schema"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.Session = async_sessionmaker(engine, expire_on_commit=False)
+        self._listeners = []
+
+    def _listen(self, name: str, fn):
+        event.listen(self.engine.sync_engine, name, fn)
+        self._listeners.append((name, fn))
+
+    def record_statements(self) -> list:
+        """SQL of every statement executed from now on"""
+        statements = []
+        self._listen("before_cursor_execute", lambda *args: statements.append(args[2]))
+        return statements
+
+    def record_commits(self) -> list:
+        """Connection of every COMMIT from now on"""
+        commits = []
+        self._listen("commit", lambda conn: commits.append(conn))
+        return commits
+
+    def remove_listeners(self):
+        for name, fn in self._listeners:
+            event.remove(self.engine.sync_engine, name, fn)
+        self._listeners.clear()
+
+@pytest.fixture
+def event_loop():
+    """Loop for `async def` tests and the database fixture"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    # Let background work (cache invalidations) finish before closing
+    pending = asyncio.all_tasks(loop)
+    if pending:
+        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+    loop.run_until_complete(loop.shutdown_asyncgens())
+    loop.close()
+
+@pytest.fixture
+def database(event_loop):
+    # Process-wide caches would otherwise carry keys over from the last test's database
+    crud.meeting_pk_cache.clear()
+    engine = create_async_engine("sqlite+aiosqlite://")
+    event.listen(engine.sync_engine, "connect", enable_sqlite_foreign_keys)
+
+    async def create_schema():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await insights_cache.invalidate()
+
+    event_loop.run_until_complete(create_schema())
+    database = SqliteDatabase(engine)
+    yield database
+    database.remove_listeners()
+    event_loop.run_until_complete(engine.dispose())
+    crud.meeting_pk_cache.clear()
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    """Run `async def` tests on the event_loop fixture (pytest-asyncio is not a dependency)"""
+    loop = pyfuncitem.funcargs.get("event_loop")
+    if loop is None or not inspect.iscoroutinefunction(pyfuncitem.obj):
+        return None
+    arguments = {name: pyfuncitem.funcargs[name] for name in inspect.signature(pyfuncitem.obj).parameters}
+    loop.run_until_complete(pyfuncitem.obj(**arguments))
+    return True
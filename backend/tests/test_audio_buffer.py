@@ -0,0 +1,192 @@
+import sys
+import os
+import asyncio
+import wave
+import numpy as np
+
+# Add the parent directory to the Python path so we can import our app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.audio.buffer import RingBuffer, AudioBuffer
+from app.core.audio.chunk import AudioChunk
+from app.core.audio.packetizer import Packetizer
+from app.core.audio.audio_queue import BoundedAudioQueue
+from app.core.audio.recorder import MixRecorder
+from app.core.audio.stream_manager import StreamManager
+
+def test_ring_buffer_wraparound():
+    """Reads across the end of storage return samples in order"""
+    ring = RingBuffer(8)
+    ring.write(np.arange(6))
+    assert ring.read(4).ravel().tolist() == [0, 1, 2, 3]
+
+    ring.write(np.arange(6, 12))
+    assert ring.available == 8
+    assert ring.peek(8).ravel().tolist() == list(range(4, 12))
+    assert ring.overruns == 0
+
+def test_ring_buffer_view_when_contiguous():
+    """Contiguous reads share memory with the ring storage"""
+    ring = RingBuffer(8)
+    ring.write(np.arange(4))
+    assert np.shares_memory(ring.peek(4), ring._data)
+
+def test_ring_buffer_overrun_drops_oldest():
+    """Writing past capacity keeps the newest samples and counts the overrun"""
+    ring = RingBuffer(8)
+    ring.write(np.arange(6))
+    ring.write(np.arange(6, 10))
+    assert ring.overruns == 1
+    assert ring.dropped_samples == 2
+    assert ring.read(8).ravel().tolist() == list(range(2, 10))
+
+    ring.write(np.arange(20))
+    assert ring.overruns == 2
+    assert ring.read(8).ravel().tolist() == list(range(12, 20))
+
+def test_buffer_status_reports_fill_level():
+    buffer = AudioBuffer(sample_rate=100, max_buffer_seconds=1.0)
+    buffer.add_audio("client_microphone", np.zeros((50, 1), dtype=np.int16))
+    status = buffer.get_buffer_status()["client_microphone"]
+    assert status["samples"] == 50
+    assert status["fill_level"] == 0.5
+    assert status["overruns"] == 0
+
+def test_buffer_overrun_warnings_are_rate_limited(caplog):
+    """A full ring logs its first overrun and then every 50th, not one per chunk"""
+    buffer = AudioBuffer(sample_rate=100, max_buffer_seconds=1.0)
+    with caplog.at_level("WARNING", logger="app.core.audio.buffer"):
+        for _ in range(110):
+            buffer.add_audio("client_microphone", np.zeros((10, 1), dtype=np.int16))
+    # The first 10 chunks fill the ring; the other 100 overrun it
+    assert buffer.get_buffer_status()["client_microphone"]["overruns"] == 100
+    assert len(caplog.records) == 3
+
+def test_mixer_pads_late_stream_with_silence():
+    """A stream with no data yet is mixed as silence rather than removed"""
+    buffer = AudioBuffer(sample_rate=1000, jitter_ms=0)
+    buffer.add_stream("client_system")
+    buffer.add_audio("client_microphone", np.full((100, 1), 16384, dtype=np.int16))
+    start = buffer.clock_start
+
+    mixed = buffer.get_combined_audio(now=start + 0.1)
+    assert mixed.shape == (100, 1)
+    assert "client_system" in buffer.buffer
+    assert buffer.get_buffer_status()["client_system"]["silence_padded"] == 100
+
+    # Late system audio follows the gap instead of being dropped
+    buffer.add_audio("client_system", np.full((50, 1), 8192, dtype=np.int16))
+    mixed = buffer.get_combined_audio(now=start + 0.15)
+    assert mixed.shape == (50, 1)
+    assert np.allclose(mixed, 0.25)
+
+def test_mixer_output_follows_clock_not_arrivals():
+    """Bursty input is released at the clock rate, trailing by the jitter window"""
+    buffer = AudioBuffer(sample_rate=1000, jitter_ms=20)
+    buffer.add_audio("client_microphone", np.zeros((500, 1), dtype=np.int16))
+    start = buffer.clock_start
+
+    assert buffer.get_combined_audio(now=start + 0.01) is None
+    assert buffer.get_combined_audio(now=start + 0.1).shape == (80, 1)
+    assert buffer.get_combined_audio(now=start + 0.2).shape == (100, 1)
+    assert buffer.get_buffer_status()["client_microphone"]["samples"] == 320
+
+def test_mixer_restarts_its_clock_after_clear():
+    """Audio resuming after a pause is mixed from the new start, not as a long gap"""
+    buffer = AudioBuffer(sample_rate=1000, jitter_ms=0, max_buffer_seconds=1.0)
+    buffer.add_audio("client_microphone", np.zeros((100, 1), dtype=np.int16))
+    assert buffer.get_combined_audio(now=buffer.clock_start + 0.1).shape == (100, 1)
+
+    buffer.clear()
+    assert buffer.clock_start is None and buffer.mix_position == 0
+    buffer.add_audio("client_microphone", np.full((50, 1), 16384, dtype=np.int16))
+    mixed = buffer.get_combined_audio(now=buffer.clock_start + 0.05)
+    assert mixed.shape == (50, 1)
+    assert np.allclose(mixed, 0.5)
+
+def test_recorder_writes_the_mix_at_the_clock_rate(tmp_path):
+    """The recorder drains the mixer; without one, audio is not buffered at all"""
+    path = tmp_path / "recordings" / "client.wav"
+
+    async def run():
+        unrecorded = StreamManager()
+        await unrecorded.process_audio_chunk("client", AudioChunk(np.ones(1600, dtype=np.int16)))
+
+        manager = StreamManager(buffer_audio=True)
+        for audio_type in ("microphone", "system"):
+            await manager.add_stream("client", audio_type)
+        recorder = MixRecorder(manager, str(path), interval_ms=60000)  # Ticks driven below
+        recorder.start()
+        burst = np.full(16000, 8192, dtype=np.int16)
+        await manager.process_audio_chunk("client", AudioChunk(burst, 16000, "microphone"))
+        start = manager.audio_buffer.clock_start
+        # A one-second burst is released at the clock rate, 150 ms behind it
+        written = [await recorder.write_pending(start + t) for t in (0.1, 0.5, 0.6)]
+        await recorder.stop()
+        return unrecorded, written, recorder
+
+    unrecorded, written, recorder = asyncio.run(run())
+    assert unrecorded.audio_buffer.buffer == {}
+    assert written == [0, 5600, 1600]
+    with wave.open(str(path), "rb") as wav:
+        frames = np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2")
+        assert wav.getframerate() == 16000
+    # The silent system stream is mixed in as silence
+    assert frames.shape == (7200,) and (frames == 8192).all()
+    assert recorder.get_status()["seconds"] == 0.45
+
+def test_audio_chunk_decodes_once():
+    """Chunks wrap the received PCM and convert to float only on demand"""
+    pcm = np.array([0, 16384, -32768, 32767], dtype=np.int16)
+    chunk = AudioChunk.from_bytes(pcm.tobytes(), 16000, "system")
+    assert chunk.samples.dtype == np.int16
+    assert chunk.peak == 1.0
+    assert chunk.to_bytes() == pcm.tobytes()
+    assert chunk._float is None
+    assert chunk.as_float()[1] == 0.5
+    assert chunk.as_float() is chunk.as_float()
+
+def test_audio_chunk_from_float_round_trip():
+    chunk = AudioChunk.from_float([0.0, 0.5, -1.0, 2.0])
+    assert chunk.samples.tolist() == [0, 16384, -32768, 32767]
+
+def test_packetizer_coalesces_and_splits_into_fixed_frames():
+    """2 KB pieces and a 1 s blob both come out as 100 ms packets; flush emits the tail"""
+    packetizer = Packetizer(16000, frame_ms=100)
+
+    small = [packetizer.push(AudioChunk(np.full(1024, i, dtype=np.int16))) for i in range(3)]
+    assert [len(p) for p in small] == [0, 1, 0]
+    first = small[1][0]
+    assert len(first) == 1600 and first.samples[0] == 0 and first.samples[-1] == 1
+
+    packets = packetizer.push(AudioChunk(np.arange(16000, dtype=np.int16)))
+    assert all(len(p) == 1600 for p in packets)
+    assert packetizer.pending_samples == (3 * 1024 + 16000) - 1600 * (1 + len(packets))
+
+    streamed = np.concatenate([first.samples] + [p.samples for p in packets] + [packetizer.flush().samples])
+    expected = np.concatenate([np.full(1024, i, dtype=np.int16) for i in range(3)] + [np.arange(16000, dtype=np.int16)])
+    assert np.array_equal(streamed, expected)
+    assert packetizer.flush() is None
+
+def test_bounded_audio_queue_drops_non_speech_first_and_signals_backpressure():
+    """A full queue sheds padding before speech, counts the loss, and toggles backpressure with hysteresis"""
+    transitions = []
+    audio_queue = BoundedAudioQueue(max_ms=500, on_pressure=transitions.append)
+
+    def packet(value):
+        return AudioChunk(np.full(1600, value, dtype=np.int16))  # 100 ms
+
+    for value, speech in [(1, False), (2, True), (3, True), (4, False), (5, True)]:
+        assert audio_queue.put("microphone", packet(value), speech)
+    assert transitions == [True]
+
+    audio_queue.put("microphone", packet(6), True)
+    audio_queue.put("microphone", packet(7), True)
+    audio_queue.put("microphone", packet(8), True)
+    status = audio_queue.get_status()
+    assert status["queued_ms"] == 500 and status["depth"] == 5
+    assert status["dropped_ms"] == 300 and status["dropped_speech_ms"] == 100
+
+    remaining = [audio_queue.get_blocking(timeout=0)[1].samples[0] for _ in range(5)]
+    assert remaining == [3, 5, 6, 7, 8]
+    assert transitions == [True, False]
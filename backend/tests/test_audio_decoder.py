@@ -0,0 +1,125 @@
+import sys
+import os
+import io
+import asyncio
+import numpy as np
+
+# Add the parent directory to the Python path so we can import our app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import av
+from app.core.audio.decoder import WebMOpusDecoder, normalize_codec
+from app.core.audio.protocol import SequenceTracker, encode_frame, is_audio_frame, parse_frame
+
+def _opus_fixture(seconds: float = 1.0, frequency: float = 440.0, level: float = 0.3) -> bytes:
+    """Encode a tone as a WebM/Opus stream, like a MediaRecorder recording"""
+    rate = 48000
+    t = np.arange(int(seconds * rate)) / rate
+    tone = (level * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+    buffer = io.BytesIO()
+    container = av.open(buffer, "w", format="webm")
+    stream = container.add_stream("libopus", rate=rate)
+    stream.layout = "mono"
+    for start in range(0, tone.shape[0], 960):
+        frame = av.AudioFrame.from_ndarray(tone[None, start:start + 960], format="flt", layout="mono")
+        frame.sample_rate = rate
+        frame.pts = start
+        for packet in stream.encode(frame):
+            container.mux(packet)
+    for packet in stream.encode(None):
+        container.mux(packet)
+    container.close()
+    return buffer.getvalue()
+
+def test_webm_opus_decodes_across_arbitrary_chunk_boundaries():
+    """Container state survives blobs that split elements anywhere"""
+    data = _opus_fixture()
+    decoder = WebMOpusDecoder()
+    chunks = [decoder.decode(data[i:i + 37]) for i in range(0, len(data), 37)]
+    pcm = np.concatenate([chunk.samples for chunk in chunks]).astype(np.float32) / 32768
+
+    assert decoder.sample_rate == 48000 and decoder.errors == 0
+    assert abs(pcm.shape[0] - 48000) < 2000
+    steady = pcm[10000:40000]
+    assert abs(np.sqrt(np.mean(steady ** 2)) - 0.3 / np.sqrt(2)) < 0.02
+    spectrum = np.abs(np.fft.rfft(steady))
+    assert abs(np.argmax(spectrum) * 48000 / steady.shape[0] - 440) < 5
+
+def test_webm_restart_resets_the_decoder():
+    """A recorder restart sends a fresh header; decoding carries on"""
+    decoder = WebMOpusDecoder()
+    first = decoder.decode(_opus_fixture(0.5))
+    second = decoder.decode(_opus_fixture(0.5, frequency=880))
+    assert len(first) > 20000 and len(second) > 20000
+
+def test_processor_routes_compressed_chunks_by_codec():
+    """audio_meta with codec webm_opus sends binary chunks through the decoder"""
+    from app.core.audio.processor import EnhancedAudioProcessor
+
+    assert normalize_codec(None) == "pcm"
+    assert normalize_codec("audio/webm;codecs=opus") == "webm_opus"
+
+    async def run():
+        async def on_transcript(message):
+            pass
+
+        processor = EnhancedAudioProcessor(None, "client", on_transcript, asyncio.get_running_loop())
+        data = _opus_fixture()
+        await processor.handle_message('{"type": "audio_meta", "audioType": "microphone", "codec": "webm_opus"}')
+        for start in range(0, len(data), 1000):
+            await processor.handle_message(data[start:start + 1000])
+        return processor
+
+    processor = asyncio.run(run())
+    assert processor.decoders["microphone"].packets > 40
+    # Decoded 48 kHz audio continues through the normal resampling path
+    assert processor.resamplers["microphone"].in_rate == 48000
+
+def test_frame_header_round_trip_without_copying():
+    """The payload is a view into the received message"""
+    payload = np.arange(160, dtype="<i2").tobytes()
+    message = encode_frame(payload, "system", "pcm", 48000, sequence=7, captured_at=1700000000.25)
+    assert is_audio_frame(message)
+    assert not is_audio_frame(payload)
+
+    frame = parse_frame(message)
+    assert (frame.audio_type, frame.codec, frame.sample_rate, frame.sequence) == ("system", "pcm", 48000, 7)
+    assert frame.captured_at == 1700000000.25
+    assert frame.payload.obj is message and bytes(frame.payload) == payload
+
+def test_sequence_tracker_counts_gaps_and_drops_late_frames():
+    tracker = SequenceTracker()
+
+    def frame(sequence, audio_type="microphone"):
+        return parse_frame(encode_frame(b"\0\0", audio_type, sequence=sequence))
+
+    assert tracker.accept(frame(2**32 - 1))
+    assert tracker.accept(frame(0))  # Wraps around
+    assert tracker.accept(frame(3))  # Frames 1 and 2 lost
+    assert not tracker.accept(frame(2))  # Arrived late
+    assert tracker.accept(frame(0, "system"))  # Streams are tracked separately
+    status = tracker.get_status()
+    assert status["microphone"]["lost"] == 2 and status["microphone"]["late"] == 1
+    assert status["system"]["lost"] == 0
+
+def test_processor_accepts_framed_and_legacy_audio():
+    """Framed float32 system audio and legacy audio_meta + PCM both reach the pipeline"""
+    from app.core.audio.processor import EnhancedAudioProcessor
+
+    async def run():
+        async def on_transcript(message):
+            pass
+
+        processor = EnhancedAudioProcessor(None, "client", on_transcript, asyncio.get_running_loop())
+        tone = (0.2 * np.sin(np.arange(4800) / 5)).astype("<f4").tobytes()
+        assert await processor.handle_frame(encode_frame(tone, "system", "pcm_f32le", 48000, sequence=0))
+        assert not await processor.handle_frame(encode_frame(tone, "system", "pcm_f32le", 48000, sequence=0))
+
+        await processor.handle_message('{"type": "audio_meta", "audioType": "microphone", "sampleRate": 16000}')
+        await processor.handle_message(np.zeros(1600, dtype="<i2").tobytes())
+        return processor
+
+    processor = asyncio.run(run())
+    assert processor.resamplers["system"].in_rate == 48000
+    assert processor.get_status()["frames"]["system"]["late"] == 1
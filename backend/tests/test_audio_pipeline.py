@@ -0,0 +1,149 @@
+import sys
+import os
+import asyncio
+import time
+from types import SimpleNamespace
+import numpy as np
+
+# Add the parent directory to the Python path so we can import our app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.audio.chunk import AudioChunk
+from app.core.audio.resampler import StreamingResampler
+from app.core.audio.quality import StreamingVAD, compute_batch_metrics
+from app.core.audio.noise import SpectralNoiseSuppressor
+from app.core.audio import stream_manager as stream_manager_module
+from app.core.audio.stream_manager import StreamManager
+
+def test_resampler_chunk_boundaries_are_seamless():
+    """Resampling in arbitrary pieces matches resampling the whole signal"""
+    signal = np.random.default_rng(0).standard_normal(44100).astype(np.float32)
+    whole = StreamingResampler(44100, 16000).process(signal)
+
+    resampler = StreamingResampler(44100, 16000)
+    pieces = np.array_split(signal, [1, 441, 5000, 20000])
+    streamed = np.concatenate([resampler.process(piece) for piece in pieces])
+
+    assert streamed.shape == (16000,)
+    assert np.allclose(streamed, whole, atol=1e-5)
+
+def test_resampler_reduces_48k_chunk_to_recognizer_rate():
+    tone = 0.5 * np.sin(2 * np.pi * 440 * np.arange(4800) / 48000)
+    chunk = AudioChunk.from_float(tone, 48000, "system")
+    out = StreamingResampler(48000, 16000).process_chunk(chunk)
+    assert out.sample_rate == 16000
+    assert out.audio_type == "system"
+    assert len(out) == 1600
+    assert len(out.to_bytes()) == len(chunk.to_bytes()) // 3
+
+def _tone(seconds: float, level: float, sample_rate: int = 16000) -> np.ndarray:
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    return level * np.sin(2 * np.pi * 220 * t)
+
+def test_vad_forwards_quiet_speech_with_preroll():
+    """Quiet sustained speech passes, with pre-roll frames ahead of the onset"""
+    vad = StreamingVAD(use_webrtc=False, energy_threshold=0.005)
+    silence = AudioChunk.from_float(np.zeros(3200))
+    speech = AudioChunk.from_float(_tone(0.5, 0.02))
+
+    assert vad.process(silence) == (None, False)
+    forwarded, ended = vad.process(speech)
+    assert forwarded is not None
+    assert not ended
+    # 10 pre-roll frames of silence precede the 25 speech frames
+    assert len(forwarded) == (10 + 25) * vad.frame_size
+
+def test_vad_drops_isolated_click_and_reports_speech_end():
+    vad = StreamingVAD(use_webrtc=False, onset_frames=2, hangover_frames=3)
+    click = np.zeros(3200)
+    click[400:420] = 0.9  # Shorter than one frame
+    assert vad.process(AudioChunk.from_float(click)) == (None, False)
+
+    vad.process(AudioChunk.from_float(_tone(0.2, 0.3)))
+    assert vad.in_speech
+    forwarded, ended = vad.process(AudioChunk.from_float(np.zeros(3200)))
+    assert ended
+    assert len(forwarded) == 3 * vad.frame_size
+
+def test_vad_keeps_partial_frames_between_chunks():
+    vad = StreamingVAD(use_webrtc=False, onset_frames=1, preroll_frames=0)
+    tone = AudioChunk.from_float(_tone(0.1, 0.3))
+    first, _ = vad.process(AudioChunk(tone.samples[:500]))
+    second, _ = vad.process(AudioChunk(tone.samples[500:]))
+    assert len(first) + len(second) == 1600
+
+def test_noise_suppressor_is_transparent_at_unity_gain():
+    """With the gain floor at 1 the overlap-add reconstructs the input one hop late"""
+    signal = np.random.default_rng(1).standard_normal(8000).astype(np.float32) * 0.1
+    suppressor = SpectralNoiseSuppressor(gain_floor=1.0)
+    out = np.concatenate([suppressor.process(piece) for piece in np.array_split(signal, [7, 700, 3000])])
+    hop = suppressor.hop_size
+    assert np.allclose(out[hop:], signal[:out.shape[0] - hop], atol=1e-5)
+
+def test_noise_suppressor_attenuates_stationary_noise():
+    noise = (0.02 * np.random.default_rng(2).standard_normal(48000)).astype(np.float32)
+    suppressor = SpectralNoiseSuppressor()
+    out = np.concatenate([suppressor.process(noise[i:i + 1600]) for i in range(0, noise.shape[0], 1600)])
+    # Judge the last second, once the noise profile has settled
+    assert np.sqrt(np.mean(out[-16000:] ** 2)) < 0.5 * np.sqrt(np.mean(noise[-16000:] ** 2))
+
+def test_noise_suppressor_passes_digital_silence_through():
+    """An all-zero noise estimate must not turn into NaNs downstream"""
+    suppressor = SpectralNoiseSuppressor()
+    silent = [suppressor.process(np.zeros(1600, dtype=np.float32)) for _ in range(5)]
+    assert all(np.isfinite(out).all() and not out.any() for out in silent)
+    # Speech after the silence is still processed cleanly
+    out = suppressor.process(_tone(0.2, 0.3).astype(np.float32))
+    assert np.isfinite(out).all() and np.abs(out).max() > 0.0
+
+def test_batch_metrics_match_per_stream_values():
+    """Padding rows to a common width does not leak into any stream's metrics"""
+    loud = np.clip(_tone(0.5, 1.2), -1.0, 1.0)
+    quiet = _tone(0.1, 0.01)
+    metrics = compute_batch_metrics({
+        "loud": AudioChunk.from_float(loud).samples,
+        "quiet": quiet.astype(np.float32),
+        "idle": np.zeros(0, dtype=np.int16),
+    })
+
+    assert metrics["idle"]["samples"] == 0
+    assert metrics["quiet"]["samples"] == 1600
+    assert np.isclose(metrics["quiet"]["rms_level"], np.sqrt(np.mean(quiet ** 2)), rtol=1e-4)
+    assert metrics["quiet"]["speech_ratio"] == 0.0
+    assert metrics["loud"]["clipping_ratio"] > 0.1
+    assert metrics["loud"]["speech_ratio"] == 1.0
+    expected_zcr = np.count_nonzero(np.diff(np.signbit(quiet))) / (len(quiet) - 1)
+    assert np.isclose(metrics["quiet"]["zero_crossing_rate"], expected_zcr)
+
+def test_app_publishes_all_sessions_metrics_in_one_pass_per_tick(monkeypatch):
+    """The startup hook runs one publisher over every live session's manager"""
+    from fastapi.testclient import TestClient
+    from app import main
+
+    passes = []
+    batch = stream_manager_module.publish_batch_metrics
+
+    def counting_batch(managers):
+        managers = list(managers)
+        passes.append(len(managers))
+        return batch(managers)
+
+    managers = [StreamManager(), StreamManager()]
+    for index, manager in enumerate(managers):
+        chunk = AudioChunk.from_float(_tone(0.5, 0.1 * (index + 1)))
+        asyncio.run(manager.process_audio_chunk(f"client{index}", chunk))
+    monkeypatch.setattr(stream_manager_module, "publish_batch_metrics", counting_batch)
+    monkeypatch.setattr(main.metrics_publisher, "interval", 0.01)
+    for index, manager in enumerate(managers):
+        monkeypatch.setitem(main.active_processors, f"client{index}", SimpleNamespace(stream_manager=manager))
+
+    with TestClient(main.app):
+        deadline = time.monotonic() + 2.0
+        while not passes and time.monotonic() < deadline:
+            time.sleep(0.01)
+    assert main.metrics_publisher._task is None  # Stopped by the shutdown hook
+
+    assert passes and set(passes) == {2}
+    levels = [manager.stream_metrics[f"client{index}_microphone"]["rms_level"]
+              for index, manager in enumerate(managers)]
+    assert levels[1] > levels[0] > 0
@@ -0,0 +1,59 @@
+import sys
+import os
+
+# Add the parent directory to the Python path so we can import our app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+from app.database import crud, schemas
+from app.database.models import ActionItem, FollowUpQuestion, Meeting, Summary, Topic
+
+async def _add_meeting(database):
+    async with database.Session() as db:
+        db.add(Meeting(meeting_id="m1", title="Planning"))
+        await db.commit()
+    return database.record_statements(), database.record_commits()
+
+async def test_bulk_helpers_insert_each_list_in_one_statement(database):
+    statements, commits = await _add_meeting(database)
+    async with database.Session() as db:
+        meeting_pk = await crud.resolve_meeting_pk(db, "m1")
+        statements.clear()
+        await crud.add_summary(db, meeting_pk, schemas.SummaryCreate(summary_text="so far", summary_type="progressive"), commit=False)
+        question_ids = await crud.add_follow_up_questions(db, meeting_pk, [
+            schemas.FollowUpQuestionCreate(question_text=f"question {i}") for i in range(8)
+        ], commit=False)
+        action_ids = await crud.add_action_items(db, meeting_pk, [
+            schemas.ActionItemCreate(description=f"task {i}", priority="high") for i in range(6)
+        ], commit=False)
+        topic_ids = await crud.add_topics(db, "m1", [
+            schemas.TopicCreate(name=f"topic {i}") for i in range(4)
+        ], commit=False)
+        await db.commit()
+        questions = dict((await db.execute(select(FollowUpQuestion.id, FollowUpQuestion.question_text))).all())
+        actions = (await db.execute(select(ActionItem.id, ActionItem.description, ActionItem.priority,
+                                           ActionItem.meeting_id))).all()
+        topics = dict((await db.execute(select(Topic.id, Topic.name))).all())
+        summaries = (await db.execute(select(Summary.id))).scalars().all()
+
+    # Summary, questions, action items and topics: one INSERT each, one commit
+    assert len([s for s in statements if s.startswith("INSERT")]) == 4
+    assert len(commits) == 1
+    # Every helper returns ids in input order
+    assert [questions[i] for i in question_ids] == [f"question {i}" for i in range(8)]
+    descriptions = {a.id: a.description for a in actions}
+    assert [descriptions[i] for i in action_ids] == [f"task {i}" for i in range(6)]
+    assert [topics[i] for i in topic_ids] == [f"topic {i}" for i in range(4)]
+    assert {(a.priority, a.meeting_id) for a in actions} == {("high", 1)}
+    assert len(summaries) == 1
+
+async def test_bulk_helpers_commit_by_default_and_skip_unknown_meetings(database):
+    _, commits = await _add_meeting(database)
+    async with database.Session() as db:
+        ids = await crud.add_topics(db, "m1", [schemas.TopicCreate(name="roadmap")])
+        committed = len(commits)
+        empty = await crud.add_action_items(db, "m1", [])
+        missing = await crud.add_follow_up_questions(db, "missing", [schemas.FollowUpQuestionCreate(question_text="?")])
+
+    assert len(ids) == 1 and committed == 1
+    assert empty == [] and missing is None
@@ -0,0 +1,194 @@
+import sys
+import os
+
+# Add the parent directory to the Python path so we can import our app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import fakeredis
+import pytest
+from fakeredis import aioredis
+from sqlalchemy import delete
+from app.database import crud, schemas
+from app.database.insights_cache import (
+    InsightsCache, InsightsCacheBackend, InsightsEntry, MemoryInsightsBackend, RedisInsightsBackend, insights_cache
+)
+from app.database.models import FollowUpQuestion, Meeting, Topic
+
+PAYLOAD = {"topics": [{"name": "roadmap"}], "final_summary": None}
+
+async def _add_meetings(database):
+    async with database.Session() as db:
+        db.add_all([Meeting(meeting_id="a", title="A"), Meeting(meeting_id="b", title="B")])
+        await db.commit()
+        return {meeting_id: await crud.resolve_meeting_pk(db, meeting_id) for meeting_id in ("a", "b")}
+
+async def _cache_both(pks):
+    for meeting_pk in pks.values():
+        await insights_cache.put(meeting_pk, PAYLOAD, await insights_cache.version(meeting_pk))
+
+async def _cached(pks):
+    return {meeting_id for meeting_id, meeting_pk in pks.items() if await insights_cache.get(meeting_pk)}
+
+def test_entry_is_serialized_once_with_a_content_etag():
+    first = InsightsEntry.from_payload(PAYLOAD)
+    again = InsightsEntry.from_payload(dict(PAYLOAD))
+    changed = InsightsEntry.from_payload({**PAYLOAD, "topics": []})
+    assert first.body.startswith(b"{") and first.etag.startswith('"')
+    assert first.etag == again.etag and first.etag != changed.etag
+
+def test_incomplete_backend_fails_at_creation():
+    class NoClear(InsightsCacheBackend):
+        async def get(self, meeting_pk): ...
+        async def version(self, meeting_pk): ...
+        async def set(self, meeting_pk, entry, version): ...
+        async def delete(self, meeting_pk): ...
+
+    with pytest.raises(TypeError):
+        NoClear()
+
+async def test_commit_invalidations_are_applied_on_a_retained_task(event_loop):
+    backend = MemoryInsightsBackend()
+    cache = InsightsCache(backend)
+    await cache.put(1, PAYLOAD, await cache.version(1))
+    cache.mark_stale([1])
+    pending = set(cache._tasks)
+    await asyncio.gather(*pending)
+
+    assert len(pending) == 1 and not cache._tasks
+    assert await backend.get(1) is None
+
+async def test_rebuild_that_raced_an_invalidation_is_not_stored(event_loop):
+    cache = InsightsCache(MemoryInsightsBackend())
+    version = await cache.version(1)
+    cache.mark_stale([1])  # A write committed while the payload was being built
+    await cache.put(1, PAYLOAD, version)
+    raced = await cache.get(1)
+    await cache.put(1, PAYLOAD, await cache.version(1))
+    stored = await cache.get(1)
+
+    assert raced is None and stored is not None
+    assert (cache.get_status()["hits"], cache.get_status()["misses"]) == (1, 1)
+
+async def test_rebuild_that_raced_another_workers_invalidation_is_not_stored(event_loop):
+    """The version lives in the shared backend, not in either worker"""
+    shared = MemoryInsightsBackend()
+    reader, writer = InsightsCache(shared), InsightsCache(shared)
+    await reader.put(1, PAYLOAD, await reader.version(1))
+
+    await writer.invalidate(1)
+    version = await reader.version(1)  # Reader misses and starts a rebuild
+    await writer.invalidate(1)  # Writer commits meanwhile
+    await reader.put(1, PAYLOAD, version)
+    assert await reader.get(1) is None
+
+    await reader.put(1, PAYLOAD, await reader.version(1))
+    assert await writer.get(1) is not None
+
+async def test_commits_invalidate_only_the_changed_meeting(database):
+    pks = await _add_meetings(database)
+    results = {}
+    async with database.Session() as db:
+        await _cache_both(pks)
+        await crud.add_topic(db, pks["a"], schemas.TopicCreate(name="roadmap"))
+        results["orm insert"] = await _cached(pks)
+
+        await _cache_both(pks)
+        await crud.add_follow_up_questions(db, "b", [schemas.FollowUpQuestionCreate(question_text="?")], commit=False)
+        results["before commit"] = await _cached(pks)
+        await db.commit()
+        results["bulk insert"] = await _cached(pks)
+
+        await _cache_both(pks)
+        question = (await crud.get_unanswered_questions(db, "b"))[0]
+        await crud.update_follow_up_question_status(db, question.id, True)
+        results["update"] = await _cached(pks)
+
+        await _cache_both(pks)
+        await db.execute(delete(Topic).where(Topic.name == "roadmap"))
+        await db.commit()
+        results["bulk delete"] = await _cached(pks)
+
+    assert results["orm insert"] == {"b"}
+    assert results["before commit"] == {"a", "b"}
+    assert results["bulk insert"] == {"a"}
+    assert results["update"] == {"a"}
+    # The statement does not say which meetings it touched
+    assert results["bulk delete"] == set()
+
+async def test_rollback_and_unrelated_writes_keep_entries(database):
+    pks = await _add_meetings(database)
+    async with database.Session() as db:
+        await _cache_both(pks)
+        db.add(FollowUpQuestion(meeting_id=pks["a"], question_text="?"))
+        await db.flush()
+        await db.rollback()
+        await crud.add_transcript_segment(db, "a", "not part of the insights")
+        kept = await _cached(pks)
+
+        meeting = await crud.get_meeting(db, "b", *crud.WRITE_LOADS)
+        await db.delete(meeting)
+        await db.commit()
+        after_delete = await _cached(pks)
+
+    assert kept == {"a", "b"}
+    assert after_delete == {"a"}
+
+def _redis_backend(server=None, ttl=60):
+    return RedisInsightsBackend(aioredis.FakeRedis(server=server or fakeredis.FakeServer()), ttl=ttl)
+
+async def test_redis_backend_checks_the_version_before_storing(event_loop):
+    backend = _redis_backend()
+    reader, writer = InsightsCache(backend), InsightsCache(backend)
+    version = await reader.version(1)
+    await writer.invalidate(1)  # Another worker commits during the rebuild
+    await reader.put(1, PAYLOAD, version)
+    raced = await backend.get(1)
+
+    entry = await reader.put(1, PAYLOAD, await reader.version(1))
+    stored = await writer.get(1)
+    assert raced is None
+    assert stored.etag == entry.etag and stored.body == entry.body
+
+async def test_redis_backend_watch_fails_a_write_that_lands_after_the_check(event_loop, monkeypatch):
+    server = fakeredis.FakeServer()
+    backend = _redis_backend(server)
+    other_worker = fakeredis.FakeRedis(server=server)
+    version = await backend.version(1)
+    checked = backend._format_version
+
+    def check_then_invalidate(*args):
+        result = checked(*args)
+        other_worker.incr(backend._version_key(1))  # Between the check and EXEC
+        return result
+
+    monkeypatch.setattr(backend, "_format_version", check_then_invalidate)
+    stored = await backend.set(1, InsightsEntry.from_payload(PAYLOAD), version)
+
+    assert stored is False
+    assert not other_worker.exists(backend._entry_key(1))
+
+async def test_redis_clear_bumps_the_epoch_without_touching_entries(event_loop):
+    backend = _redis_backend()
+    for meeting_pk in (1, 2):
+        await backend.set(meeting_pk, InsightsEntry.from_payload(PAYLOAD), await backend.version(meeting_pk))
+    await backend.clear()
+
+    assert await backend.get(1) is None and await backend.get(2) is None
+    # Stale entries are left to expire; no per-key round trips
+    assert await backend.client.exists(backend._entry_key(1), backend._entry_key(2)) == 2
+    assert await backend.version(1) == "1:0"
+    assert await backend.set(1, InsightsEntry.from_payload(PAYLOAD), "1:0")
+    assert await backend.get(1) is not None
+
+async def test_redis_entries_and_versions_expire(event_loop):
+    backend = _redis_backend(ttl=60)
+    await backend.set(1, InsightsEntry.from_payload(PAYLOAD), await backend.version(1))
+    entry_ttl = await backend.client.ttl(backend._entry_key(1))
+    await backend.delete(1)
+    version_ttl = await backend.client.ttl(backend._version_key(1))
+
+    assert 0 < entry_ttl <= 60
+    # Outlives any entry built before the bump
+    assert 60 < version_ttl <= 120
+    assert not await backend.client.exists(backend._entry_key(1))
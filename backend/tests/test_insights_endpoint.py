@@ -0,0 +1,79 @@
+import sys
+import os
+
+# Add the parent directory to the Python path so we can import our app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.database import crud, schemas
+from app.database.config import get_db
+from app.database.models import FollowUpQuestion, Meeting, Summary, Topic
+from app.routers import meeting_insights
+
+async def _seed(database):
+    async with database.Session() as db:
+        meeting = Meeting(meeting_id="m1", title="Planning")
+        db.add(meeting)
+        await db.flush()
+        db.add_all([
+            Summary(meeting_id=meeting.id, summary_text="so far", summary_type="progressive"),
+            Topic(meeting_id=meeting.id, name="roadmap"),
+            FollowUpQuestion(meeting_id=meeting.id, question_text="who owns it?"),
+            FollowUpQuestion(meeting_id=meeting.id, question_text="when?", answered=True),
+        ])
+        await db.commit()
+
+@pytest.fixture
+def client(database, event_loop):
+    event_loop.run_until_complete(_seed(database))
+    app = FastAPI()
+    app.include_router(meeting_insights.router)
+
+    async def get_test_db():
+        async with database.Session() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = get_test_db
+    with TestClient(app) as client:
+        yield client
+
+def test_insights_carry_an_etag(client):
+    response = client.get("/meetings/m1/insights")
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('"')
+    assert response.headers["cache-control"] == "no-cache"
+    body = response.json()
+    assert [s["summary"] for s in body["progressive_summaries"]] == ["so far"]
+    assert [t["name"] for t in body["topics"]] == ["roadmap"]
+    assert [q["question"] for q in body["unanswered_questions"]] == ["who owns it?"]
+    assert body["final_summary"] is None
+
+    assert client.get("/meetings/missing/insights").status_code == 404
+
+def test_unchanged_poll_is_a_304_without_queries(client, database):
+    etag = client.get("/meetings/m1/insights").headers["etag"]
+    statements = database.record_statements()
+
+    for if_none_match in (etag, f"W/{etag}", "*", f'"stale", {etag}'):
+        response = client.get("/meetings/m1/insights", headers={"If-None-Match": if_none_match})
+        assert response.status_code == 304, if_none_match
+        assert response.headers["etag"] == etag and response.content == b""
+    cached = client.get("/meetings/m1/insights", headers={"If-None-Match": '"stale"'})
+
+    assert cached.status_code == 200 and cached.headers["etag"] == etag
+    assert statements == []
+
+def test_writes_change_the_etag(client, database, event_loop):
+    etag = client.get("/meetings/m1/insights").headers["etag"]
+
+    async def add_topic():
+        async with database.Session() as db:
+            await crud.add_topics(db, "m1", [schemas.TopicCreate(name="hiring")])
+
+    event_loop.run_until_complete(add_topic())
+    response = client.get("/meetings/m1/insights", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert {t["name"] for t in response.json()["topics"]} == {"roadmap", "hiring"}
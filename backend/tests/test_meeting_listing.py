@@ -0,0 +1,101 @@
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add the parent directory to the Python path so we can import our app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from app.database import crud
+from app.database.models import ActionItem, Meeting, TranscriptSegment
+
+START = datetime(2024, 5, 1, 9, 0)
+
+async def _seed(database, count=7):
+    """Meetings m0..m{count-1}; m2 and m3 share a start time to exercise the id tie-break"""
+    async with database.Session() as db:
+        for i in range(count):
+            start = START + timedelta(hours=2 if i == 3 else i)
+            meeting = Meeting(meeting_id=f"m{i}", title=f"Standup {i}" if i % 2 else f"Review {i}",
+                              start_time=start, end_time=start + timedelta(minutes=30), is_active=i == count - 1)
+            db.add(meeting)
+            await db.flush()
+            for n in range(i):
+                db.add(TranscriptSegment(meeting_id=meeting.id, text=f"m{i} line {n}",
+                                         timestamp=start + timedelta(seconds=n)))
+            if i % 3 == 0:
+                db.add(ActionItem(meeting_id=meeting.id, description=f"follow up {i}"))
+        await db.commit()
+
+async def test_keyset_pages_cover_every_meeting_once(database):
+    await _seed(database)
+    seen, cursor, pages = [], None, 0
+    async with database.Session() as db:
+        while True:
+            meetings, cursor = await crud.list_meetings(db, limit=3, cursor=cursor)
+            seen.extend(m["meeting_id"] for m in meetings)
+            pages += 1
+            if cursor is None:
+                break
+
+    assert pages == 3
+    assert seen == ["m6", "m5", "m4", "m3", "m2", "m1", "m0"]
+
+async def test_listing_is_a_projection_without_child_loads(database):
+    await _seed(database)
+    statements = database.record_statements()
+    async with database.Session() as db:
+        meetings, _ = await crud.list_meetings(db, limit=10)
+
+    assert len(statements) == 1
+    m4 = next(m for m in meetings if m["meeting_id"] == "m4")
+    assert m4["transcript_count"] == 4
+    assert m4["first_line"] == "m4 line 0"
+    assert m4["duration_seconds"] == 1800
+    assert "transcripts" not in m4
+    assert next(m for m in meetings if m["meeting_id"] == "m0")["first_line"] is None
+    assert [m["action_item_count"] for m in meetings if m["meeting_id"] in ("m3", "m6")] == [1, 1]
+
+async def test_filters_and_includes(database):
+    await _seed(database)
+    statements = database.record_statements()
+    async with database.Session() as db:
+        reviews, _ = await crud.list_meetings(db, title="review", is_active=False,
+                                              started_after=START + timedelta(hours=1))
+        statements.clear()
+        full, _ = await crud.list_meetings(db, limit=2, include=["transcripts", "action_items"])
+
+    assert [m["meeting_id"] for m in reviews] == ["m4", "m2"]
+    assert len(statements) == 3  # Page, then one IN query per included collection
+    assert [t.text for t in full[0]["transcripts"]] == [f"m6 line {n}" for n in range(6)]
+    assert [a.description for a in full[0]["action_items"]] == ["follow up 6"]
+    assert full[1]["action_items"] == []
+
+async def test_invalid_cursor_and_include_are_rejected(database):
+    await _seed(database, 1)
+    async with database.Session() as db:
+        with pytest.raises(ValueError):
+            await crud.list_meetings(db, cursor="not-a-cursor")
+        with pytest.raises(ValueError):
+            await crud.list_meetings(db, include=["summaries"])
+
+async def test_title_filter_matches_wildcards_literally(database):
+    async with database.Session() as db:
+        db.add_all([Meeting(meeting_id=meeting_id, title=title) for meeting_id, title in (
+            ("a", "Q3 100% review"), ("b", "Q3 1000 review"), ("c", "team_sync"), ("d", "teamXsync"),
+        )])
+        await db.commit()
+        percent, _ = await crud.list_meetings(db, title="100%")
+        underscore, _ = await crud.list_meetings(db, title="team_")
+
+    assert [m["meeting_id"] for m in percent] == ["a"]
+    assert [m["meeting_id"] for m in underscore] == ["c"]
+
+async def test_every_meeting_has_a_start_time_to_page_on(database):
+    async with database.Session() as db:
+        db.add_all([Meeting(meeting_id="default", title="No start given"), Meeting(meeting_id="none", start_time=None)])
+        await db.commit()
+        meetings, _ = await crud.list_meetings(db)
+
+    assert {m["meeting_id"] for m in meetings} == {"default", "none"}
+    assert all(m["start_time"] is not None for m in meetings)
@@ -0,0 +1,141 @@
+import sys
+import os
+
+# Add the parent directory to the Python path so we can import our app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import InvalidRequestError
+from fastapi.testclient import TestClient
+from app.database import crud
+from app.database.config import get_db
+from app.main import app
+from app.database.models import ActionItem, FollowUpQuestion, Meeting, Summary, Topic, TranscriptSegment
+
+# Statements each use case may emit; raise these only on purpose
+WRITE_LOOKUP_STATEMENTS = 1
+DETAIL_STATEMENTS = 3
+INSIGHT_STATEMENTS = 4
+LIST_STATEMENTS = 1
+TRANSCRIPT_STATEMENTS = 2
+
+async def _populate(database):
+    async with database.Session() as db:
+        meeting = Meeting(meeting_id="m1", title="Planning")
+        db.add(meeting)
+        await db.flush()
+        db.add_all([TranscriptSegment(meeting_id=meeting.id, text=f"line {i}") for i in range(5)])
+        db.add_all([ActionItem(meeting_id=meeting.id, description="ship it")])
+        db.add_all([
+            Summary(meeting_id=meeting.id, summary_text="so far", summary_type="progressive"),
+            Summary(meeting_id=meeting.id, summary_text="in the end", summary_type="final"),
+        ])
+        db.add_all([Topic(meeting_id=meeting.id, name="roadmap")])
+        db.add_all([
+            FollowUpQuestion(meeting_id=meeting.id, question_text="who owns it?"),
+            FollowUpQuestion(meeting_id=meeting.id, question_text="when?", answered=True),
+        ])
+        await db.commit()
+
+async def test_statement_counts_per_use_case(database):
+    await _populate(database)
+    statements = database.record_statements()
+    counts = {}
+    async with database.Session() as db:
+        statements.clear()
+        await crud.get_meeting(db, "m1", *crud.WRITE_LOADS)
+        counts["write"] = len(statements)
+    async with database.Session() as db:
+        statements.clear()
+        meeting = await crud.get_meeting_details(db, "m1")
+        counts["details"] = len(statements)
+        counts["details_rows"] = (len(meeting.transcripts), len(meeting.action_items))
+    async with database.Session() as db:
+        statements.clear()
+        meeting = await crud.get_meeting_insights(db, "m1")
+        counts["insights"] = len(statements)
+        counts["insights_rows"] = (len(meeting.summaries), len(meeting.topics), len(meeting.follow_up_questions))
+    async with database.Session() as db:
+        statements.clear()
+        await crud.add_transcript_segment(db, "m1", "one more")
+        counts["add_transcript"] = len(statements)
+
+    assert counts["write"] == WRITE_LOOKUP_STATEMENTS
+    assert counts["details"] == DETAIL_STATEMENTS
+    assert counts["details_rows"] == (5, 1)
+    assert counts["insights"] == INSIGHT_STATEMENTS
+    assert counts["insights_rows"] == (2, 1, 2)
+    # INSERT and the refresh SELECT: the UUID resolved from the PK cache
+    assert counts["add_transcript"] == 2
+
+@pytest.fixture
+def client(database, event_loop):
+    event_loop.run_until_complete(_populate(database))
+
+    async def get_test_db():
+        async with database.Session() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = get_test_db
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db)
+
+def test_statement_counts_per_endpoint(client, database):
+    """Counted around the whole request, so queries the handlers add show up too"""
+    statements = database.record_statements()
+    counts, bodies = {}, {}
+    for name, url in (
+        ("list", "/meetings/"),
+        ("list_children", "/meetings/?include=transcripts,action_items"),
+        ("details", "/meetings/m1/details"),
+        ("transcripts", "/meetings/m1/transcripts"),
+        ("insights", "/meetings/m1/insights"),
+        ("insights_cached", "/meetings/m1/insights"),
+    ):
+        if name != "insights_cached":
+            crud.meeting_pk_cache.clear()  # Every UUID lookup is counted
+        statements.clear()
+        response = client.get(url)
+        assert response.status_code == 200, url
+        counts[name], bodies[name] = len(statements), response.json()
+
+    assert counts == {
+        "list": LIST_STATEMENTS,
+        # One selectin query per included collection
+        "list_children": LIST_STATEMENTS + 2,
+        "details": DETAIL_STATEMENTS,
+        "transcripts": TRANSCRIPT_STATEMENTS,
+        # The UUID lookup, then the payload on a cache miss
+        "insights": 1 + INSIGHT_STATEMENTS,
+        "insights_cached": 0,
+    }
+    assert bodies["list"]["meetings"][0]["transcript_count"] == 5
+    assert len(bodies["list_children"]["meetings"][0]["transcripts"]) == 5
+    assert (len(bodies["details"]["transcripts"]), len(bodies["details"]["action_items"])) == (5, 1)
+    assert len(bodies["transcripts"]["transcripts"]) == 5
+    assert len(bodies["insights"]["topics"]) == 1
+
+async def test_children_never_load_implicitly(database):
+    await _populate(database)
+    async with database.Session() as db:
+        meeting = await crud.get_meeting(db, "m1")
+        with pytest.raises(InvalidRequestError):
+            meeting.transcripts
+        details = await crud.get_meeting_details(db, "m1")
+        with pytest.raises(InvalidRequestError):
+            details.summaries
+
+async def test_delete_cascades_without_loading_children(database):
+    await _populate(database)
+    statements = database.record_statements()
+    async with database.Session() as db:
+        meeting = await crud.get_meeting(db, "m1", *crud.WRITE_LOADS)
+        statements.clear()
+        await db.delete(meeting)
+        await db.commit()
+        deleted = list(statements)
+        remaining = (await db.execute(select(func.count(TranscriptSegment.id)))).scalar()
+
+    assert [s.split()[0] for s in deleted] == ["DELETE"]
+    assert remaining == 0
@@ -0,0 +1,106 @@
+import sys
+import os
+
+# Add the parent directory to the Python path so we can import our app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete
+from app.database import crud, schemas
+from app.database.models import Meeting
+
+async def _add_meetings(database, *meeting_ids):
+    async with database.Session() as db:
+        db.add_all([Meeting(meeting_id=meeting_id, title=meeting_id) for meeting_id in meeting_ids])
+        await db.commit()
+    return database.record_statements()
+
+def test_lru_evicts_least_recently_used():
+    cache = crud.MeetingPkCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the oldest
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.get_status() == {"size": 2, "max_size": 2, "hits": 3, "misses": 1}
+
+async def test_resolution_queries_once_per_uuid(database):
+    statements = await _add_meetings(database, "a", "b", "c")
+    async with database.Session() as db:
+        first = await crud.resolve_meeting_pk(db, "a")
+        second = await crud.resolve_meeting_pk(db, "a")
+        single = len(statements)
+        batch = await crud.resolve_meeting_pks(db, ["a", "b", "c", "missing", "b"])
+        batched = len(statements) - single
+        again = await crud.resolve_meeting_pks(db, ["a", "b", "c"])
+        unknown = await crud.resolve_meeting_pk(db, "missing")
+        passthrough = await crud.resolve_meeting_pk(db, 42)
+
+    assert first == second and single == 1
+    assert batched == 1 and set(batch) == {"a", "b", "c"}  # Unknown UUIDs are left out
+    assert again == batch
+    # Unknown UUIDs are never cached, so they are looked up each time
+    assert unknown is None and len(statements) == 3
+    assert passthrough == 42
+
+async def test_helpers_accept_a_resolved_primary_key(database):
+    statements = await _add_meetings(database, "a")
+    async with database.Session() as db:
+        meeting = await crud.get_meeting(db, "a", *crud.WRITE_LOADS)
+        statements.clear()
+        await crud.add_action_item(db, meeting.id, schemas.ActionItemCreate(description="ship it"))
+        await crud.add_topic(db, "a", schemas.TopicCreate(name="roadmap"))  # Cached by get_meeting
+
+    assert not any("FROM meetings" in statement for statement in statements)
+
+async def test_deleting_a_meeting_invalidates_its_entry(database):
+    await _add_meetings(database, "a")
+    async with database.Session() as db:
+        meeting = await crud.get_meeting(db, "a", *crud.WRITE_LOADS)
+        cached = crud.meeting_pk_cache.get("a")
+        await db.delete(meeting)
+        await db.commit()
+        after_delete = crud.meeting_pk_cache.get("a")
+        resolved = await crud.resolve_meeting_pk(db, "a")
+
+    assert cached is not None
+    assert after_delete is None and resolved is None
+
+async def test_entries_cached_between_flush_and_commit_are_dropped(database):
+    await _add_meetings(database, "a", "b")
+    async with database.Session() as db:
+        meeting = await crud.get_meeting(db, "a", *crud.WRITE_LOADS)
+        meeting_pk = meeting.id
+        await db.delete(meeting)
+        await db.flush()
+        # A concurrent lookup still sees the uncommitted delete's row
+        crud.meeting_pk_cache.put("a", meeting_pk)
+        await db.commit()
+        after_commit = crud.meeting_pk_cache.get("a")
+
+        meeting = await crud.get_meeting(db, "b", *crud.WRITE_LOADS)
+        await db.delete(meeting)
+        await db.flush()
+        await db.rollback()
+        after_rollback = await crud.resolve_meeting_pk(db, "b")
+
+    assert after_commit is None
+    assert after_rollback is not None and crud.meeting_pk_cache.get("b") == after_rollback
+
+def test_lookup_that_raced_a_delete_is_not_stored():
+    cache = crud.MeetingPkCache()
+    generation = cache.generation
+    cache.invalidate("a")  # A delete committed while the lookup ran
+    cache.put("a", 1, generation)
+    assert cache.get("a") is None
+    cache.put("a", 1, cache.generation)
+    assert cache.get("a") == 1
+
+async def test_bulk_meeting_delete_clears_the_cache(database):
+    await _add_meetings(database, "a", "b")
+    async with database.Session() as db:
+        await crud.resolve_meeting_pks(db, ["a", "b"])
+        await db.execute(delete(Meeting).where(Meeting.meeting_id == "a"))
+        await db.commit()
+
+    assert crud.meeting_pk_cache.get_status()["size"] == 0
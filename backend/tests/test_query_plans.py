@@ -0,0 +1,37 @@
+import sys
+import os
+import asyncio
+
+# Add the parent directory to the Python path so we can import our app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.benchmark_queries import CASES, run_benchmark
+
+# Hot queries and the composite index each must be answered from
+EXPECTED_INDEXES = {
+    "meeting_transcripts": "ix_transcript_segments_meeting_id_timestamp",
+    "recent_transcripts": "ix_transcript_segments_meeting_id_timestamp",
+    "latest_transcripts": "ix_transcript_segments_meeting_id_timestamp",
+    "stream_transcripts": "ix_transcript_segments_meeting_id_id",
+    "progressive_summaries": "ix_summaries_meeting_id_type_created_at",
+    "final_summary": "ix_summaries_meeting_id_type_created_at",
+    "meeting_topics": "ix_topics_meeting_id_created_at",
+    "unanswered_questions": "ix_follow_up_questions_meeting_id_created_at",
+    "meeting_details": "ix_action_items_meeting_id_created_at",
+}
+
+def test_benchmark_covers_every_case_and_plans_use_composite_indexes(tmp_path):
+    report = asyncio.run(run_benchmark(f"sqlite:///{tmp_path / 'bench.db'}", meetings=12,
+                                       segments_per_meeting=40, repeat=2))
+
+    queries = {query["name"]: query for query in report["queries"]}
+    assert set(queries) == {case.name for case in CASES}
+    assert report["dataset"]["meetings"] == 12 and report["dataset"]["segments"] > 0
+    for query in queries.values():
+        assert query["median_ms"] > 0 and query["statements"]
+        assert all(statement["plan"] for statement in query["statements"])
+
+    for name, index in EXPECTED_INDEXES.items():
+        plans = " ".join(line for statement in queries[name]["statements"] for line in statement["plan"])
+        assert index in plans, f"{name} no longer uses {index}: {plans}"
+        assert "SCAN transcript_segments" not in plans
@@ -0,0 +1,198 @@
+import sys
+import os
+import asyncio
+from datetime import timedelta
+import numpy as np
+
+# Add the parent directory to the Python path so we can import our app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from google.cloud import speech
+from app.core.audio import recognizer as recognizer_module
+from app.core.audio.chunk import AudioChunk
+from app.core.audio.fanout import TranscriptFanout
+from app.core.audio.recognizer import StreamingRecognizer
+
+class FakeAsyncClient:
+    """Echoes the size of every audio request back as a final result"""
+
+    def __init__(self):
+        self.requests = []
+
+    async def streaming_recognize(self, requests):
+        async def responses():
+            async for request in requests:
+                self.requests.append(request)
+                if request.audio_content:
+                    yield speech.StreamingRecognizeResponse(results=[speech.StreamingRecognitionResult(
+                        alternatives=[speech.SpeechRecognitionAlternative(transcript=str(len(request.audio_content)))],
+                        is_final=True,
+                        result_end_time=timedelta(seconds=len(self.requests))
+                    )])
+        return responses()
+
+def test_async_recognizer_streams_on_the_event_loop(monkeypatch):
+    """Audio flows through the async client without a worker thread; config goes first"""
+    client = FakeAsyncClient()
+    monkeypatch.setattr(recognizer_module, "get_async_speech_client", lambda: client)
+
+    async def run():
+        results = []
+
+        async def on_result(result):
+            results.append(result.alternatives[0].transcript)
+
+        recognizer = StreamingRecognizer("client", on_result, asyncio.get_running_loop())
+        recognizer.start()
+        for size in (160, 320):
+            recognizer.put("microphone", AudioChunk(np.zeros(size, dtype=np.int16)))
+        while len(results) < 2:
+            await asyncio.sleep(0.01)
+        await recognizer.stop()
+        return results
+
+    assert asyncio.run(asyncio.wait_for(run(), timeout=5)) == ["320", "640"]
+    assert client.requests[0].streaming_config.config.sample_rate_hertz == 16000
+    assert not client.requests[0].audio_content
+
+class FakeRecognizingClient:
+    """Transcribes each chunk as one word named after its fill value, timed within the stream"""
+
+    def __init__(self):
+        self.streams = 0
+
+    async def streaming_recognize(self, requests):
+        self.streams += 1
+
+        async def responses():
+            elapsed = timedelta(0)
+            async for request in requests:
+                if not request.audio_content:
+                    continue
+                samples = np.frombuffer(request.audio_content, dtype="<i2")
+                start, elapsed = elapsed, elapsed + timedelta(seconds=samples.shape[0] / 16000)
+                word = f"w{samples[0]}"
+                yield speech.StreamingRecognizeResponse(results=[speech.StreamingRecognitionResult(
+                    alternatives=[speech.SpeechRecognitionAlternative(
+                        transcript=word, words=[speech.WordInfo(word=word, start_time=start, end_time=elapsed)]
+                    )],
+                    is_final=True,
+                    result_end_time=elapsed
+                )])
+        return responses()
+
+def test_rotation_replays_overlap_without_duplicate_transcripts(monkeypatch):
+    """Streams rotate mid-meeting; the replayed tail is recognised again but delivered once"""
+    client = FakeRecognizingClient()
+    monkeypatch.setattr(recognizer_module, "get_async_speech_client", lambda: client)
+
+    async def run():
+        words = []
+
+        async def on_result(result):
+            words.append(result.alternatives[0].transcript)
+
+        recognizer = StreamingRecognizer("client", on_result, asyncio.get_running_loop())
+        recognizer.STREAM_LIMIT_SECONDS = 0.05
+        recognizer.REPLAY_SECONDS = 0.25
+        recognizer.start()
+        for value in range(1, 21):
+            recognizer.put("microphone", AudioChunk(np.full(1600, value, dtype=np.int16)))
+            await asyncio.sleep(0.02)
+        while len(words) < 20:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.1)
+        status = recognizer.get_status()
+        await recognizer.stop()
+        return words, status
+
+    words, status = asyncio.run(asyncio.wait_for(run(), timeout=5))
+    assert words == [f"w{value}" for value in range(1, 21)]
+    assert status["rotations"] >= 2
+    assert status["duplicates_dropped"] > 0
+
+def test_processor_runs_one_pipeline_per_source():
+    """Each source has its own recognizer; transcripts carry the source that produced them"""
+    from app.core.audio.processor import EnhancedAudioProcessor
+
+    async def run():
+        sent = []
+
+        class FakeWebSocket:
+            async def send_json(self, message):
+                sent.append(message)
+
+        async def on_transcript(message):
+            pass
+
+        processor = EnhancedAudioProcessor(FakeWebSocket(), "client", on_transcript, asyncio.get_running_loop())
+        assert set(processor.recognizers) == {"microphone", "system"}
+        assert processor.recognizers["microphone"].queue is not processor.recognizers["system"].queue
+
+        # The last audio_meta says "system", but the microphone pipeline produced this result
+        processor.current_audio_type = "system"
+        result = speech.StreamingRecognitionResult(
+            alternatives=[speech.SpeechRecognitionAlternative(transcript="hello")], is_final=True
+        )
+        processor.fanout.start()
+        await processor.recognizers["microphone"].on_result(result)
+        await asyncio.sleep(0.01)
+        await processor.fanout.stop()
+        return sent
+
+    sent = asyncio.run(run())
+    assert sent[0]["audioType"] == "microphone"
+    assert sent[0]["text"] == "hello"
+
+def test_fanout_coalesces_interims_behind_a_slow_client():
+    """Publishing never waits; a lagging client gets only the newest interim, and every final is persisted"""
+    async def run():
+        sent, persisted = [], []
+        release = asyncio.Event()
+
+        async def slow_send(message):
+            await release.wait()
+            sent.append(message["text"])
+
+        async def persist(message):
+            persisted.append(message["text"])
+
+        fanout = TranscriptFanout(slow_send, persist)
+        fanout.start()
+        fanout.publish({"text": "first", "is_final": False, "audioType": "microphone"})
+        await asyncio.sleep(0.01)  # The sender is now stuck on the first interim
+        for text in ("h", "he", "hel"):
+            fanout.publish({"text": text, "is_final": False, "audioType": "microphone"})
+        fanout.publish({"text": "sys", "is_final": False, "audioType": "system"})
+        fanout.publish({"text": "hello.", "is_final": True, "audioType": "microphone"})
+        fanout.publish({"text": "next", "is_final": False, "audioType": "microphone"})
+        await asyncio.sleep(0.01)
+        assert persisted == ["hello."]  # Persistence is not held up by the socket
+
+        release.set()
+        await asyncio.sleep(0.01)
+        status = fanout.get_status()
+        await fanout.stop()
+        return sent, status
+
+    sent, status = asyncio.run(asyncio.wait_for(run(), timeout=5))
+    assert sent == ["first", "sys", "hello.", "next"]
+    assert status["interims_coalesced"] == 3
+    assert status["persisted"] == 1
+
+def test_processor_accepts_chunks_without_metadata():
+    """Clients that never send audio_meta still stream 16 kHz int16 microphone PCM"""
+    from app.core.audio.processor import EnhancedAudioProcessor
+
+    async def run():
+        async def on_transcript(message):
+            pass
+
+        processor = EnhancedAudioProcessor(None, "client", on_transcript, asyncio.get_running_loop())
+        await processor.handle_message(np.zeros(1600, dtype="<i2").tobytes())
+        return processor
+
+    processor = asyncio.run(run())
+    metrics = processor.stream_manager.stream_metrics
+    assert metrics["client_microphone"]["chunk_size"] == 1600
+    assert "client_system" not in metrics
@@ -0,0 +1,50 @@
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add the parent directory to the Python path so we can import our app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import crud
+from app.database.models import Meeting, TranscriptSegment
+
+START = datetime(2024, 5, 1, 9, 0)
+
+async def _meeting_with_segments(database, count):
+    async with database.Session() as db:
+        meeting, other = Meeting(meeting_id="m1"), Meeting(meeting_id="m2")
+        db.add_all([meeting, other])
+        await db.flush()
+        db.add_all([TranscriptSegment(meeting_id=meeting.id, text=f"line {i}", timestamp=START + timedelta(seconds=i))
+                    for i in range(count)])
+        db.add(TranscriptSegment(meeting_id=other.id, text="elsewhere", timestamp=START))
+        await db.commit()
+    return meeting.id
+
+async def _collect(database, meeting_pk, **kwargs):
+    batches = []
+    async with database.Session() as db:
+        async for batch in crud.stream_transcripts(db, meeting_pk, **kwargs):
+            batches.append(batch)
+    return batches
+
+async def test_stream_yields_bounded_batches_in_id_order(database):
+    meeting_pk = await _meeting_with_segments(database, 25)
+    batches = await _collect(database, meeting_pk, batch_size=10)
+
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    rows = [row for batch in batches for row in batch]
+    assert [row["text"] for row in rows] == [f"line {i}" for i in range(25)]
+    assert set(rows[0]) == {"id", "text", "timestamp", "speaker", "confidence", "audio_type"}
+
+async def test_stream_resumes_after_id_or_timestamp(database):
+    meeting_pk = await _meeting_with_segments(database, 8)
+    first = await _collect(database, meeting_pk, batch_size=5)
+    last_id = first[0][-1]["id"]
+    by_id = await _collect(database, meeting_pk, since_id=last_id)
+    by_time = await _collect(database, meeting_pk, since_timestamp=START + timedelta(seconds=5))
+    nothing = await _collect(database, meeting_pk, since_id=first[-1][-1]["id"])
+
+    assert [row["text"] for batch in by_id for row in batch] == ["line 5", "line 6", "line 7"]
+    assert [row["text"] for batch in by_time for row in batch] == ["line 6", "line 7"]
+    assert nothing == []
@@ -0,0 +1,100 @@
+import sys
+import os
+
+# Add the parent directory to the Python path so we can import our app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete, insert, update
+from sqlalchemy.dialects import postgresql
+from app.database.models import Meeting, TranscriptSegment
+from app.database.search import _postgres_query, _scan_query, search_transcripts
+
+LINES = {
+    "m1": ["The budget review moved to Friday", "Alice owns the budget spreadsheet", "Lunch is at noon"],
+    "m2": ["Budget budget budget, we keep talking budgets", "Deploy the release on Monday"],
+}
+
+async def _index(database):
+    async with database.Session() as db:
+        meetings = {meeting_id: Meeting(meeting_id=meeting_id, title=meeting_id.upper()) for meeting_id in LINES}
+        db.add_all(meetings.values())
+        await db.flush()
+        # Multi-row INSERT, as the transcript writer does; triggers index every row
+        await db.execute(insert(TranscriptSegment).values([
+            {"meeting_id": meetings[meeting_id].id, "text": text}
+            for meeting_id, texts in LINES.items() for text in texts
+        ]))
+        await db.commit()
+
+async def test_ranked_hits_with_snippets_and_meeting_ids(database):
+    await _index(database)
+    async with database.Session() as db:
+        hits, next_offset = await search_transcripts(db, "budgets")
+        scoped, _ = await search_transcripts(db, "budget", meeting_id="m1")
+        none, _ = await search_transcripts(db, "kubernetes")
+
+    # Porter stemming matches budget/budgets; the densest line ranks first
+    assert [hit["meeting_id"] for hit in hits] == ["m2", "m1", "m1"]
+    assert hits[0]["score"] >= hits[1]["score"]
+    assert "<mark>" in hits[0]["snippet"]
+    assert hits[0]["meeting_title"] == "M2" and hits[0]["timestamp"] is not None
+    assert next_offset is None
+    assert {hit["meeting_id"] for hit in scoped} == {"m1"} and len(scoped) == 2
+    assert none == []
+
+async def test_snippets_escape_transcript_markup(database):
+    async with database.Session() as db:
+        meeting = Meeting(meeting_id="m3", title="<b>M3</b>")
+        db.add(meeting)
+        await db.flush()
+        db.add(TranscriptSegment(meeting_id=meeting.id, text='<script>alert("x")</script> & the deadline moved'))
+        await db.commit()
+        hits, _ = await search_transcripts(db, "deadline")
+
+    snippet = hits[0]["snippet"]
+    assert "<script>" not in snippet
+    assert "&lt;script&gt;alert(&quot;x&quot;)&lt;/script&gt; &amp;" in snippet
+    assert "<mark>deadline</mark>" in snippet
+
+async def test_pagination_and_hostile_queries(database):
+    await _index(database)
+    async with database.Session() as db:
+        first, next_offset = await search_transcripts(db, "budget", limit=2)
+        second, last = await search_transcripts(db, "budget", limit=2, offset=next_offset)
+        quoted, _ = await search_transcripts(db, 'budget" OR NEAR(')
+        empty, _ = await search_transcripts(db, "  ***  ")
+
+    assert (len(first), next_offset, len(second), last) == (2, 2, 1, None)
+    assert {hit["segment_id"] for hit in first}.isdisjoint(hit["segment_id"] for hit in second)
+    assert quoted == [] and empty == []
+
+async def test_index_follows_updates_and_deletes(database):
+    await _index(database)
+    async with database.Session() as db:
+        await db.execute(update(TranscriptSegment).where(TranscriptSegment.text.like("Lunch%"))
+                         .values(text="Budget lunch is at noon"))
+        await db.execute(delete(Meeting).where(Meeting.meeting_id == "m2"))
+        await db.commit()
+        hits, _ = await search_transcripts(db, "budget")
+
+    assert len(hits) == 3 and {hit["meeting_id"] for hit in hits} == {"m1"}
+
+def test_postgres_query_uses_the_indexed_expression():
+    sql = str(_postgres_query("budget", None, 21, 0).compile(dialect=postgresql.dialect()))
+    assert "to_tsvector('english', transcript_segments.text) @@ websearch_to_tsquery('english'" in sql
+    assert "ts_headline" in sql
+    assert "<mark>" not in sql  # Highlights use sentinels until the text is escaped
+
+async def test_scan_fallback_matches_wildcards_literally(database):
+    async with database.Session() as db:
+        meeting = Meeting(meeting_id="m1", title="M1")
+        db.add(meeting)
+        await db.flush()
+        db.add_all([TranscriptSegment(meeting_id=meeting.id, text=text)
+                    for text in ("Growth was 50% last year", "Growth was 500 last year", "file_name", "filename")])
+        await db.commit()
+        percent = (await db.execute(_scan_query("50%", None, 10, 0))).all()
+        underscore = (await db.execute(_scan_query("file_", None, 10, 0))).all()
+
+    assert [row.snippet for row in percent] == ["Growth was 50% last year"]
+    assert [row.snippet for row in underscore] == ["file_name"]
@@ -0,0 +1,51 @@
+import sys
+import os
+import asyncio
+
+# Add the parent directory to the Python path so we can import our app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, select
+from app.database.models import Meeting, TranscriptSegment
+from app.database.writer import TranscriptWriter
+
+async def _add_meetings(database, *meeting_ids):
+    async with database.Session() as db:
+        db.add_all([Meeting(meeting_id=meeting_id) for meeting_id in meeting_ids])
+        await db.commit()
+
+async def test_writer_batches_sessions_into_one_insert_per_flush(database):
+    """Rows from several meetings are written with a lookup and a single INSERT"""
+    await _add_meetings(database, "a", "b")
+    statements = database.record_statements()
+
+    writer = TranscriptWriter(database.Session, flush_interval_ms=10_000, max_batch=50)
+    writer.start()
+    for i in range(30):
+        writer.submit("a" if i % 2 else "b", {"text": f"line {i}", "is_final": True, "audioType": "system"})
+    writer.submit("missing", {"text": "lost", "is_final": True})
+    await asyncio.sleep(0.05)
+    assert writer.get_metrics()["rows_written"] == 0  # Neither interval nor batch size reached
+    await writer.stop()  # Shutdown flushes
+
+    async with database.Session() as db:
+        count = await db.scalar(select(func.count()).select_from(TranscriptSegment))
+        audio_types = set((await db.execute(select(TranscriptSegment.audio_type))).scalars())
+
+    metrics = writer.get_metrics()
+    assert metrics["rows_written"] == 30 and metrics["rows_dropped"] == 1
+    assert metrics["flushes"] == 1 and metrics["max_batch_size"] == 31
+    assert len([s for s in statements if s.startswith("INSERT")]) == 1
+    assert count == 30 and audio_types == {"system"}
+
+async def test_writer_flushes_when_the_batch_fills(database):
+    await _add_meetings(database, "a")
+    writer = TranscriptWriter(database.Session, flush_interval_ms=10_000, max_batch=10)
+    writer.start()
+    for i in range(25):
+        writer.submit("a", {"text": f"line {i}", "is_final": True})
+    await asyncio.sleep(0.2)
+    written = writer.get_metrics()["rows_written"]
+    await writer.stop()
+
+    assert written >= 20
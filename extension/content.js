@@ -12,12 +12,19 @@ chrome.runtime.onMessage.addListener((message, sender, sendResponse) => {
 async function startRecording() {
   try {
     const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
-    recorder = new MediaRecorder(stream);
+    recorder = new MediaRecorder(stream, { mimeType: 'audio/webm;codecs=opus' });
     
     const ws = new WebSocket('ws://localhost:8000/ws/' + generateUUID());
     
     recorder.ondataavailable = async (event) => {
       if (event.data.size > 0 && ws.readyState === WebSocket.OPEN) {
+        // Blobs are pieces of one WebM/Opus stream; the backend decodes them in order
+        ws.send(JSON.stringify({
+          type: 'audio_meta',
+          audioType: 'microphone',
+          codec: 'webm_opus',
+          timestamp: Date.now()
+        }));
         ws.send(await event.data.arrayBuffer());
       }
     };
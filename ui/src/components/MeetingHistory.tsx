@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react';
 import { Button } from './ui/button';
-import { MeetingService, Meeting } from '../services/MeetingService';
+import { MeetingService, Meeting, MeetingListItem } from '../services/MeetingService';
 import { MeetingDetails } from './MeetingDetails';
 import { RefreshCw, Clock, CheckCircle, XCircle, AlertTriangle } from 'lucide-react';
 
@@ -10,7 +10,9 @@ interface MeetingHistoryProps {
 }
 
 export function MeetingHistory({ onJoinMeeting, onBack }: MeetingHistoryProps) {
-  const [meetings, setMeetings] = useState<Meeting[]>([]);
+  const [meetings, setMeetings] = useState<MeetingListItem[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [selectedMeeting, setSelectedMeeting] = useState<Meeting | null>(null);
@@ -20,8 +22,9 @@ export function MeetingHistory({ onJoinMeeting, onBack }: MeetingHistoryProps) {
     try {
       setLoading(true);
       setError(null);
-      const data = await MeetingService.getMeetings();
-      setMeetings(data);
+      const page = await MeetingService.getMeetings();
+      setMeetings(page.meetings);
+      setNextCursor(page.next_cursor);
     } catch (err) {
       setError('Failed to load meetings. Please try again.');
     } finally {
@@ -29,6 +32,20 @@ export function MeetingHistory({ onJoinMeeting, onBack }: MeetingHistoryProps) {
     }
   };
 
+  const loadMoreMeetings = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const page = await MeetingService.getMeetings(nextCursor);
+      setMeetings((prev) => [...prev, ...page.meetings]);
+      setNextCursor(page.next_cursor);
+    } catch (err) {
+      setError('Failed to load more meetings. Please try again.');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     loadMeetings();
   }, []);
@@ -44,9 +61,23 @@ export function MeetingHistory({ onJoinMeeting, onBack }: MeetingHistoryProps) {
     }
   };
 
-  const handleViewDetails = (meeting: Meeting) => {
-    setSelectedMeeting(meeting);
-    setIsDetailsOpen(true);
+  const handleViewDetails = async (meeting: MeetingListItem) => {
+    // The listing only carries a preview; fetch transcripts and action items on demand
+    try {
+      const details = await MeetingService.getMeeting(meeting.meeting_id);
+      setSelectedMeeting(details);
+      setIsDetailsOpen(true);
+    } catch (error: any) {
+      setError(error.message || 'Failed to load meeting details. Please try again.');
+    }
+  };
+
+  const handleJoin = async (meeting: MeetingListItem) => {
+    try {
+      onJoinMeeting(await MeetingService.getMeeting(meeting.meeting_id));
+    } catch (error: any) {
+      setError(error.message || 'Failed to join meeting. Please try again.');
+    }
   };
 
   const handleRefresh = () => {
@@ -160,7 +191,7 @@ export function MeetingHistory({ onJoinMeeting, onBack }: MeetingHistoryProps) {
                   <div className="flex gap-2">
                     {meeting.is_active && (
                       <Button
-                        onClick={() => onJoinMeeting(meeting)}
+                        onClick={() => handleJoin(meeting)}
                       >
                         Join Meeting
                       </Button>
@@ -181,16 +212,23 @@ export function MeetingHistory({ onJoinMeeting, onBack }: MeetingHistoryProps) {
                 </div>
 
                 {/* Preview Section */}
-                {meeting.transcripts && meeting.transcripts.length > 0 && (
+                {meeting.first_line && (
                   <div className="mt-4 pt-4 border-t border-gray-100">
-                    <p className="text-sm text-gray-500 mb-2">Latest transcript:</p>
-                    <p className="text-sm text-gray-700">
-                      {meeting.transcripts[meeting.transcripts.length - 1].text}
+                    <p className="text-sm text-gray-500 mb-2">
+                      {meeting.transcript_count} transcript lines, {meeting.action_item_count} action items
                     </p>
+                    <p className="text-sm text-gray-700">{meeting.first_line}</p>
                   </div>
                 )}
               </div>
             ))}
+            {nextCursor && (
+              <div className="flex justify-center">
+                <Button variant="outline" onClick={loadMoreMeetings} disabled={loadingMore}>
+                  {loadingMore ? 'Loading...' : 'Load more'}
+                </Button>
+              </div>
+            )}
           </div>
         )}
       </div>
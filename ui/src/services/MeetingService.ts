@@ -24,6 +24,24 @@ export interface Meeting {
   }>;
 }
 
+export interface MeetingListItem {
+  id: number;
+  meeting_id: string;
+  title: string;
+  start_time: string;
+  end_time: string | null;
+  is_active: boolean;
+  duration_seconds: number | null;
+  transcript_count: number;
+  action_item_count: number;
+  first_line: string | null;
+}
+
+export interface MeetingPage {
+  meetings: MeetingListItem[];
+  next_cursor: string | null;
+}
+
 export class MeetingService {
   static async createMeeting(title?: string): Promise<Meeting> {
     try {
@@ -37,9 +55,11 @@ export class MeetingService {
     }
   }
 
-  static async getMeetings(): Promise<Meeting[]> {
+  static async getMeetings(cursor?: string | null, limit = 20): Promise<MeetingPage> {
     try {
-      const response = await axios.get(`${API_BASE_URL}/meetings/`);
+      const response = await axios.get(`${API_BASE_URL}/meetings/`, {
+        params: { limit, ...(cursor ? { cursor } : {}) }
+      });
       return response.data;
     } catch (error: any) {
       console.error('Error getting meetings:', error);